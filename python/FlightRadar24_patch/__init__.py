@@ -14,5 +14,19 @@ https://www.flightradar24.com/terms-and-conditions
 __author__ = "Jean Loui Bernard Silva de Jesus"
 __version__ = "1.3.33"
 
-from .api import FlightRadar24API, FlightTrackerConfig
+from .aio import AsyncFlightRadar24API
+from .batch import FlightBatch
+from .api import FlightDetailsResult, FlightRadar24API, FlightTrackerConfig
+from .cache import ResponseCache
+from .catalog import AirportCatalog
+from .coalesce import CoalescingSession, FeedSnapshot, RequestCoalescer
+from .differ import SnapshotDelta, SnapshotDiffer
 from .entities import Airport, Entity, Flight
+from .geodesy import HomeGeodesy
+from .query import FlightQuery
+from .reference import ReferenceDataCache
+from .regions import RegionScanner
+from .replay import FeedRecorder, ReplaySession
+from .search import SearchIndex
+from .session import SessionConfig, SessionPool
+from .throttle import CircuitBreaker, RateLimiter, ThrottledSession
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+
+from typing import Any, Callable, Optional
+
+import asyncio
+import concurrent.futures
+import functools
+import queue
+import threading
+import traceback
+
+from .api import FlightRadar24API
+
+
+class EventLoopThread(object):
+    """
+    An asyncio event loop running forever in a daemon thread.
+    """
+    def __init__(self, name: str = "FlightRadar24-asyncio"):
+        """
+        Constructor of the EventLoopThread class.
+
+        :param name: Name of the thread running the loop
+        """
+        self.loop = asyncio.new_event_loop()
+
+        self.__thread = threading.Thread(target=self.__run, name=name, daemon=True)
+        self.__thread.start()
+
+    def __run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coroutine) -> concurrent.futures.Future:
+        """
+        Schedule a coroutine on the loop. It can be called from any thread.
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def stop(self) -> None:
+        """
+        Stop the loop and wait for the thread to finish.
+        """
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.__thread.join()
+
+
+_shared_loop: Optional[EventLoopThread] = None
+_shared_loop_lock = threading.Lock()
+
+
+def get_shared_loop() -> EventLoopThread:
+    """
+    Return the event loop shared by all asynchronous clients of the process, starting it on first use.
+    """
+    global _shared_loop
+
+    with _shared_loop_lock:
+        if _shared_loop is None:
+            _shared_loop = EventLoopThread()
+
+        return _shared_loop
+
+
+class AsyncFlightRadar24API(object):
+    """
+    Asynchronous counterpart of the FlightRadar24API class.
+
+    Every network method of FlightRadar24API is available as a coroutine with the same name
+    and parameters. All instances run on one shared event loop, so feed polls, detail lookups
+    and other blocking work (e.g. tile downloads through run_blocking) overlap.
+
+    Use submit() to start a coroutine from a GUI thread and dispatch() from the same thread
+    (e.g. periodically with Tk's after) to run the callbacks with the results.
+    """
+    def __init__(
+        self,
+        api: Optional[FlightRadar24API] = None,
+        max_workers: int = 8,
+        loop: Optional[EventLoopThread] = None
+    ):
+        """
+        Constructor of the AsyncFlightRadar24API class.
+
+        :param api: The FlightRadar24API instance doing the requests. If None, a new one is created.
+        :param max_workers: Maximum number of blocking calls running at the same time
+        :param loop: The event loop thread to use. If None, the shared loop of the process is used.
+        """
+        self.api = api if api is not None else FlightRadar24API()
+        self.loop = loop if loop is not None else get_shared_loop()
+
+        self.__executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="FlightRadar24")
+        self.__results = queue.SimpleQueue()
+
+    async def run_blocking(self, function: Callable, *args: Any, **kwargs: Any) -> Any:
+        """
+        Run a blocking function on the worker threads and return its result.
+        """
+        return await self.loop.loop.run_in_executor(self.__executor, functools.partial(function, *args, **kwargs))
+
+    def submit(
+        self,
+        coroutine,
+        callback: Optional[Callable[[Any], Any]] = None,
+        errback: Optional[Callable[[Exception], Any]] = None
+    ) -> concurrent.futures.Future:
+        """
+        Schedule a coroutine on the event loop without blocking.
+
+        The callback (or errback, on exception) is queued when the coroutine is done
+        and runs in the thread that calls dispatch().
+
+        :param coroutine: A coroutine, e.g. get_flights(bounds=...)
+        :param callback: Function called with the result of the coroutine
+        :param errback: Function called with the exception raised by the coroutine
+        """
+        future = self.loop.submit(coroutine)
+        future.add_done_callback(lambda done: self.__results.put((done, callback, errback)))
+        return future
+
+    def dispatch(self) -> int:
+        """
+        Run the callbacks of all finished coroutines. Return the number of dispatched results.
+
+        Exceptions raised by callbacks or errbacks are printed to stderr, as Tkinter does for its callbacks.
+        """
+        count = 0
+
+        while True:
+            try: future, callback, errback = self.__results.get_nowait()
+            except queue.Empty: break
+
+            count += 1
+
+            if future.cancelled():
+                continue
+
+            error = future.exception()
+
+            # An exception of a callback is reported and does not stop the results queued after it.
+            try:
+                if error is not None:
+                    if errback is not None: errback(error)
+                elif callback is not None:
+                    callback(future.result())
+            except Exception:
+                traceback.print_exc()
+
+        return count
+
+    def close(self) -> None:
+        """
+        Shut down the worker threads. The shared event loop keeps running.
+        """
+        self.__executor.shutdown(wait=False)
+
+
+def _coroutine_method(name: str) -> Callable:
+    """
+    Return a coroutine method running the blocking method of FlightRadar24API with the same name.
+    """
+    method = getattr(FlightRadar24API, name)
+
+    @functools.wraps(method)
+    async def coroutine_method(self, *args, **kwargs):
+        return await self.run_blocking(getattr(self.api, name), *args, **kwargs)
+
+    return coroutine_method
+
+
+for _name in (
+    "get_airlines",
+    "get_airline_logo",
+    "get_airport",
+    "get_airport_details",
+    "get_airport_disruptions",
+    "get_airports",
+    "get_bookmarks",
+    "get_country_flag",
+    "get_flight_details",
+    "get_flights",
+    "get_flights_batch",
+    "get_flights_details",
+    "get_history_data",
+    "get_history_track",
+    "get_most_tracked",
+    "get_volcanic_eruptions",
+    "get_zones",
+    "search",
+    "login",
+    "logout",
+):
+    setattr(AsyncFlightRadar24API, _name, _coroutine_method(_name))
+
+del _name
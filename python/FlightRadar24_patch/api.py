@@ -2,14 +2,25 @@
 
 from typing import Any, Dict, List, Optional, Tuple, Union
 
+import concurrent.futures
 import dataclasses
 import math
 
+import numpy as np
+
+from .batch import FlightBatch
+from .cache import ResponseCache
+from .coalesce import CoalescingSession, FeedSnapshot, get_shared_snapshot
 from .core import Core
 from .entities.airport import Airport
 from .entities.flight import Flight
 from .errors import AirportNotFoundError, LoginError
+from .history import parse_history
+from .reference import ReferenceDataCache
+from .search import SearchIndex
 from .request import APIRequest
+from .session import SessionConfig, SessionPool
+from .throttle import ThrottledSession
 
 
 @dataclasses.dataclass
@@ -32,32 +43,74 @@ class FlightTrackerConfig(object):
     limit: str = "5000"
 
 
+@dataclasses.dataclass
+class FlightDetailsResult(object):
+    """
+    Data class with the outcome of a detail request for a single flight.
+    """
+    flight: Flight
+    details: Optional[Dict] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
 class FlightRadar24API(object):
     """
     Main class of the FlightRadarAPI
     """
 
-    def __init__(self, user: Optional[str] = None, password: Optional[str] = None, timeout: int = 10):
+    def __init__(
+        self,
+        user: Optional[str] = None,
+        password: Optional[str] = None,
+        timeout: int = 10,
+        *,
+        session_config: Optional[SessionConfig] = None,
+        session: Optional[Any] = None,
+        details_cache: Optional[ResponseCache] = None,
+        snapshot: Optional[FeedSnapshot] = None,
+        reference_cache: Optional[ReferenceDataCache] = None,
+        search_index: Optional[SearchIndex] = None
+    ):
         """
         Constructor of the FlightRadar24API class.
 
         :param user: Your email (optional)
         :param password: Your password (optional)
+        :param timeout: Timeout of each request in seconds
+        :param session_config: Pool, keep-alive and retry settings of the HTTP session (optional)
+        :param session: Session sending the requests, e.g. a FeedRecorder or ReplaySession. If None, a SessionPool
+                        throttled by the rate limiter and circuit breaker of the process is created, and identical
+                        concurrent requests of the process are sent once.
+        :param details_cache: Cache of flight details, keyed by flight ID. If None, a cache with a TTL of 3 seconds is used.
+        :param snapshot: Snapshot of the latest unfiltered feed response, answering requests for a single flight.
+                         If None, the snapshot shared by the process is used.
+        :param reference_cache: Cache of airlines, zones, most tracked flights, airport disruptions and volcanic eruptions.
+                                If None, a cache in memory is used.
+        :param search_index: Local index answering search(), filled by unfiltered get_flights() calls with bounds
+                             and by remote search results. If None, an empty index is used.
         """
         self.__flight_tracker_config = FlightTrackerConfig()
         self.__login_data: Optional[Dict] = None
 
         self.timeout: int = timeout
+        self.session: SessionPool = session if session is not None else CoalescingSession(ThrottledSession(SessionPool(session_config)))
+        self.details_cache: ResponseCache = details_cache if details_cache is not None else ResponseCache(ttl=3.0)
+        self.snapshot: FeedSnapshot = snapshot if snapshot is not None else get_shared_snapshot()
+        self.reference_cache: ReferenceDataCache = reference_cache if reference_cache is not None else ReferenceDataCache()
+        self.search_index: SearchIndex = search_index if search_index is not None else SearchIndex()
 
         if user is not None and password is not None:
             self.login(user, password)
 
     def get_airlines(self) -> List[Dict]:
         """
-        Return a list with all airlines.
+        Return a list with all airlines. The list is cached, see reference_cache.
         """
-        response = APIRequest(Core.airlines_data_url, headers=Core.json_headers, timeout=self.timeout)
-        return response.get_content()["rows"]
+        return self.reference_cache.get("airlines", lambda: self.__get_reference_data(Core.airlines_data_url)["rows"])
 
     def get_airline_logo(self, iata: str, icao: str) -> Optional[Tuple[bytes, str]]:
         """
@@ -68,7 +121,7 @@ class FlightRadar24API(object):
         first_logo_url = Core.airline_logo_url.format(iata, icao)
 
         # Try to get the image by the first URL option.
-        response = APIRequest(first_logo_url, headers=Core.image_headers, exclude_status_codes=[403,], timeout=self.timeout)
+        response = APIRequest(first_logo_url, headers=Core.image_headers, exclude_status_codes=[403,], timeout=self.timeout, session=self.session)
         status_code = response.get_status_code()
 
         if not str(status_code).startswith("4"):
@@ -77,7 +130,7 @@ class FlightRadar24API(object):
         # Get the image by the second airline logo URL.
         second_logo_url = Core.alternative_airline_logo_url.format(icao)
 
-        response = APIRequest(second_logo_url, headers=Core.image_headers, timeout=self.timeout)
+        response = APIRequest(second_logo_url, headers=Core.image_headers, timeout=self.timeout, session=self.session)
         status_code = response.get_status_code()
 
         if not str(status_code).startswith("4"):
@@ -101,7 +154,7 @@ class FlightRadar24API(object):
 
             return airport
 
-        response = APIRequest(Core.airport_data_url.format(code), headers=Core.json_headers, timeout=self.timeout)
+        response = APIRequest(Core.airport_data_url.format(code), headers=Core.json_headers, timeout=self.timeout, session=self.session)
         content = response.get_content()
 
         if not content or not isinstance(content, dict) or not content.get("details"):
@@ -131,7 +184,7 @@ class FlightRadar24API(object):
         request_params["page"] = page
 
         # Request details from the FlightRadar24.
-        response = APIRequest(Core.api_airport_data_url, request_params, Core.json_headers, exclude_status_codes=[400,], timeout=self.timeout)
+        response = APIRequest(Core.api_airport_data_url, request_params, Core.json_headers, exclude_status_codes=[400,], timeout=self.timeout, session=self.session)
         content: Dict = response.get_content()
 
         if response.get_status_code() == 400 and content.get("errors"):
@@ -155,16 +208,15 @@ class FlightRadar24API(object):
 
     def get_airport_disruptions(self) -> Dict:
         """
-        Return airport disruptions.
+        Return airport disruptions. They are cached, see reference_cache.
         """
-        response = APIRequest(Core.airport_disruptions_url, headers=Core.json_headers, timeout=self.timeout)
-        return response.get_content()
+        return self.reference_cache.get("airport_disruptions", lambda: self.__get_reference_data(Core.airport_disruptions_url))
 
     def get_airports(self) -> List[Airport]:
         """
         Return a list with all airports.
         """
-        response = APIRequest(Core.airports_data_url, headers=Core.json_headers, timeout=self.timeout)
+        response = APIRequest(Core.airports_data_url, headers=Core.json_headers, timeout=self.timeout, session=self.session)
 
         airports: List[Airport] = list()
 
@@ -186,7 +238,7 @@ class FlightRadar24API(object):
 
         cookies = self.__login_data["cookies"]
 
-        response = APIRequest(Core.bookmarks_url, headers=headers, cookies=cookies, timeout=self.timeout)
+        response = APIRequest(Core.bookmarks_url, headers=headers, cookies=cookies, timeout=self.timeout, session=self.session)
         return response.get_content()
 
     def get_bounds(self, zone: Dict[str, float]) -> str:
@@ -263,20 +315,85 @@ class FlightRadar24API(object):
         if "origin" in headers:
             headers.pop("origin")  # Does not work for this request.
 
-        response = APIRequest(flag_url, headers=headers, timeout=self.timeout)
+        response = APIRequest(flag_url, headers=headers, timeout=self.timeout, session=self.session)
         status_code = response.get_status_code()
 
         if not str(status_code).startswith("4"):
             return response.get_content(), flag_url.split(".")[-1]
 
-    def get_flight_details(self, flight: Flight) -> Dict[Any, Any]:
+    def get_flight_details(self, flight: Flight, timeout: Optional[float] = None) -> Dict[Any, Any]:
         """
         Return the flight details from Data Live FlightRadar24.
 
+        Details are cached per flight ID for the TTL of the details cache. The returned
+        dictionary may be shared with other callers and must not be modified.
+
         :param flight: A Flight instance
+        :param timeout: Timeout of the request in seconds. If None, the timeout of the instance is used.
         """
-        response = APIRequest(Core.flight_data_url.format(flight.id), headers=Core.json_headers, timeout=self.timeout)
-        return response.get_content()
+        timeout = timeout if timeout is not None else self.timeout
+
+        # Serve fresh details from the cache, revalidate stale ones with a conditional request.
+        entry = self.details_cache.get(flight.id)
+
+        if entry is not None and entry.is_fresh():
+            return entry.content
+
+        headers = Core.json_headers.copy()
+        headers.update(self.details_cache.get_validators(entry))
+
+        response = APIRequest(
+            Core.flight_data_url.format(flight.id), headers=headers, exclude_status_codes=[304,],
+            timeout=timeout, session=self.session
+        )
+
+        if response.get_status_code() == 304 and entry is not None:
+            self.details_cache.revalidated(flight.id, entry)
+            return entry.content
+
+        content = response.get_content()
+        self.details_cache.put(flight.id, content, response.get_headers())
+
+        return content
+
+    def get_flights_details(
+        self,
+        flights: List[Flight],
+        *,
+        max_workers: int = 8,
+        timeout: Optional[float] = None
+    ) -> List[FlightDetailsResult]:
+        """
+        Return the details of many flights, requested concurrently.
+
+        The results keep the order of the given flights. A failed request does not abort the others,
+        its exception is reported in the error field of the result for that flight.
+
+        :param flights: A list of Flight instances
+        :param max_workers: Maximum number of requests in flight at the same time
+        :param timeout: Timeout of each request in seconds. If None, the timeout of the instance is used.
+        """
+        if max_workers < 1:
+            raise ValueError(f"The number of workers must be at least 1. Got {max_workers}.")
+
+        results = [FlightDetailsResult(flight) for flight in flights]
+
+        if not flights:
+            return results
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(max_workers, len(flights))) as executor:
+            futures = {
+                executor.submit(self.get_flight_details, flight, timeout): index
+                for index, flight in enumerate(flights)
+            }
+
+            for future in concurrent.futures.as_completed(futures):
+                result = results[futures[future]]
+
+                try: result.details = future.result()
+                except Exception as error: result.error = error
+
+        return results
 
     def get_flights(
         self,
@@ -287,6 +404,7 @@ class FlightRadar24API(object):
         *,
         details: bool = False,
         flight_id: Optional[str] = None,
+        details_max_workers: int = 8,
     ) -> List[Flight]:
         """
         Return a list of flights. See more options at set_flight_tracker_config() method.
@@ -296,22 +414,20 @@ class FlightRadar24API(object):
         :param registration: Aircraft registration
         :param aircraft_type: Aircraft model code. Ex: "B737"
         :param details: If True, it returns flights with detailed information
-        """
-        request_params = dataclasses.asdict(self.__flight_tracker_config)
+        :param flight_id: ID of a flight that must be included in the response
+        :param details_max_workers: Maximum number of concurrent detail requests, used when details is True
 
-        if self.__login_data is not None:
-            request_params["enc"] = self.__login_data["cookies"]["_frPl"]
+        Requests filtered by flight_id only are answered from the feed snapshot when the flight is in it.
+        Unfiltered requests with bounds update the snapshot and the live flights of the search index.
+        """
+        unfiltered = airline is None and registration is None and aircraft_type is None
 
-        # Insert the method parameters into the dictionary for the request.
-        if airline: request_params["airline"] = airline
-        if bounds: request_params["bounds"] = bounds.replace(",", "%2C")
-        if registration: request_params["reg"] = registration
-        if aircraft_type: request_params["type"] = aircraft_type
-        if flight_id: request_params["selected"] = flight_id
+        if unfiltered and flight_id is not None and not details:
+            flight = self.snapshot.get_flight(flight_id)
+            if flight is not None: return [flight]
 
-        # Get all flights from Data Live FlightRadar24.
-        response = APIRequest(Core.real_time_flight_tracker_data_url, request_params, Core.json_headers, timeout=self.timeout)
-        response = response.get_content()
+        response = self.__get_flights_content(airline, bounds, registration, aircraft_type, flight_id)
+        publish = unfiltered and flight_id is None and bounds is not None
 
         flights: List[Flight] = list()
 
@@ -324,13 +440,67 @@ class FlightRadar24API(object):
             flight = Flight(flight_id, flight_info)
             flights.append(flight)
 
-            # Set flight details.
-            if details:
-                flight_details = self.get_flight_details(flight)
-                flight.set_flight_details(flight_details)
+        if publish:
+            self.snapshot.publish(bounds, flights)
+            self.search_index.set_live_flights(flights)
+
+        # Set flight details. Flights whose request failed are kept with their basic information.
+        if details:
+            for result in self.get_flights_details(flights, max_workers=details_max_workers):
+                if result.ok: result.flight.set_flight_details(result.details)
 
         return flights
 
+    def get_flights_batch(
+        self,
+        airline: Optional[str] = None,
+        bounds: Optional[str] = None,
+        registration: Optional[str] = None,
+        aircraft_type: Optional[str] = None,
+        *,
+        flight_id: Optional[str] = None,
+    ) -> FlightBatch:
+        """
+        Return the flights as a columnar FlightBatch. See more options at set_flight_tracker_config() method.
+
+        Takes the same filters as get_flights(), but no Flight instance is created until it is requested from the batch.
+
+        :param airline: The airline ICAO. Ex: "DAL"
+        :param bounds: Coordinates (y1, y2 ,x1, x2). Ex: "75.78,-75.78,-427.56,427.56"
+        :param registration: Aircraft registration
+        :param aircraft_type: Aircraft model code. Ex: "B737"
+        :param flight_id: ID of a flight that must be included in the response
+        """
+        response = self.__get_flights_content(airline, bounds, registration, aircraft_type, flight_id)
+        return FlightBatch.from_feed(response)
+
+    def __get_flights_content(
+        self,
+        airline: Optional[str],
+        bounds: Optional[str],
+        registration: Optional[str],
+        aircraft_type: Optional[str],
+        flight_id: Optional[str]
+    ) -> Dict:
+        """
+        Request the real time flight tracker and return the content of the response.
+        """
+        request_params = dataclasses.asdict(self.__flight_tracker_config)
+
+        if self.__login_data is not None:
+            request_params["enc"] = self.__login_data["cookies"]["_frPl"]
+
+        # Insert the method parameters into the dictionary for the request.
+        if airline: request_params["airline"] = airline
+        if bounds: request_params["bounds"] = bounds.replace(",", "%2C")
+        if registration: request_params["reg"] = registration
+        if aircraft_type: request_params["type"] = aircraft_type
+        if flight_id: request_params["selected"] = flight_id
+
+        # Get all flights from Data Live FlightRadar24.
+        response = APIRequest(Core.real_time_flight_tracker_data_url, request_params, Core.json_headers, timeout=self.timeout, session=self.session)
+        return response.get_content()
+
     def get_flight_tracker_config(self) -> FlightTrackerConfig:
         """
         Return a copy of the current config of the Real Time Flight Tracker, used by get_flights() method.
@@ -356,12 +526,43 @@ class FlightRadar24API(object):
         response = APIRequest(
             Core.historical_data_url.format(flight.id, file_type, timestamp),
             headers=Core.json_headers, cookies=self.__login_data["cookies"],
-            timeout=self.timeout
+            timeout=self.timeout, session=self.session
         )
 
         content = response.get_content()
         return str(content.decode("utf-8"))
 
+    def get_history_track(self, flight: Flight, file_type: str, timestamp: int) -> np.ndarray:
+        """
+        Download historical data of a flight and parse it into a track array while it is received,
+        without holding the whole export or decoding it to a string.
+
+        The array has the fields ts, lat, lon, alt, speed and heading (see history.HISTORY_DTYPE) and is sorted by time.
+
+        :param flight: A Flight instance
+        :param file_type: Must be "CSV" or "KML"
+        :param timestamp: A Unix timestamp
+        """
+        if not self.is_logged_in():
+            raise LoginError("You must log in to your account.")
+
+        file_type = file_type.lower()
+
+        if file_type not in ["csv", "kml"]:
+            raise ValueError(f"File type '{file_type}' is not supported. Only CSV and KML are supported.")
+
+        # The streamed body is decompressed by requests, which supports gzip without further packages.
+        headers = Core.json_headers.copy()
+        headers["accept-encoding"] = "gzip"
+
+        response = APIRequest(
+            Core.historical_data_url.format(flight.id, file_type, timestamp),
+            headers=headers, cookies=self.__login_data["cookies"],
+            timeout=self.timeout, session=self.session, stream=True
+        )
+
+        return parse_history(response.iter_body(), file_type)
+
     def get_login_data(self) -> Dict[Any, Any]:
         """
         Return the user data.
@@ -373,35 +574,56 @@ class FlightRadar24API(object):
 
     def get_most_tracked(self) -> Dict:
         """
-        Return the most tracked data.
+        Return the most tracked data. It is cached, see reference_cache.
         """
-        response = APIRequest(Core.most_tracked_url, headers=Core.json_headers, timeout=self.timeout)
-        return response.get_content()
+        return self.reference_cache.get("most_tracked", lambda: self.__get_reference_data(Core.most_tracked_url))
+
+    def get_session_stats(self) -> Dict[str, int]:
+        """
+        Return the number of requests, connection handshakes and reused connections of the HTTP session.
+        """
+        return self.session.get_stats()
 
     def get_volcanic_eruptions(self) -> Dict:
         """
-        Return boundaries of volcanic eruptions and ash clouds impacting aviation.
+        Return boundaries of volcanic eruptions and ash clouds impacting aviation. They are cached, see reference_cache.
         """
-        response = APIRequest(Core.volcanic_eruption_data_url, headers=Core.json_headers, timeout=self.timeout)
-        return response.get_content()
+        return self.reference_cache.get("volcanic_eruptions", lambda: self.__get_reference_data(Core.volcanic_eruption_data_url))
 
     def get_zones(self) -> Dict[str, Dict]:
         """
-        Return all major zones on the globe.
+        Return all major zones on the globe. They are cached, see reference_cache.
         """
-        response = APIRequest(Core.zones_data_url, headers=Core.json_headers, timeout=self.timeout)
-        zones = response.get_content()
+        def download() -> Dict[str, Dict]:
+            zones = self.__get_reference_data(Core.zones_data_url)
+
+            if "version" in zones:
+                zones.pop("version")
 
-        if "version" in zones:
-            zones.pop("version")
+            return zones
 
-        return zones
+        return self.reference_cache.get("zones", download)
 
-    def search(self, query: str, limit: int = 50) -> Dict:
+    def __get_reference_data(self, url: str) -> Any:
         """
-        Return the search result.
+        Request reference data and return the content of the response.
         """
-        response = APIRequest(Core.search_data_url.format(query, limit), headers=Core.json_headers, timeout=self.timeout)
+        response = APIRequest(url, headers=Core.json_headers, timeout=self.timeout, session=self.session)
+        return response.get_content()
+
+    def search(self, query: str, limit: int = 50, *, local: bool = True) -> Dict:
+        """
+        Return the search result, grouped by type (e.g. "live", "airport", "operator").
+
+        :param query: Callsign, flight number, registration, airport or airline, or a prefix or part of it
+        :param limit: Maximum number of results
+        :param local: If True, the search index answers first. The remote search is only requested when nothing matches locally.
+        """
+        if local:
+            data = self.search_index.search(query, limit)
+            if data: return data
+
+        response = APIRequest(Core.search_data_url.format(query, limit), headers=Core.json_headers, timeout=self.timeout, session=self.session)
         results = response.get_content().get("results", [])
         stats = response.get_content().get("stats", {})
 
@@ -414,6 +636,8 @@ class FlightRadar24API(object):
                 data[name].append(results[i])
                 i += 1
             counted_total += count
+
+        self.search_index.add_results(data)
         return data
 
     def is_logged_in(self) -> bool:
@@ -436,7 +660,7 @@ class FlightRadar24API(object):
             "type": "web"
         }
 
-        response = APIRequest(Core.user_login_url, headers=Core.json_headers, data=data, timeout=self.timeout)
+        response = APIRequest(Core.user_login_url, headers=Core.json_headers, data=data, timeout=self.timeout, session=self.session)
         status_code = response.get_status_code()
         content = response.get_content()
 
@@ -460,7 +684,7 @@ class FlightRadar24API(object):
         cookies = self.__login_data["cookies"]
         self.__login_data = None
 
-        response = APIRequest(Core.user_login_url, headers=Core.json_headers, cookies=cookies, timeout=self.timeout)
+        response = APIRequest(Core.user_login_url, headers=Core.json_headers, cookies=cookies, timeout=self.timeout, session=self.session)
         return str(response.get_status_code()).startswith("2")
 
     def set_flight_tracker_config(
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .entities.entity import Entity
+from .entities.flight import Flight
+
+
+# Columns of a FlightBatch: (name, index in the feed row, dtype).
+# The names are the attribute names of the Flight class. The airline IATA is derived from the flight number.
+# Numeric columns are floats, so a missing value is NaN and fails every comparison instead of passing as 0.
+FLIGHT_BATCH_FIELDS: Tuple[Tuple[str, int, str], ...] = (
+    ("icao_24bit", 0, "U"),
+    ("latitude", 1, "f8"),
+    ("longitude", 2, "f8"),
+    ("heading", 3, "f8"),
+    ("altitude", 4, "f8"),
+    ("ground_speed", 5, "f8"),
+    ("squawk", 6, "U"),
+    ("aircraft_code", 8, "U"),
+    ("registration", 9, "U"),
+    ("time", 10, "f8"),
+    ("origin_airport_iata", 11, "U"),
+    ("destination_airport_iata", 12, "U"),
+    ("number", 13, "U"),
+    ("on_ground", 14, "f8"),
+    ("vertical_speed", 15, "f8"),
+    ("callsign", 16, "U"),
+    ("airline_icao", 18, "U"),
+)
+
+
+def _to_column(values: Tuple[Any, ...], dtype: str) -> np.ndarray:
+    """
+    Convert the values of a feed column to an array. Missing texts are replaced like the Flight class does,
+    missing numbers by NaN.
+    """
+    if dtype == "U":
+        if None in values:
+            values = [value if value is not None else Entity._default_text for value in values]
+
+        return np.array(values, dtype=dtype)
+
+    try: return np.array(values, dtype=dtype)
+    except (TypeError, ValueError):
+        return np.array([value if isinstance(value, (int, float)) else np.nan for value in values], dtype=dtype)
+
+
+class FlightBatch(object):
+    """
+    Columnar representation of the flights of a live feed snapshot.
+
+    Every column is a NumPy array, so filtering and projection can run vectorized.
+    Flight instances are only created on demand, when indexing with an integer or iterating.
+
+    Indexing:
+    - batch["altitude"] returns a column
+    - batch[3] returns a Flight instance
+    - batch[mask], batch[indices] or batch[start:stop] return a new FlightBatch
+    """
+    def __init__(self, ids: List[str], rows: List[List[Any]], data: Optional[np.ndarray] = None):
+        """
+        Constructor of the FlightBatch class.
+
+        :param ids: The flight IDs specifically used by FlightRadar24
+        :param rows: Feed rows of the flights, in the same order as the IDs
+        :param data: Structured array of the columns. If None, it is built from the rows.
+        """
+        self.ids = ids
+        self.rows = rows
+        self.data = data if data is not None else self.__build_data(ids, rows)
+
+    def __build_data(self, ids: List[str], rows: List[List[Any]]) -> np.ndarray:
+        columns = {"id": np.array(ids, dtype="U")}
+
+        if rows:
+            values = list(zip(*rows))
+
+            for name, index, dtype in FLIGHT_BATCH_FIELDS:
+                columns[name] = _to_column(values[index], dtype)
+
+            columns["airline_iata"] = np.array([
+                number[:2] if isinstance(number, str) else Entity._default_text
+                for number in values[13]
+            ], dtype="U")
+        else:
+            for name, _, dtype in FLIGHT_BATCH_FIELDS:
+                columns[name] = np.empty(0, dtype=dtype if dtype != "U" else "U1")
+
+            columns["airline_iata"] = np.empty(0, dtype="U1")
+
+        data = np.empty(len(ids), dtype=[(name, column.dtype) for name, column in columns.items()])
+
+        for name, column in columns.items():
+            data[name] = column
+
+        return data
+
+    @classmethod
+    def from_feed(cls, content: Dict) -> "FlightBatch":
+        """
+        Create a FlightBatch from the content of a live feed response.
+
+        :param content: Dictionary received from the real time flight tracker
+        """
+        ids: List[str] = list()
+        rows: List[List[Any]] = list()
+
+        for flight_id, flight_info in content.items():
+
+            # Get flights only.
+            if not flight_id[0].isnumeric():
+                continue
+
+            ids.append(flight_id)
+            rows.append(flight_info)
+
+        return cls(ids, rows)
+
+    def __getitem__(self, key: Union[str, int, slice, np.ndarray, List[int]]) -> Union[np.ndarray, Flight, "FlightBatch"]:
+        if isinstance(key, str):
+            return self.data[key]
+
+        if isinstance(key, (int, np.integer)):
+            return Flight(self.ids[key], self.rows[key])
+
+        indices = np.arange(len(self.ids))[key]
+        return FlightBatch([self.ids[i] for i in indices], [self.rows[i] for i in indices], self.data[indices])
+
+    def __iter__(self) -> Iterator[Flight]:
+        for flight_id, flight_info in zip(self.ids, self.rows):
+            yield Flight(flight_id, flight_info)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __repr__(self) -> str:
+        return "<FlightBatch of {} flights>".format(len(self))
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return self.data.dtype.names
+
+    def index(self, flight_id: str) -> int:
+        """
+        Return the position of a flight ID in the batch.
+        """
+        return self.ids.index(flight_id)
+
+    def to_flights(self) -> List[Flight]:
+        """
+        Return a list with a Flight instance for each flight of the batch.
+        """
+        return list(self)
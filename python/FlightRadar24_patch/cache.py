@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+
+from typing import Any, Dict, Hashable, Optional
+
+import collections
+import dataclasses
+import threading
+import time
+
+
+@dataclasses.dataclass
+class CacheEntry(object):
+    """
+    Data class with a cached response and its validators.
+    """
+    content: Any
+    expires: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        return (now if now is not None else time.monotonic()) < self.expires
+
+
+class ResponseCache(object):
+    """
+    Size-bounded LRU cache of responses with TTL and ETag / Last-Modified revalidation.
+    """
+    def __init__(self, ttl: float = 3.0, maxsize: int = 1024):
+        """
+        Constructor of the ResponseCache class.
+
+        :param ttl: Time in seconds an entry is served without revalidation
+        :param maxsize: Maximum number of entries. The least recently used entry is evicted first.
+        """
+        if maxsize < 1:
+            raise ValueError(f"The cache size must be at least 1. Got {maxsize}.")
+
+        self.ttl = ttl
+        self.maxsize = maxsize
+
+        self.__entries: "collections.OrderedDict[Hashable, CacheEntry]" = collections.OrderedDict()
+        self.__lock = threading.Lock()
+
+        self.__stats = {"hits": 0, "misses": 0, "revalidations": 0, "evictions": 0}
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def clear(self) -> None:
+        """
+        Remove all entries.
+        """
+        with self.__lock:
+            self.__entries.clear()
+
+    def get(self, key: Hashable) -> Optional[CacheEntry]:
+        """
+        Return the entry of the key, fresh or stale, or None. A fresh entry counts as a hit, anything else as a miss.
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+
+            if entry is None:
+                self.__stats["misses"] += 1
+                return None
+
+            self.__entries.move_to_end(key)
+
+            if entry.is_fresh(): self.__stats["hits"] += 1
+            else: self.__stats["misses"] += 1
+
+            return entry
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Return the number of hits, misses, successful revalidations and evictions.
+        """
+        with self.__lock:
+            return dict(self.__stats, size=len(self.__entries))
+
+    def get_validators(self, entry: Optional[CacheEntry]) -> Dict[str, str]:
+        """
+        Return the conditional request headers for revalidating an entry.
+        """
+        headers = dict()
+
+        if entry is not None:
+            if entry.etag: headers["if-none-match"] = entry.etag
+            if entry.last_modified: headers["if-modified-since"] = entry.last_modified
+
+        return headers
+
+    def pop(self, key: Hashable) -> Optional[CacheEntry]:
+        """
+        Remove the entry of the key and return it.
+        """
+        with self.__lock:
+            return self.__entries.pop(key, None)
+
+    def put(self, key: Hashable, content: Any, headers: Optional[Dict] = None) -> CacheEntry:
+        """
+        Store the content of a response, with the validators found in its headers.
+
+        :param key: Key of the entry
+        :param content: Content of the response
+        :param headers: Headers of the response
+        """
+        headers = headers if headers is not None else dict()
+
+        entry = CacheEntry(
+            content=content,
+            expires=time.monotonic() + self.ttl,
+            etag=headers.get("ETag"),
+            last_modified=headers.get("Last-Modified")
+        )
+
+        with self.__lock:
+            self.__insert(key, entry)
+
+        return entry
+
+    def revalidated(self, key: Hashable, entry: CacheEntry) -> None:
+        """
+        Mark an entry as confirmed by the server (status 304), so it is fresh for another TTL.
+
+        An entry evicted while the conditional request was in flight is stored again,
+        unless a newer entry was stored for the key meanwhile.
+        """
+        entry.expires = time.monotonic() + self.ttl
+
+        with self.__lock:
+            self.__stats["revalidations"] += 1
+
+            if key not in self.__entries:
+                self.__insert(key, entry)
+
+    def __insert(self, key: Hashable, entry: CacheEntry) -> None:
+        """
+        Store an entry as the most recently used one and evict the least recently used entries beyond maxsize.
+        The lock must be held.
+        """
+        self.__entries[key] = entry
+        self.__entries.move_to_end(key)
+
+        while len(self.__entries) > self.maxsize:
+            self.__entries.popitem(last=False)
+            self.__stats["evictions"] += 1
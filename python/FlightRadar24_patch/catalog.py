@@ -0,0 +1,404 @@
+# -*- coding: utf-8 -*-
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import json
+import math
+import os
+import threading
+import time
+
+import numpy as np
+
+from .entities.airport import Airport
+from .geodesy import EARTH_RADIUS, get_distances
+from .regions import parse_bounds
+
+
+# Columns of the catalog file: the basic information of get_airports().
+AIRPORT_DTYPE = np.dtype([
+    ("lat", "f8"), ("lon", "f8"), ("alt", "i4"),
+    ("iata", "U4"), ("icao", "U4"), ("name", "U64"), ("country", "U32")
+])
+
+
+class GridIndex(object):
+    """
+    Spatial index of positions in cells of a regular latitude/longitude grid.
+    """
+    def __init__(self, latitudes: np.ndarray, longitudes: np.ndarray, cell: float = 1.0):
+        """
+        Constructor of the GridIndex class.
+
+        :param latitudes: Latitudes of the positions
+        :param longitudes: Longitudes of the positions
+        :param cell: Width and height of the cells in degrees
+        """
+        self.cell = cell
+        self.rows = math.ceil(180 / cell)
+        self.columns = math.ceil(360 / cell)
+
+        self.latitudes = np.ascontiguousarray(latitudes, dtype=np.float64)
+        self.longitudes = np.ascontiguousarray(longitudes, dtype=np.float64)
+
+        cells = self.get_row(self.latitudes) * self.columns + self.get_column(self.longitudes)
+
+        # Positions sorted by cell, and the range of each non-empty cell in this order.
+        self.order = np.argsort(cells, kind="stable")
+        sorted_cells = cells[self.order]
+        keys, starts = np.unique(sorted_cells, return_index=True)
+        ends = np.append(starts[1:], len(sorted_cells))
+
+        self.cells: Dict[int, Tuple[int, int]] = dict(zip(keys.tolist(), zip(starts.tolist(), ends.tolist())))
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def get_row(self, latitudes: Any) -> Any:
+        return np.clip(np.floor((np.asarray(latitudes) + 90) / self.cell).astype(np.int64), 0, self.rows - 1)
+
+    def get_column(self, longitudes: Any) -> Any:
+        return np.floor((np.asarray(longitudes) + 180) / self.cell).astype(np.int64) % self.columns
+
+    def get_cells(self, rows: Iterable[int], columns: Iterable[int]) -> np.ndarray:
+        """
+        Return the indices of the positions in the cells of the rows and columns.
+        """
+        ranges = list()
+
+        for row in rows:
+            if not 0 <= row < self.rows: continue
+
+            for column in columns:
+                cell = self.cells.get(row * self.columns + column % self.columns)
+                if cell is not None: ranges.append(self.order[cell[0]:cell[1]])
+
+        return np.concatenate(ranges) if ranges else np.empty(0, dtype=np.int64)
+
+    def nearest(self, latitude: float, longitude: float, count: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return the indices of the count nearest positions and their distances in kilometers, nearest first.
+        """
+        count = min(count, len(self))
+
+        if count <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        row = min(max(math.floor((latitude + 90) / self.cell), 0), self.rows - 1)
+        column = math.floor((longitude + 180) / self.cell) % self.columns
+        found: List[np.ndarray] = list()
+        total = 0
+
+        for ring in range(max(self.rows, self.columns)):
+            # The ring has more cells than there are positions, comparing all positions is cheaper.
+            if 8 * ring > len(self):
+                distances = get_distances(latitude, longitude, self.latitudes, self.longitudes)
+                selected = np.argsort(distances, kind="stable")[:count]
+                return selected, distances[selected]
+
+            rows = range(row - ring, row + ring + 1)
+            columns = range(column - ring, column + ring + 1)
+
+            # Cells of the square ring around the cell of the position.
+            if ring == 0:
+                indices = self.get_cells(rows, columns)
+            else:
+                indices = np.concatenate([
+                    self.get_cells([row - ring, row + ring], columns),
+                    self.get_cells(range(row - ring + 1, row + ring), [column - ring, column + ring])
+                ])
+
+            if len(indices):
+                found.append(indices)
+                total += len(indices)
+
+            # The square covers all longitudes, the next rings add no position.
+            complete = ring * 2 + 1 >= self.columns
+
+            if total < count and not complete: continue
+
+            candidates = np.unique(np.concatenate(found)) if complete else np.concatenate(found)
+            distances = get_distances(latitude, longitude, self.latitudes[candidates], self.longitudes[candidates])
+            selected = np.argsort(distances, kind="stable")[:count]
+
+            # Positions outside of the searched square are at least ring cells away in latitude or longitude.
+            # The distance to the meridian at that longitude difference is the lower one.
+            angle = min(math.radians(ring * self.cell), math.pi / 2)
+            bound = EARTH_RADIUS * math.asin(math.cos(math.radians(latitude)) * math.sin(angle))
+
+            if complete or distances[selected[-1]] <= bound:
+                return candidates[selected], distances[selected]
+
+        return np.empty(0, dtype=np.int64), np.empty(0)
+
+    def in_bounds(self, bounds: str) -> np.ndarray:
+        """
+        Return the indices of the positions within the bounds "y1,y2,x1,x2", sorted.
+        """
+        north, south, west, east = parse_bounds(bounds)
+        south, north = min(south, north), max(south, north)
+
+        rows = range(int(self.get_row(south)), int(self.get_row(north)) + 1)
+
+        if east - west >= 360:
+            columns = range(self.columns)
+            west, east = -math.inf, math.inf
+        else:
+            first = int(np.floor((west + 180) / self.cell))
+            columns = range(first, first + math.ceil((east - west) / self.cell) + 1)
+
+        indices = self.get_cells(rows, columns)
+
+        latitudes = self.latitudes[indices]
+        longitudes = self.longitudes[indices]
+
+        # Longitudes of the bounds may exceed [-180, 180], compare on the same turn as west.
+        if math.isfinite(west):
+            longitudes = (longitudes - west) % 360 + west
+
+        mask = (latitudes >= south) & (latitudes <= north) & (longitudes >= west) & (longitudes <= east)
+
+        # Wide bounds may visit a column twice.
+        return np.unique(indices[mask])
+
+
+class AirportCatalog(object):
+    """
+    Airport catalog stored on disk and loaded as memory-mapped arrays, with a spatial grid index.
+
+    The catalog is filled with get_airports() by update() when it is older than ttl, and completed
+    with single airports by get_airport() when an API is given. Queries do not use the network.
+    """
+    def __init__(self, path: str = os.path.join("cache", "airports"), ttl: float = 7 * 24 * 3600, cell: float = 1.0):
+        """
+        Constructor of the AirportCatalog class.
+
+        :param path: Directory of the catalog files
+        :param ttl: Seconds after which update() downloads the airports again
+        :param cell: Width and height in degrees of the cells of the spatial index
+        """
+        self.path = path
+        self.ttl = ttl
+        self.cell = cell
+
+        self.updated = 0.0
+
+        # Data and index of the catalog, swapped together so a query never pairs an index with other data.
+        data = np.empty(0, dtype=AIRPORT_DTYPE)
+        self.__snapshot: Tuple[np.ndarray, GridIndex] = (data, GridIndex(data["lat"], data["lon"], cell))
+        # Codes of the airports with the data they index.
+        self.__codes: Optional[Tuple[np.ndarray, Dict[str, int]]] = None
+        self.__lock = threading.Lock()
+
+        self.load()
+
+    def __len__(self) -> int:
+        return len(self.__snapshot[0])
+
+    @property
+    def data_file(self) -> str:
+        return os.path.join(self.path, "airports.npy")
+
+    @property
+    def meta_file(self) -> str:
+        return os.path.join(self.path, "meta.json")
+
+    def is_fresh(self) -> bool:
+        return len(self) > 0 and time.time() - self.updated < self.ttl
+
+    def load(self) -> bool:
+        """
+        Load the catalog files, if they exist. Return whether the catalog was loaded.
+        """
+        if not os.path.exists(self.data_file) or not os.path.exists(self.meta_file):
+            return False
+
+        with open(self.meta_file, "r") as file:
+            meta = json.load(file)
+
+        self.__set_data(np.load(self.data_file, mmap_mode="r"), meta["updated"])
+        return True
+
+    def update(self, api: Any) -> bool:
+        """
+        Download all airports with the API if the catalog is older than ttl. Return whether it was downloaded.
+
+        A failed download keeps the previous catalog, unless there is none.
+        """
+        if self.is_fresh():
+            return False
+
+        try:
+            airports = api.get_airports()
+        except Exception:
+            if len(self) == 0: raise
+            return False
+
+        self.save(airports)
+        return True
+
+    def save(self, airports: Iterable[Airport], updated: Optional[float] = None) -> None:
+        """
+        Replace the catalog by the airports and write it to disk.
+
+        :param airports: Airport instances with basic information, e.g. from get_airports()
+        :param updated: Time of the catalog. If None, the current time is used.
+        """
+        rows = [self.__get_row(airport) for airport in airports]
+        data = np.array(rows, dtype=AIRPORT_DTYPE) if rows else np.empty(0, dtype=AIRPORT_DTYPE)
+        updated = time.time() if updated is None else updated
+
+        os.makedirs(self.path, exist_ok=True)
+
+        # Write new files and swap them in, the current files may be mapped by another process.
+        with open(self.data_file + ".tmp", "wb") as file:
+            np.save(file, data)
+
+        with open(self.meta_file + ".tmp", "w") as file:
+            json.dump({"updated": updated, "count": len(data)}, file)
+
+        self.__set_data(data, updated)
+
+        os.replace(self.data_file + ".tmp", self.data_file)
+        os.replace(self.meta_file + ".tmp", self.meta_file)
+
+    def add(self, airport: Airport) -> None:
+        """
+        Add an airport to the catalog, or replace the airport with the same ICAO, and write it to disk.
+        """
+        icao = getattr(airport, "icao", None)
+        data = self.__snapshot[0]
+        airports = [self.__get_item(data, index) for index in range(len(data)) if data[index]["icao"] != icao]
+
+        self.save(airports + [airport], self.updated)
+
+    def get_item(self, index: int) -> Airport:
+        """
+        Return the airport at an index of the catalog.
+        """
+        return self.__get_item(self.__snapshot[0], index)
+
+    @staticmethod
+    def __get_item(data: np.ndarray, index: int) -> Airport:
+        row = data[index]
+
+        return Airport(basic_info={
+            "lat": float(row["lat"]),
+            "lon": float(row["lon"]),
+            "alt": int(row["alt"]),
+            "name": str(row["name"]),
+            "icao": str(row["icao"]),
+            "iata": str(row["iata"]),
+            "country": str(row["country"])
+        })
+
+    def get_airport(self, code: str, api: Optional[Any] = None) -> Optional[Airport]:
+        """
+        Return the airport with an IATA or ICAO code.
+
+        :param code: IATA or ICAO of the airport
+        :param api: If given, an airport missing from the catalog is requested with get_airport() and added.
+        """
+        code = code.upper()
+
+        data = self.__snapshot[0]
+        codes = self.__codes
+
+        if codes is None or codes[0] is not data:
+            codes = {code: index for index, code in enumerate(data["iata"].tolist()) if code}
+            codes.update({code: index for index, code in enumerate(data["icao"].tolist()) if code})
+            self.__codes = codes = (data, codes)
+
+        index = codes[1].get(code)
+
+        if index is not None:
+            return self.__get_item(data, index)
+
+        if api is None:
+            return None
+
+        airport = api.get_airport(code)
+        self.add(airport)
+
+        return airport
+
+    def nearest(self, latitude: float, longitude: float, count: int = 1) -> List[Tuple[Airport, float]]:
+        """
+        Return the count nearest airports with their distances in kilometers, nearest first.
+        """
+        data, index = self.__snapshot
+        indices, distances = index.nearest(latitude, longitude, count)
+        return [(self.__get_item(data, i), distance) for i, distance in zip(indices.tolist(), distances.tolist())]
+
+    def in_bounds(self, bounds: str) -> List[Airport]:
+        """
+        Return the airports within the bounds.
+
+        :param bounds: Coordinates (y1, y2 ,x1, x2). Ex: "75.78,-75.78,-427.56,427.56"
+        """
+        data, index = self.__snapshot
+        return [self.__get_item(data, i) for i in index.in_bounds(bounds).tolist()]
+
+    def __get_row(self, airport: Airport) -> Tuple:
+        def get(name: str, default: Any) -> Any:
+            value = getattr(airport, name, default)
+            return default if value is None or value == Airport._default_text else value
+
+        return (
+            float(airport.latitude), float(airport.longitude), int(get("altitude", 0)),
+            get("iata", ""), get("icao", ""), get("name", ""), get("country", "")
+        )
+
+    def __set_data(self, data: np.ndarray, updated: float) -> None:
+        index = GridIndex(data["lat"], data["lon"], self.cell)
+
+        with self.__lock:
+            self.__snapshot = (data, index)
+            self.__codes = None
+            self.updated = updated
+
+
+if __name__ == "__main__":
+    # Query benchmark of the catalog with a synthetic set of airports.
+    # Usage (from the python directory): python -m FlightRadar24_patch.catalog [airports]
+    import random
+    import sys
+    import tempfile
+
+    random.seed(0)
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    airports = [Airport(basic_info={
+        "lat": random.uniform(-60, 70), "lon": random.uniform(-180, 180), "alt": random.randint(0, 3000),
+        "name": f"Airport {index}", "icao": f"X{index:03X}"[-4:], "iata": "", "country": "Mock"
+    }) for index in range(count)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        catalog = AirportCatalog(directory)
+        start = time.perf_counter()
+        catalog.save(airports)
+        print("save:   {:>8.2f} ms for {} airports".format((time.perf_counter() - start) * 1000, count))
+
+        start = time.perf_counter()
+        catalog = AirportCatalog(directory)
+        print("load:   {:>8.2f} ms (memory-mapped)".format((time.perf_counter() - start) * 1000))
+
+        positions = [(random.uniform(-60, 70), random.uniform(-180, 180)) for _ in range(2000)]
+
+        for name, query in (
+            ("nearest", lambda lat, lon: catalog.nearest(lat, lon)),
+            ("nearest 5", lambda lat, lon: catalog.nearest(lat, lon, 5)),
+            ("in_bounds", lambda lat, lon: catalog.in_bounds(f"{lat + 1},{lat - 1},{lon - 2},{lon + 2}"))
+        ):
+            start = time.perf_counter()
+            for lat, lon in positions: query(lat, lon)
+            print("{:<9} {:>8.1f} us/query".format(name + ":", (time.perf_counter() - start) / len(positions) * 1e6))
+
+        # Check the nearest airports against a brute force search.
+        latitudes, longitudes = np.array([a.latitude for a in airports]), np.array([a.longitude for a in airports])
+
+        for lat, lon in positions[:200]:
+            expected = np.sort(get_distances(lat, lon, latitudes, longitudes))[:5]
+            assert np.allclose([distance for _, distance in catalog.nearest(lat, lon, 5)], expected)
+
+        print("nearest results match the brute force search")
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+
+from typing import Any, Callable, Dict, List, Optional
+
+import concurrent.futures
+import copy
+import threading
+import time
+
+import requests
+
+from .entities.flight import Flight
+from .regions import Bounds, parse_bounds
+from .replay import get_session_key
+
+
+class RequestCoalescer(object):
+    """
+    Single-flight execution of identical calls.
+
+    While a call for a key is running, further calls with the same key wait for it
+    and receive its result (or its exception) instead of running again.
+    """
+    def __init__(self):
+        self.__calls: Dict[str, concurrent.futures.Future] = dict()
+        self.__lock = threading.Lock()
+
+        self.calls = 0
+        self.coalesced = 0
+
+    def do(self, key: str, function: Callable[[], Any]) -> Any:
+        """
+        Run the function, unless a call with the same key is in flight, and return its result.
+
+        :param key: Key identifying identical calls
+        :param function: Function without arguments doing the call
+        """
+        with self.__lock:
+            future = self.__calls.get(key)
+
+            if future is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                future = self.__calls[key] = concurrent.futures.Future()
+                self.calls += 1
+                leader = True
+
+        if not leader:
+            return future.result()
+
+        try:
+            future.set_result(function())
+        except BaseException as error:
+            future.set_exception(error)
+        finally:
+            with self.__lock:
+                del self.__calls[key]
+
+        return future.result()
+
+    def get_stats(self) -> Dict[str, int]:
+        with self.__lock:
+            return {"calls": self.calls, "coalesced": self.coalesced, "in_flight": len(self.__calls)}
+
+
+_shared_coalescer: Optional[RequestCoalescer] = None
+_shared_snapshot: Optional["FeedSnapshot"] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_coalescer() -> RequestCoalescer:
+    """
+    Return the request coalescer shared by all clients of the process.
+    """
+    global _shared_coalescer
+
+    with _shared_lock:
+        if _shared_coalescer is None:
+            _shared_coalescer = RequestCoalescer()
+
+        return _shared_coalescer
+
+
+def get_shared_snapshot() -> "FeedSnapshot":
+    """
+    Return the feed snapshot shared by all clients of the process.
+    """
+    global _shared_snapshot
+
+    with _shared_lock:
+        if _shared_snapshot is None:
+            _shared_snapshot = FeedSnapshot()
+
+        return _shared_snapshot
+
+
+class CoalescingSession(object):
+    """
+    Session wrapper sending identical concurrent GET requests only once.
+
+    Requests are identical when their method, URL (with sorted query parameters), headers and cookies match,
+    so conditional or logged-in requests are never answered with the response of another caller.
+    All callers receive the same Response object. Other methods, e.g. the login POST, and streamed requests,
+    whose body can only be read once, are sent as they are.
+    """
+    def __init__(self, session: Any, coalescer: Optional[RequestCoalescer] = None):
+        """
+        Constructor of the CoalescingSession class.
+
+        :param session: The session sending the requests, e.g. a ThrottledSession
+        :param coalescer: A RequestCoalescer instance. If None, the shared coalescer of the process is used.
+        """
+        self.session = session
+        self.coalescer = coalescer if coalescer is not None else get_shared_coalescer()
+
+    def close(self) -> None:
+        self.session.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = self.coalescer.get_stats()
+        return dict(self.session.get_stats(), coalesced=stats["coalesced"])
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.models.Response:
+        """
+        Send a request through the wrapped session, or wait for an identical one in flight.
+        """
+        if method != "GET" or kwargs.get("stream"):
+            return self.session.request(method, url, **kwargs)
+
+        key = get_session_key(method, url, kwargs.get("headers"), kwargs.get("cookies"))
+        return self.coalescer.do(key, lambda: self.session.request(method, url, **kwargs))
+
+
+class FeedSnapshot(object):
+    """
+    Latest unfiltered feed response of an area, e.g. the one polled by the flight tracker.
+
+    Requests for a single flight are answered from the snapshot while it is fresh and the flight is in it.
+    """
+    def __init__(self, max_age: float = 5.0):
+        """
+        Constructor of the FeedSnapshot class.
+
+        :param max_age: Seconds the snapshot is used to answer requests
+        """
+        self.max_age = max_age
+
+        self.bounds: Optional[Bounds] = None
+        self.timestamp = 0.0
+
+        self.__flights: Dict[str, Flight] = dict()
+        self.__lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def is_fresh(self) -> bool:
+        return time.monotonic() - self.timestamp <= self.max_age
+
+    def publish(self, bounds: str, flights: List[Flight]) -> None:
+        """
+        Store the flights of an unfiltered feed response as the new snapshot.
+
+        :param bounds: Coordinates (y1, y2 ,x1, x2) of the response
+        :param flights: The flights of the response
+        """
+        with self.__lock:
+            self.bounds = parse_bounds(bounds)
+            self.timestamp = time.monotonic()
+            self.__flights = {flight.id: flight for flight in flights}
+
+    def get_flight(self, flight_id: str) -> Optional[Flight]:
+        """
+        Return a copy of the flight if the snapshot is fresh and the flight lies inside its bounds, else None.
+        """
+        with self.__lock:
+            flight = self.__flights.get(flight_id) if self.is_fresh() else None
+
+            if flight is not None:
+                north, south, west, east = self.bounds
+
+                if not (south <= flight.latitude <= north and west <= flight.longitude <= east):
+                    flight = None
+
+            if flight is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return copy.copy(flight)
+
+    def get_stats(self) -> Dict[str, int]:
+        with self.__lock:
+            return {"hits": self.hits, "misses": self.misses, "flights": len(self.__flights)}
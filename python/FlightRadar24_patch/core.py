@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 from abc import ABC
+from typing import Dict
 
 
 class Core(ABC):
@@ -73,3 +74,30 @@ class Core(ABC):
 
     image_headers = headers.copy()
     image_headers["accept"] = "image/gif, image/jpg, image/jpeg, image/png"
+
+    @classmethod
+    def set_base_urls(cls, **base_urls: str) -> None:
+        """
+        Replace base URLs and every URL derived from them, e.g. to use a local mock server.
+
+        Example: Core.set_base_urls(data_live_base_url="http://127.0.0.1:8024")
+
+        :param base_urls: New values of the attributes ending with "_base_url"
+        """
+        for name, base_url in base_urls.items():
+            if not name.endswith("_base_url") or not hasattr(cls, name):
+                raise KeyError(f"Unknown base URL: '{name}'")
+
+            old_base_url = getattr(cls, name)
+            base_url = base_url.rstrip("/")
+
+            for attribute, value in list(vars(cls).items()):
+                if attribute.endswith("_url") and isinstance(value, str) and value.startswith(old_base_url):
+                    setattr(cls, attribute, base_url + value[len(old_base_url):])
+
+    @classmethod
+    def get_base_urls(cls) -> Dict[str, str]:
+        """
+        Return the current base URLs.
+        """
+        return {name: value for name, value in vars(cls).items() if name.endswith("_base_url")}
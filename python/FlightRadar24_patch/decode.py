@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+
+from typing import Any, Callable, Dict, Union
+
+import gzip
+import json
+
+import brotli
+
+# Optional faster JSON backend.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Decompressors by Content-Encoding header.
+CONTENT_ENCODINGS: Dict[str, Callable[[bytes], bytes]] = {
+    "": lambda x: x,
+    "br": brotli.decompress,
+    "gzip": gzip.decompress
+}
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+
+def loads(content: Union[bytes, str]) -> Any:
+    """
+    Parse a JSON document with the fastest available backend.
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+
+    return json.loads(content)
+
+
+def decompress(content: bytes, content_encoding: str = "") -> bytes:
+    """
+    Decompress a response body according to its Content-Encoding header.
+
+    Bodies read through requests are usually decompressed already, although the header remains.
+    The content is returned unchanged if decompression fails, which brotli detects within the first
+    bytes. A gzip body without its magic number is returned without an attempt.
+    """
+    if not content_encoding or not content:
+        return content
+
+    if content_encoding == "gzip" and content[:2] != b"\x1f\x8b":
+        return content
+
+    try: return CONTENT_ENCODINGS[content_encoding](content)
+    except Exception: return content
+
+
+if __name__ == "__main__":
+    # Microbenchmark of the decode path on recorded feed payloads (or a synthetic one).
+    # Usage (from the python directory): python -m FlightRadar24_patch.decode [feed.json | feed.rec ...]
+    import random
+    import sys
+    import time
+
+    from .replay import read_records
+
+    payloads = list()
+
+    for path in sys.argv[1:]:
+        if path.endswith(".rec"):
+            payloads.extend(record.content for record in read_records(path) if "feed.js" in record.url)
+        else:
+            with open(path, "rb") as file:
+                payloads.append(file.read())
+
+    if not payloads:
+        random.seed(0)
+        feed: Dict[str, Any] = {"full_count": 20000, "version": 4}
+
+        for index in range(5000):
+            feed["{:08x}".format(0x30000000 + index)] = [
+                "{:06X}".format(index), random.uniform(-60, 70), random.uniform(-180, 180), 90, 35000, 450,
+                "1000", "", "A320", "", 1700000000, "TXL", "MUC", "LH1", 0, 0, "DLH1", 0, "DLH"
+            ]
+
+        feed["stats"] = {"total": {"ads-b": 4000, "mlat": 1000}}
+        payloads.append(json.dumps(feed).encode("utf-8"))
+
+    compressed = [brotli.compress(payload) for payload in payloads]
+
+    def measure(name: str, function: Callable[[bytes], Any], inputs) -> None:
+        repeat = max(1, 200 // len(inputs))
+        start = time.perf_counter()
+
+        for _ in range(repeat):
+            for payload in inputs: function(payload)
+
+        elapsed = (time.perf_counter() - start) / (repeat * len(inputs))
+        size = sum(len(payload) for payload in inputs) / len(inputs)
+        print("{:<38} {:>8.2f} ms/payload ({:>7.1f} MB/s)".format(name, elapsed * 1000, size / elapsed / 1e6))
+
+    print("{} payload(s), {:.0f} kB on average, JSON backend: {}".format(
+        len(payloads), sum(len(payload) for payload in payloads) / len(payloads) / 1000, JSON_BACKEND
+    ))
+
+    measure("json.loads", json.loads, payloads)
+    measure("loads", loads, payloads)
+    measure("brotli + json.loads", lambda payload: json.loads(brotli.decompress(payload)), compressed)
+    measure("decompress + loads", lambda payload: loads(decompress(payload, "br")), compressed)
+    measure("decompress (already decoded) + loads", lambda payload: loads(decompress(payload, "br")), payloads)
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+from typing import Any, Dict, Iterable, List, Union
+
+import dataclasses
+
+import numpy as np
+
+from .batch import FlightBatch
+from .entities.flight import Flight
+
+
+@dataclasses.dataclass
+class SnapshotDelta(object):
+    """
+    Data class with the changes between two feed snapshots.
+
+    added and updated hold the flights (a list of Flight instances, or a FlightBatch for batches),
+    removed and unchanged hold flight IDs.
+    """
+    added: Union[List[Flight], FlightBatch] = dataclasses.field(default_factory=list)
+    updated: Union[List[Flight], FlightBatch] = dataclasses.field(default_factory=list)
+    removed: List[str] = dataclasses.field(default_factory=list)
+    unchanged: List[str] = dataclasses.field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.added) + len(self.updated) + len(self.removed)
+
+
+class SnapshotDiffer(object):
+    """
+    Keep the state of the previous feed snapshot and emit only what changed.
+
+    A flight is updated when its time field differs from the previous snapshot.
+    """
+    def __init__(self):
+        self.__state: Dict[str, Any] = dict()
+
+    def __len__(self) -> int:
+        return len(self.__state)
+
+    def diff(self, flights: Iterable[Flight]) -> SnapshotDelta:
+        """
+        Compare a list of flights with the previous snapshot and store it as the new one.
+
+        :param flights: Flight instances (or any objects with id and time attributes)
+        """
+        delta = SnapshotDelta()
+        state: Dict[str, Any] = dict()
+
+        for flight in flights:
+            previous = self.__state.get(flight.id)
+            state[flight.id] = flight.time
+
+            if previous is None: delta.added.append(flight)
+            elif previous != flight.time: delta.updated.append(flight)
+            else: delta.unchanged.append(flight.id)
+
+        delta.removed = [flight_id for flight_id in self.__state if flight_id not in state]
+        self.__state = state
+
+        return delta
+
+    def diff_batch(self, batch: FlightBatch) -> SnapshotDelta:
+        """
+        Compare a FlightBatch with the previous snapshot and store it as the new one.
+
+        :param batch: The FlightBatch of the current snapshot
+        """
+        times = batch["time"]
+        previous = np.array([self.__state.get(flight_id, -1) for flight_id in batch.ids], dtype=times.dtype)
+
+        added = previous < 0
+        updated = ~added & (previous != times)
+
+        state = dict(zip(batch.ids, times.tolist()))
+
+        delta = SnapshotDelta(
+            added=batch[added],
+            updated=batch[updated],
+            removed=[flight_id for flight_id in self.__state if flight_id not in state],
+            unchanged=[batch.ids[index] for index in np.flatnonzero(~added & ~updated)]
+        )
+        self.__state = state
+
+        return delta
+
+    def forget(self, flight_ids: Iterable[str]) -> None:
+        """
+        Drop flights from the stored snapshot, so they are reported as added by the next diff.
+        Use it for changes that were received but could not be processed.
+        """
+        for flight_id in flight_ids:
+            self.__state.pop(flight_id, None)
+
+    def reset(self) -> None:
+        """
+        Forget the stored snapshot.
+        """
+        self.__state.clear()
@@ -1,13 +1,81 @@
 # -*- coding: utf-8 -*-
 
 from typing import Any, Dict, Optional
-from .entity import Entity
+from .entity import DetailField, Entity
+
+
+def _get_timezone_offset_hours(offset: Any) -> str:
+    if isinstance(offset, int):
+        return f"{int(offset / 60 / 60)}:00"
+
+    return Entity._default_text
+
+
+def _get_reviews_url(reviews_url: Any) -> Any:
+    if reviews_url and isinstance(reviews_url, str):
+        return "https://www.flightradar24.com" + reviews_url
+
+    return reviews_url if reviews_url is not None and reviews_url != Entity._default_text else Entity._default_text
 
 
 class Airport(Entity):
     """
     Airport representation.
+
+    The attributes given to the constructor are set at once. The attributes of set_airport_details()
+    are decoded from the details on first access.
     """
+    __slots__ = ("_details", "_detail_values")
+
+    # Basic airport information.
+    name = DetailField("details", "name")
+    iata = DetailField("details", "code", "iata")
+    icao = DetailField("details", "code", "icao")
+    altitude = DetailField("details", "position", "elevation")
+
+    # Airport location.
+    country = DetailField("details", "position", "country", "name")
+    country_code = DetailField("details", "position", "country", "code")
+    country_id = DetailField("details", "position", "country", "id")
+    city = DetailField("details", "position", "region", "city")
+
+    # Airport timezone.
+    timezone_abbr = DetailField("details", "timezone", "abbr")
+    timezone_abbr_name = DetailField("details", "timezone", "abbrName")
+    timezone_name = DetailField("details", "timezone", "name")
+    timezone_offset = DetailField("details", "timezone", "offset")
+    timezone_offset_hours = DetailField("details", "timezone", "offset", decode=_get_timezone_offset_hours)
+
+    # Airport reviews.
+    reviews_url = DetailField("flightdiary", "url", decode=_get_reviews_url)
+    reviews = DetailField("flightdiary", "reviews")
+    evaluation = DetailField("flightdiary", "evaluation")
+
+    average_rating = DetailField("flightdiary", "ratings", "avg")
+    total_rating = DetailField("flightdiary", "ratings", "total")
+
+    # Weather information.
+    weather = DetailField("weather", default_factory=dict)
+
+    # Runway information.
+    runways = DetailField("runways", raw=True)
+
+    # Aircraft count information.
+    aircraft_on_ground = DetailField("aircraftCount", "onGround", "total")
+    aircraft_visible_on_ground = DetailField("aircraftCount", "onGround", "visible")
+
+    # Schedule information.
+    arrivals = DetailField("schedule", "arrivals", default_factory=dict)
+    departures = DetailField("schedule", "departures", default_factory=dict)
+
+    # Link for the homepage and more information
+    website = DetailField("details", "url", "homepage")
+    wikipedia = DetailField("details", "url", "wikipedia")
+
+    # Other information.
+    visible = DetailField("details", "visible")
+    images = DetailField("details", "airportImages", default_factory=dict)
+
     def __init__(self, basic_info: Dict = dict(), info: Dict = dict()):
         """
         Constructor of the Airport class.
@@ -18,6 +86,9 @@ class Airport(Entity):
         :param basic_info: Basic information about the airport received from FlightRadar24
         :param info: Dictionary with more information about the airport received from FlightRadar24
         """
+        self._details: Optional[Dict] = None
+        self._detail_values: Optional[Dict] = None
+
         if basic_info: self.__initialize_with_basic_info(basic_info)
         if info: self.__initialize_with_info(info)
 
@@ -85,94 +156,19 @@ class Airport(Entity):
     def set_airport_details(self, airport_details: Dict) -> None:
         """
         Set airport details to the instance. Use FlightRadar24API.get_airport_details(...) method to get it.
+
+        The position is set at once, the other attributes are decoded on first access.
         """
         # Get airport data.
         airport = self.__get_info(airport_details.get("airport"), dict())
         airport = self.__get_info(airport.get("pluginData"), dict())
 
-        # Get information about the airport.
-        details = self.__get_info(airport.get("details"), dict())
+        self._details = airport
+        self._detail_values = None
 
         # Get location information.
+        details = self.__get_info(airport.get("details"), dict())
         position = self.__get_info(details.get("position"), dict())
-        code = self.__get_info(details.get("code"), dict())
-        country = self.__get_info(position.get("country"), dict())
-        region = self.__get_info(position.get("region"), dict())
 
-        # Get reviews of the airport.
-        flight_diary = self.__get_info(airport.get("flightdiary"), dict())
-        ratings = self.__get_info(flight_diary.get("ratings"), dict())
-
-        # Get schedule information.
-        schedule = self.__get_info(airport.get("schedule"), dict())
-
-        # Get timezone information.
-        timezone = self.__get_info(details.get("timezone"), dict())
-
-        # Get aircraft count.
-        aircraft_count = self.__get_info(airport.get("aircraftCount"), dict())
-        aircraft_on_ground = self.__get_info(aircraft_count.get("onGround"), dict())
-
-        # Get URLs for more information about the airport.
-        urls = self.__get_info(details.get("url"), dict())
-
-        # Basic airport information.
-        self.name = self.__get_info(details.get("name"))
-        self.iata = self.__get_info(code.get("iata"))
-        self.icao = self.__get_info(code.get("icao"))
-        self.altitude = self.__get_info(position.get("elevation"))
         self.latitude = self.__get_info(position.get("latitude"))
         self.longitude = self.__get_info(position.get("longitude"))
-
-        # Airport location.
-        self.country = self.__get_info(country.get("name"))
-        self.country_code = self.__get_info(country.get("code"))
-        self.country_id = self.__get_info(country.get("id"))
-        self.city = self.__get_info(region.get("city"))
-
-        # Airport timezone.
-        self.timezone_abbr = self.__get_info(timezone.get("abbr"))
-        self.timezone_abbr_name = self.__get_info(timezone.get("abbrName"))
-        self.timezone_name = self.__get_info(timezone.get("name"))
-        self.timezone_offset = self.__get_info(timezone.get("offset"))
-
-        if isinstance(self.timezone_offset, int):
-            self.timezone_offset_hours = int(self.timezone_offset / 60 / 60)
-            self.timezone_offset_hours = f"{self.timezone_offset_hours}:00"
-        else: self.timezone_offset_hours = self.__get_info(None)
-
-        # Airport reviews.
-        self.reviews_url = flight_diary.get("url")
-
-        if self.reviews_url and isinstance(self.reviews_url, str):
-            self.reviews_url = "https://www.flightradar24.com" + self.reviews_url
-        else:
-            self.reviews_url = self.__get_info(self.reviews_url)
-
-        self.reviews = self.__get_info(flight_diary.get("reviews"))
-        self.evaluation = self.__get_info(flight_diary.get("evaluation"))
-
-        self.average_rating = self.__get_info(ratings.get("avg"))
-        self.total_rating = self.__get_info(ratings.get("total"))
-
-        # Weather information.
-        self.weather = self.__get_info(airport.get("weather"), dict())
-
-        # Runway information.
-        self.runways = airport.get("runways", list())
-
-        # Aircraft count information.
-        self.aircraft_on_ground = self.__get_info(aircraft_on_ground.get("total"))
-        self.aircraft_visible_on_ground = self.__get_info(aircraft_on_ground.get("visible"))
-
-        # Schedule information.
-        self.arrivals = self.__get_info(schedule.get("arrivals"), dict())
-        self.departures = self.__get_info(schedule.get("departures"), dict())
-
-        # Link for the homepage and more information
-        self.website = self.__get_info(urls.get("homepage"))
-        self.wikipedia = self.__get_info(urls.get("wikipedia"))
-
-        # Other information.
-        self.visible = self.__get_info(details.get("visible"))
-        self.images = self.__get_info(details.get("airportImages"), dict())
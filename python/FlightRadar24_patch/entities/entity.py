@@ -1,13 +1,15 @@
 # -*- coding: utf-8 -*-
 
 from abc import ABC
-from math import acos, cos, radians, sin
+from math import asin, cos, radians, sin, sqrt
+from typing import Any, Callable, Dict, Optional
 
 
 class Entity(ABC):
     """
     Representation of a real entity, at some location.
     """
+    __slots__ = ("latitude", "longitude")
 
     _default_text = "N/A"
 
@@ -28,4 +30,85 @@ class Entity(ABC):
         lat1, lon1 = radians(lat1), radians(lon1)
         lat2, lon2 = radians(lat2), radians(lon2)
 
-        return acos(sin(lat1) * sin(lat2) + cos(lat1) * cos(lat2) * cos(lon2 - lon1)) * 6371
+        # Haversine formula, unlike the spherical law of cosines it stays accurate for close entities.
+        a = sin((lat2 - lat1) / 2) ** 2 + cos(lat1) * cos(lat2) * sin((lon2 - lon1) / 2) ** 2
+        return 2 * asin(sqrt(min(a, 1.0))) * 6371
+
+
+class DetailField(object):
+    """
+    Attribute of an entity decoded from its raw details dictionary on first access.
+
+    The owner class has the slots "_details", with the raw details dictionary (None until they are set),
+    and "_detail_values", with the decoded and assigned values (None until the first one).
+    Reading the attribute of an entity without details or assigned value raises AttributeError.
+    """
+    def __init__(
+        self,
+        *path: str,
+        default_factory: Optional[Callable[[], Any]] = None,
+        raw: bool = False,
+        decode: Optional[Callable[[Any], Any]] = None
+    ):
+        """
+        Constructor of the DetailField class.
+
+        :param path: Keys leading to the value in the details. Missing and "N/A" values on the path are replaced by dict().
+        :param default_factory: Function creating the value for a missing or "N/A" value. If None, "N/A" is used.
+        :param raw: If True, the value is taken as it is, with an empty list if it is missing.
+        :param decode: Function converting the value at the path (None if it is missing), used instead of the default handling
+        """
+        self.path = path
+        self.default_factory = default_factory
+        self.raw = raw
+        self.decode = decode
+        self.name = None
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance: Optional[Any], owner: type) -> Any:
+        if instance is None:
+            return self
+
+        values = instance._detail_values
+
+        if values is not None and self.name in values:
+            return values[self.name]
+
+        details = instance._details
+
+        if details is None:
+            raise AttributeError(f"'{owner.__name__}' object has no attribute '{self.name}'")
+
+        value = self.__decode_path(details)
+        self.__set__(instance, value)
+
+        return value
+
+    def __set__(self, instance: Any, value: Any) -> None:
+        if instance._detail_values is None:
+            instance._detail_values = dict()
+
+        instance._detail_values[self.name] = value
+
+    def __decode_path(self, details: Dict) -> Any:
+        default_text = Entity._default_text
+        node = details
+
+        for key in self.path[:-1]:
+            node = node.get(key)
+            node = node if node is not None and node != default_text else dict()
+
+        if self.raw:
+            return node.get(self.path[-1], list())
+
+        value = node.get(self.path[-1])
+
+        if self.decode is not None:
+            return self.decode(value)
+
+        if value is not None and value != default_text:
+            return value
+
+        return self.default_factory() if self.default_factory is not None else default_text
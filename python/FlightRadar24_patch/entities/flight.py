@@ -1,13 +1,92 @@
 # -*- coding: utf-8 -*-
 
 from typing import Any, Dict, List, Optional
-from .entity import Entity
+from types import MemberDescriptorType
+from .entity import DetailField, Entity
 
 
 class Flight(Entity):
     """
     Flight representation.
+
+    The information of the feed are set on construction. The detail attributes are decoded from
+    the details given to set_flight_details() on first access.
     """
+    __slots__ = (
+        "id", "icao_24bit", "heading", "altitude", "ground_speed", "squawk", "aircraft_code", "registration",
+        "time", "origin_airport_iata", "destination_airport_iata", "number", "airline_iata", "on_ground",
+        "vertical_speed", "callsign", "airline_icao", "_details", "_detail_values"
+    )
+
+    __missing = object()
+
+    # Aircraft information.
+    aircraft_age = DetailField("aircraft", "age")
+    aircraft_country_id = DetailField("aircraft", "countryId")
+    aircraft_history = DetailField("flightHistory", "aircraft", raw=True)
+    aircraft_images = DetailField("aircraft", "images", raw=True)
+    aircraft_model = DetailField("aircraft", "model", "text")
+
+    # Airline information.
+    airline_name = DetailField("airline", "name")
+    airline_short_name = DetailField("airline", "short")
+
+    # Destination airport position.
+    destination_airport_altitude = DetailField("airport", "destination", "position", "altitude")
+    destination_airport_country_code = DetailField("airport", "destination", "position", "country", "code")
+    destination_airport_country_name = DetailField("airport", "destination", "position", "country", "name")
+    destination_airport_latitude = DetailField("airport", "destination", "position", "latitude")
+    destination_airport_longitude = DetailField("airport", "destination", "position", "longitude")
+
+    # Destination airport information.
+    destination_airport_icao = DetailField("airport", "destination", "code", "icao")
+    destination_airport_baggage = DetailField("airport", "destination", "info", "baggage")
+    destination_airport_gate = DetailField("airport", "destination", "info", "gate")
+    destination_airport_name = DetailField("airport", "destination", "name")
+    destination_airport_terminal = DetailField("airport", "destination", "info", "terminal")
+    destination_airport_visible = DetailField("airport", "destination", "visible")
+    destination_airport_website = DetailField("airport", "destination", "website")
+
+    # Destination airport timezone.
+    destination_airport_timezone_abbr = DetailField("airport", "destination", "timezone", "abbr")
+    destination_airport_timezone_abbr_name = DetailField("airport", "destination", "timezone", "abbrName")
+    destination_airport_timezone_name = DetailField("airport", "destination", "timezone", "name")
+    destination_airport_timezone_offset = DetailField("airport", "destination", "timezone", "offset")
+    destination_airport_timezone_offset_hours = DetailField("airport", "destination", "timezone", "offsetHours")
+
+    # Origin airport position.
+    origin_airport_altitude = DetailField("airport", "origin", "position", "altitude")
+    origin_airport_country_code = DetailField("airport", "origin", "position", "country", "code")
+    origin_airport_country_name = DetailField("airport", "origin", "position", "country", "name")
+    origin_airport_latitude = DetailField("airport", "origin", "position", "latitude")
+    origin_airport_longitude = DetailField("airport", "origin", "position", "longitude")
+
+    # Origin airport information.
+    origin_airport_icao = DetailField("airport", "origin", "code", "icao")
+    origin_airport_baggage = DetailField("airport", "origin", "info", "baggage")
+    origin_airport_gate = DetailField("airport", "origin", "info", "gate")
+    origin_airport_name = DetailField("airport", "origin", "name")
+    origin_airport_terminal = DetailField("airport", "origin", "info", "terminal")
+    origin_airport_visible = DetailField("airport", "origin", "visible")
+    origin_airport_website = DetailField("airport", "origin", "website")
+
+    # Origin airport timezone.
+    origin_airport_timezone_abbr = DetailField("airport", "origin", "timezone", "abbr")
+    origin_airport_timezone_abbr_name = DetailField("airport", "origin", "timezone", "abbrName")
+    origin_airport_timezone_name = DetailField("airport", "origin", "timezone", "name")
+    origin_airport_timezone_offset = DetailField("airport", "origin", "timezone", "offset")
+    origin_airport_timezone_offset_hours = DetailField("airport", "origin", "timezone", "offsetHours")
+
+    # Flight status.
+    status_icon = DetailField("status", "icon")
+    status_text = DetailField("status", "text")
+
+    # Time details.
+    time_details = DetailField("time", default_factory=dict)
+
+    # Flight trail.
+    trail = DetailField("trail", raw=True)
+
     def __init__(self, flight_id: str, info: List[Any]):
         """
         Constructor of the Flight class.
@@ -38,6 +117,9 @@ class Flight(Entity):
         self.callsign = self.__get_info(info[16])
         self.airline_icao = self.__get_info(info[18])
 
+        self._details: Optional[Dict] = None
+        self._detail_values: Optional[Dict] = None
+
     def __repr__(self) -> str:
         return self.__str__()
 
@@ -57,6 +139,8 @@ class Flight(Entity):
         to compare numeric data with ">" or "<".
 
         Example: check_info(min_altitude = 6700, max_altitude = 13000, airline_icao = "THY")
+
+        To filter a whole snapshot, use a FlightQuery on a FlightBatch.
         """
 
         comparison_functions = {"max": max, "min": min}
@@ -66,15 +150,28 @@ class Flight(Entity):
             # Separate the comparison prefix if it exists.
             prefix, key = key.split("_", maxsplit=1) if key[:4] == "max_" or key[:4] == "min_" else (None, key)
 
+            # Skip unknown information, and detail information before the details are set.
+            if not self.__is_info(key): continue
+
+            current = getattr(self, key, self.__missing)
+            if current is self.__missing: continue
+
             # Check if the value is greater than or less than the attribute value.
-            if prefix and key in self.__dict__:
-                if comparison_functions[prefix](value, self.__dict__[key]) != value: return False
+            if prefix:
+                if comparison_functions[prefix](value, current) != value: return False
 
             # Check if the value is equal.
-            elif key in self.__dict__ and value != self.__dict__[key]: return False
+            elif value != current: return False
 
         return True
 
+    @classmethod
+    def __is_info(cls, key: str) -> bool:
+        """
+        Return whether the key names an information of the flight: a slot or a detail attribute, not a method.
+        """
+        return not key.startswith("_") and isinstance(getattr(cls, key, None), (MemberDescriptorType, DetailField))
+
     def get_altitude(self) -> str:
         """
         Return the formatted altitude, with the unit of measure.
@@ -108,101 +205,8 @@ class Flight(Entity):
     def set_flight_details(self, flight_details: Dict) -> None:
         """
         Set flight details to the instance. Use FlightRadar24API.get_flight_details(...) method to get it.
+
+        The detail attributes, e.g. airline_name or origin_airport_name, are decoded on first access.
         """
-        # Get aircraft data.
-        aircraft = self.__get_info(flight_details.get("aircraft"), dict())
-
-        # Get airline data.
-        airline = self.__get_info(flight_details.get("airline"), dict())
-
-        # Get airport data.
-        airport = self.__get_info(flight_details.get("airport"), dict())
-
-        # Get destination data.
-        dest_airport = self.__get_info(airport.get("destination"), dict())
-        dest_airport_code = self.__get_info(dest_airport.get("code"), dict())
-        dest_airport_info = self.__get_info(dest_airport.get("info"), dict())
-        dest_airport_position = self.__get_info(dest_airport.get("position"), dict())
-        dest_airport_country = self.__get_info(dest_airport_position.get("country"), dict())
-        dest_airport_timezone = self.__get_info(dest_airport.get("timezone"), dict())
-
-        # Get origin data.
-        orig_airport = self.__get_info(airport.get("origin"), dict())
-        orig_airport_code = self.__get_info(orig_airport.get("code"), dict())
-        orig_airport_info = self.__get_info(orig_airport.get("info"), dict())
-        orig_airport_position = self.__get_info(orig_airport.get("position"), dict())
-        orig_airport_country = self.__get_info(orig_airport_position.get("country"), dict())
-        orig_airport_timezone = self.__get_info(orig_airport.get("timezone"), dict())
-
-        # Get flight history.
-        history = self.__get_info(flight_details.get("flightHistory"), dict())
-
-        # Get flight status.
-        status = self.__get_info(flight_details.get("status"), dict())
-
-        # Aircraft information.
-        self.aircraft_age = self.__get_info(aircraft.get("age"))
-        self.aircraft_country_id = self.__get_info(aircraft.get("countryId"))
-        self.aircraft_history = history.get("aircraft", list())
-        self.aircraft_images = aircraft.get("images", list())
-        self.aircraft_model = self.__get_info(self.__get_info(aircraft.get("model"), dict()).get("text"))
-
-        # Airline information.
-        self.airline_name = self.__get_info(airline.get("name"))
-        self.airline_short_name = self.__get_info(airline.get("short"))
-
-        # Destination airport position.
-        self.destination_airport_altitude = self.__get_info(dest_airport_position.get("altitude"))
-        self.destination_airport_country_code = self.__get_info(dest_airport_country.get("code"))
-        self.destination_airport_country_name = self.__get_info(dest_airport_country.get("name"))
-        self.destination_airport_latitude = self.__get_info(dest_airport_position.get("latitude"))
-        self.destination_airport_longitude = self.__get_info(dest_airport_position.get("longitude"))
-
-        # Destination airport information.
-        self.destination_airport_icao = self.__get_info(dest_airport_code.get("icao"))
-        self.destination_airport_baggage = self.__get_info(dest_airport_info.get("baggage"))
-        self.destination_airport_gate = self.__get_info(dest_airport_info.get("gate"))
-        self.destination_airport_name = self.__get_info(dest_airport.get("name"))
-        self.destination_airport_terminal = self.__get_info(dest_airport_info.get("terminal"))
-        self.destination_airport_visible = self.__get_info(dest_airport.get("visible"))
-        self.destination_airport_website = self.__get_info(dest_airport.get("website"))
-
-        # Destination airport timezone.
-        self.destination_airport_timezone_abbr = self.__get_info(dest_airport_timezone.get("abbr"))
-        self.destination_airport_timezone_abbr_name = self.__get_info(dest_airport_timezone.get("abbrName"))
-        self.destination_airport_timezone_name = self.__get_info(dest_airport_timezone.get("name"))
-        self.destination_airport_timezone_offset = self.__get_info(dest_airport_timezone.get("offset"))
-        self.destination_airport_timezone_offset_hours = self.__get_info(dest_airport_timezone.get("offsetHours"))
-
-        # Origin airport position.
-        self.origin_airport_altitude = self.__get_info(orig_airport_position.get("altitude"))
-        self.origin_airport_country_code = self.__get_info(orig_airport_country.get("code"))
-        self.origin_airport_country_name = self.__get_info(orig_airport_country.get("name"))
-        self.origin_airport_latitude = self.__get_info(orig_airport_position.get("latitude"))
-        self.origin_airport_longitude = self.__get_info(orig_airport_position.get("longitude"))
-
-        # Origin airport information.
-        self.origin_airport_icao = self.__get_info(orig_airport_code.get("icao"))
-        self.origin_airport_baggage = self.__get_info(orig_airport_info.get("baggage"))
-        self.origin_airport_gate = self.__get_info(orig_airport_info.get("gate"))
-        self.origin_airport_name = self.__get_info(orig_airport.get("name"))
-        self.origin_airport_terminal = self.__get_info(orig_airport_info.get("terminal"))
-        self.origin_airport_visible = self.__get_info(orig_airport.get("visible"))
-        self.origin_airport_website = self.__get_info(orig_airport.get("website"))
-
-        # Origin airport timezone.
-        self.origin_airport_timezone_abbr = self.__get_info(orig_airport_timezone.get("abbr"))
-        self.origin_airport_timezone_abbr_name = self.__get_info(orig_airport_timezone.get("abbrName"))
-        self.origin_airport_timezone_name = self.__get_info(orig_airport_timezone.get("name"))
-        self.origin_airport_timezone_offset = self.__get_info(orig_airport_timezone.get("offset"))
-        self.origin_airport_timezone_offset_hours = self.__get_info(orig_airport_timezone.get("offsetHours"))
-
-        # Flight status.
-        self.status_icon = self.__get_info(status.get("icon"))
-        self.status_text = self.__get_info(status.get("text"))
-
-        # Time details.
-        self.time_details = self.__get_info(flight_details.get("time"), dict())
-
-        # Flight trail.
-        self.trail = flight_details.get("trail", list())
+        self._details = flight_details
+        self._detail_values = None
@@ -4,6 +4,15 @@ class AirportNotFoundError(Exception):
     pass
 
 
+class CircuitOpenError(Exception):
+    def __init__(self, message, url):
+        self.message = message
+        self.url = url
+
+    def __str__(self):
+        return self.message
+
+
 class CloudflareError(Exception):
     def __init__(self, message, response):
         self.message = message
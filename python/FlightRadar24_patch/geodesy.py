@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+
+from typing import Dict, List, Optional, Tuple, Union
+
+import itertools
+import math
+
+import numpy as np
+
+from .batch import FlightBatch
+from .entities.flight import Flight
+
+
+EARTH_RADIUS = 6371.0
+
+# Ground speed in knots to kilometers per second.
+KNOTS_TO_KMS = 1.852 / 3600
+
+# Columns of the positions of flights relative to a home location:
+# index of the flight, distance (km) and bearing (degrees) from home,
+# distance (km) and time (s) of the closest point of approach on the current heading and speed.
+APPROACH_DTYPE = np.dtype([
+    ("index", "i8"), ("distance", "f8"), ("bearing", "f8"), ("cpa_distance", "f8"), ("cpa_time", "f8")
+])
+
+
+def get_distances(latitude: float, longitude: float, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """
+    Return the great-circle distances in kilometers from a position to arrays of positions (haversine formula).
+    """
+    lat1, lon1 = math.radians(latitude), math.radians(longitude)
+    lat2, lon2 = np.radians(latitudes), np.radians(longitudes)
+
+    a = np.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def get_bearings(latitude: float, longitude: float, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """
+    Return the initial bearings in degrees [0, 360) from a position to arrays of positions.
+    """
+    lat1, lon1 = math.radians(latitude), math.radians(longitude)
+    lat2, lon2 = np.radians(latitudes), np.radians(longitudes)
+
+    y = np.sin(lon2 - lon1) * np.cos(lat2)
+    x = math.cos(lat1) * np.sin(lat2) - math.sin(lat1) * np.cos(lat2) * np.cos(lon2 - lon1)
+    return np.degrees(np.arctan2(y, x)) % 360
+
+
+def get_closest_approach(
+    distances: np.ndarray,
+    bearings: np.ndarray,
+    headings: np.ndarray,
+    speeds: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return the distances (km) and times (s) of the closest points of approach to a home location,
+    for flights keeping their heading and ground speed.
+
+    The flights are placed in a plane around home by their distance and bearing. A flight moving away
+    has its closest point of approach now (time 0).
+
+    :param distances: Distances from home in kilometers
+    :param bearings: Bearings from home in degrees
+    :param headings: Headings of the flights in degrees
+    :param speeds: Ground speeds of the flights in knots
+    """
+    bearings, headings = np.radians(bearings), np.radians(headings)
+    speeds = np.asarray(speeds, dtype=np.float64) * KNOTS_TO_KMS
+
+    x, y = distances * np.sin(bearings), distances * np.cos(bearings)
+    vx, vy = speeds * np.sin(headings), speeds * np.cos(headings)
+
+    squared_speeds = vx * vx + vy * vy
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        times = np.where(squared_speeds > 0, -(x * vx + y * vy) / squared_speeds, 0.0)
+
+    times = np.maximum(times, 0.0)
+    return np.hypot(x + vx * times, y + vy * times), times
+
+
+def get_proximate_pairs(
+    latitudes: np.ndarray,
+    longitudes: np.ndarray,
+    distance: float,
+    altitudes: Optional[np.ndarray] = None,
+    max_altitude_difference: Optional[float] = None
+) -> np.ndarray:
+    """
+    Return the pairs of positions closer than a distance, as an array of index pairs (i, j) with i < j.
+
+    The positions are hashed into a grid of cubes on the unit sphere with the chord of the distance
+    as side, so only positions in neighbouring cubes are compared.
+
+    :param latitudes: Latitudes of the positions
+    :param longitudes: Longitudes of the positions
+    :param distance: Maximum great-circle distance in kilometers
+    :param altitudes: Altitudes of the positions, e.g. in feet
+    :param max_altitude_difference: Maximum difference of the altitudes of a pair, in the unit of the altitudes
+    """
+    size = len(latitudes)
+
+    if size < 2 or distance <= 0:
+        return np.empty((0, 2), dtype=np.int64)
+
+    lat, lon = np.radians(latitudes), np.radians(longitudes)
+    points = np.column_stack((np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)))
+
+    # Chord on the unit sphere, at least one meter so the cell keys fit in 64 bits.
+    chord = 2 * math.sin(min(max(distance, 0.001) / (2 * EARTH_RADIUS), math.pi / 2))
+
+    cells = np.floor(points / chord).astype(np.int64)
+    base = int(math.ceil(1 / chord)) + 2
+    width = 2 * base + 1
+
+    def get_keys(cells: np.ndarray) -> np.ndarray:
+        cells = cells + base
+        return (cells[:, 0] * width + cells[:, 1]) * width + cells[:, 2]
+
+    keys = get_keys(cells)
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+
+    pairs: List[np.ndarray] = list()
+    indices = np.arange(size)
+
+    for offset in itertools.product((-1, 0, 1), repeat=3):
+        neighbours = get_keys(cells + np.array(offset, dtype=np.int64))
+        starts = np.searchsorted(sorted_keys, neighbours, side="left")
+        counts = np.searchsorted(sorted_keys, neighbours, side="right") - starts
+
+        total = int(counts.sum())
+        if total == 0: continue
+
+        # Every position i against every position j of the neighbouring cube.
+        first = np.repeat(indices, counts)
+        positions = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts) + np.repeat(starts, counts)
+        second = order[positions]
+
+        # Each pair is found once, from the position with the lower index.
+        keep = first < second
+        first, second = first[keep], second[keep]
+
+        keep = np.sum((points[first] - points[second]) ** 2, axis=1) <= chord * chord
+
+        if altitudes is not None and max_altitude_difference is not None:
+            keep &= np.abs(np.asarray(altitudes)[first] - np.asarray(altitudes)[second]) <= max_altitude_difference
+
+        pairs.append(np.column_stack((first[keep], second[keep])))
+
+    return np.concatenate(pairs) if pairs else np.empty((0, 2), dtype=np.int64)
+
+
+def _to_float(value) -> float:
+    return float(value) if isinstance(value, (int, float)) else np.nan
+
+
+def get_flight_columns(flights: Union[FlightBatch, List[Flight]]) -> Dict[str, np.ndarray]:
+    """
+    Return the latitude, longitude, heading, ground speed and altitude of flights as arrays.
+    """
+    names = ("latitude", "longitude", "heading", "ground_speed", "altitude")
+
+    if isinstance(flights, FlightBatch):
+        return {name: flights[name].astype(np.float64) for name in names}
+
+    # Flight instances keep missing feed values as text ("N/A"), they are converted to NaN.
+    return {
+        name: np.fromiter(
+            (_to_float(getattr(flight, name)) for flight in flights), dtype=np.float64, count=len(flights)
+        )
+        for name in names
+    }
+
+
+class HomeGeodesy(object):
+    """
+    Positions of flights relative to a home location: distance, bearing and closest point of approach.
+
+    All flights of a snapshot are computed at once, e.g. to list the flights approaching overhead.
+    """
+    def __init__(self, latitude: float, longitude: float):
+        """
+        Constructor of the HomeGeodesy class.
+
+        :param latitude: Latitude of home
+        :param longitude: Longitude of home
+        """
+        self.latitude = latitude
+        self.longitude = longitude
+
+    def get_relative(self, flights: Union[FlightBatch, List[Flight]]) -> np.ndarray:
+        """
+        Return the positions of the flights relative to home, as an array of APPROACH_DTYPE in the order of the flights.
+
+        :param flights: A FlightBatch or a list of Flight instances
+        """
+        return self.__get_relative(get_flight_columns(flights))
+
+    def __get_relative(self, columns: Dict[str, np.ndarray]) -> np.ndarray:
+        relative = np.empty(len(columns["latitude"]), dtype=APPROACH_DTYPE)
+
+        relative["index"] = np.arange(len(relative))
+        relative["distance"] = get_distances(self.latitude, self.longitude, columns["latitude"], columns["longitude"])
+        relative["bearing"] = get_bearings(self.latitude, self.longitude, columns["latitude"], columns["longitude"])
+        relative["cpa_distance"], relative["cpa_time"] = get_closest_approach(
+            relative["distance"], relative["bearing"], columns["heading"], columns["ground_speed"]
+        )
+
+        return relative
+
+    def get_approaching(
+        self,
+        flights: Union[FlightBatch, List[Flight]],
+        max_cpa_distance: float = 5.0,
+        max_cpa_time: float = 900.0,
+        min_altitude: int = 1
+    ) -> np.ndarray:
+        """
+        Return the flights passing close to home soon, as an array of APPROACH_DTYPE sorted by time of approach.
+
+        :param flights: A FlightBatch or a list of Flight instances
+        :param max_cpa_distance: Maximum distance in kilometers of the closest point of approach
+        :param max_cpa_time: Maximum time in seconds until the closest point of approach
+        :param min_altitude: Minimum altitude in feet, excluding flights on the ground
+        """
+        columns = get_flight_columns(flights)
+        relative = self.__get_relative(columns)
+
+        # Flights without position, heading, speed or altitude have NaN columns and are never approaching.
+        known = np.isfinite(relative["cpa_distance"]) & np.isfinite(relative["cpa_time"]) & np.isfinite(columns["altitude"])
+
+        mask = known & (relative["cpa_distance"] <= max_cpa_distance) & (relative["cpa_time"] <= max_cpa_time) & \
+            (columns["altitude"] >= min_altitude)
+
+        approaching = relative[mask]
+        return approaching[np.argsort(approaching["cpa_time"], kind="stable")]
+
+
+if __name__ == "__main__":
+    # Benchmark of a tick: relative positions, approaching flights and proximate pairs of a snapshot.
+    # Usage (from the python directory): python -m FlightRadar24_patch.geodesy [flights]
+    import random
+    import sys
+    import time
+
+    random.seed(0)
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    batch = FlightBatch(["{:08x}".format(0x30000000 + index) for index in range(size)], [
+        [
+            "{:06X}".format(index), random.uniform(45, 60), random.uniform(0, 25), random.randint(0, 359),
+            random.randint(0, 42000), random.randint(0, 550), "1000", "", "A320", "D-ABCD",
+            1700000000, "TXL", "MUC", "LH1", 0, 0, "DLH1", 0, "DLH"
+        ]
+        for index in range(size)
+    ])
+    home = HomeGeodesy(52.5162767, 13.3777761)
+
+    def measure(name: str, function, repeat: int = 10):
+        start = time.perf_counter()
+        for _ in range(repeat): result = function()
+        print("{:<40} {:>8.2f} ms ({} results)".format(name, (time.perf_counter() - start) / repeat * 1000, len(result)))
+
+    print("{} flights".format(size))
+    measure("get_relative (FlightBatch)", lambda: home.get_relative(batch))
+    measure("get_relative (Flight instances)", lambda: home.get_relative(batch.to_flights()))
+    measure("get_approaching (FlightBatch)", lambda: home.get_approaching(batch))
+    measure("get_proximate_pairs (10 km)", lambda: get_proximate_pairs(batch["latitude"], batch["longitude"], 10.0))
+    measure("get_proximate_pairs (10 km, 1000 ft)", lambda: get_proximate_pairs(
+        batch["latitude"], batch["longitude"], 10.0, batch["altitude"], 1000
+    ))
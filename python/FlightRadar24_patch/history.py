@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+
+from typing import Dict, Iterable, Iterator, List, Union
+
+import calendar
+import re
+import time
+import xml.etree.ElementTree as ElementTree
+
+import numpy as np
+
+
+# Columns of a flight track: Unix time, position, altitude in feet, ground speed in knots and heading in degrees.
+HISTORY_DTYPE = np.dtype([
+    ("ts", "i8"), ("lat", "f8"), ("lon", "f8"), ("alt", "f8"), ("speed", "f8"), ("heading", "f8")
+])
+
+# Row of the CSV export: Timestamp,UTC,Callsign,Position,Altitude,Speed,Direction
+_csv_row = re.compile(rb'^(\d+),[^,\n]*,[^,\n]*,"?(-?[\d.]+),\s*(-?[\d.]+)"?,(-?[\d.]*),(-?[\d.]*),(-?[\d.]*)\r?$', re.M)
+
+# Values in the description of a KML placemark, e.g. "Speed: 452 kt".
+_kml_values = {
+    name: re.compile(name + r"\W*(?:<[^>]*>\W*)*(-?[\d,.]+)", re.I)
+    for name in ("Altitude", "Speed", "Heading")
+}
+
+METERS_TO_FEET = 3.28084
+
+
+Data = Union[bytes, bytearray, memoryview, Iterable[bytes]]
+
+
+def _iter_chunks(data: Data) -> Iterator[bytes]:
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        yield bytes(data)
+    else:
+        yield from data
+
+
+def _to_track(rows: List) -> np.ndarray:
+    track = np.empty(len(rows), dtype=HISTORY_DTYPE)
+
+    if rows:
+        # Empty fields are converted to NaN, the byte strings are parsed by NumPy at once.
+        values = np.array(rows, dtype="S32")
+        values[values == b""] = b"nan"
+
+        track["ts"] = values[:, 0].astype(np.float64).astype(np.int64)
+
+        for column, name in enumerate(HISTORY_DTYPE.names[1:], start=1):
+            track[name] = values[:, column].astype(np.float64)
+
+    return track
+
+
+def parse_history_csv(data: Data) -> np.ndarray:
+    """
+    Parse a CSV history export into a track array (see HISTORY_DTYPE), sorted by time.
+
+    :param data: The CSV content as bytes, or an iterable of byte chunks, e.g. Response.iter_content()
+    """
+    rows: List = list()
+    rest = b""
+
+    for chunk in _iter_chunks(data):
+        chunk = rest + chunk
+
+        # Only complete lines are parsed, the last partial line is kept for the next chunk.
+        end = chunk.rfind(b"\n") + 1
+        rows.extend(_csv_row.findall(chunk, 0, end))
+        rest = chunk[end:]
+
+    if rest:
+        rows.extend(_csv_row.findall(rest))
+
+    track = _to_track(rows)
+    return track[np.argsort(track["ts"], kind="stable")]
+
+
+def _parse_time(text: str) -> int:
+    """
+    Convert an ISO 8601 UTC time ("2023-03-28T10:40:00Z") to a Unix time.
+    """
+    return calendar.timegm(time.strptime(text.strip()[:19], "%Y-%m-%dT%H:%M:%S"))
+
+
+def parse_history_kml(data: Data) -> np.ndarray:
+    """
+    Parse a KML history export into a track array (see HISTORY_DTYPE), sorted by time.
+
+    Every placemark with a time stamp and a point is a row of the track. The altitude of the coordinates
+    (in meters) is used unless the description gives one, speed and heading are read from the description.
+
+    :param data: The KML content as bytes, or an iterable of byte chunks, e.g. Response.iter_content()
+    """
+    parser = ElementTree.XMLPullParser(events=("start", "end"))
+    rows: List = list()
+
+    # Open elements, the parent of a placemark is the last one when it ends.
+    parents: List[ElementTree.Element] = list()
+
+    def local_name(tag: str) -> str:
+        return tag.rsplit("}", 1)[-1]
+
+    def read_events() -> None:
+        for event, element in parser.read_events():
+            if event == "start":
+                parents.append(element)
+                continue
+
+            parents.pop()
+
+            if local_name(element.tag) != "Placemark": continue
+
+            values: Dict[str, str] = dict()
+
+            for child in element.iter():
+                name = local_name(child.tag)
+                if name in ("when", "coordinates", "description") and child.text:
+                    values[name] = child.text
+
+            # Placemarks are removed from the tree once read, the document is never held in memory.
+            if parents: parents[-1].remove(element)
+
+            if "when" not in values or "coordinates" not in values: continue
+
+            coordinates = values["coordinates"].strip().split(",")
+            description = values.get("description", "")
+
+            def find(name: str) -> str:
+                match = _kml_values[name].search(description)
+                return match.group(1).replace(",", "") if match else ""
+
+            altitude = find("Altitude")
+
+            if not altitude and len(coordinates) > 2:
+                altitude = str(float(coordinates[2]) * METERS_TO_FEET)
+
+            rows.append((str(_parse_time(values["when"])), coordinates[1], coordinates[0], altitude, find("Speed"), find("Heading")))
+
+    for chunk in _iter_chunks(data):
+        parser.feed(chunk)
+        read_events()
+
+    parser.close()
+    read_events()
+
+    track = _to_track(rows)
+    return track[np.argsort(track["ts"], kind="stable")]
+
+
+def parse_history(data: Data, file_type: str) -> np.ndarray:
+    """
+    Parse a history export of get_history_data() into a track array.
+
+    :param data: The content as bytes, or an iterable of byte chunks
+    :param file_type: "CSV" or "KML"
+    """
+    file_type = file_type.lower()
+
+    if file_type == "csv":
+        return parse_history_csv(data)
+
+    if file_type == "kml":
+        return parse_history_kml(data)
+
+    raise ValueError(f"File type '{file_type}' is not supported. Only CSV and KML are supported.")
+
+
+def track_from_trail(trail: Iterable[Dict]) -> np.ndarray:
+    """
+    Convert the trail of get_flight_details() (a list of dictionaries with ts, lat, lng, alt, spd, hd) into a track array.
+    """
+    rows = [(point["ts"], point["lat"], point["lng"], point.get("alt"), point.get("spd"), point.get("hd")) for point in trail]
+
+    track = np.array(rows, dtype=[(name, "O") for name in HISTORY_DTYPE.names]).astype(HISTORY_DTYPE) if rows else \
+        np.empty(0, dtype=HISTORY_DTYPE)
+
+    return track[np.argsort(track["ts"], kind="stable")]
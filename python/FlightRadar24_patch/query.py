@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+from typing import Any, Callable, List, Optional, Tuple
+
+import numpy as np
+
+from .batch import FlightBatch
+from .regions import Bounds, parse_bounds
+
+
+# Comparisons of the "min_" and "max_" prefixes, as in Flight.check_info().
+COMPARISONS = {"min": np.greater_equal, "max": np.less_equal}
+
+# Values matched with "in" instead of equality.
+_collections = (list, tuple, set, frozenset, np.ndarray)
+
+
+class FlightQuery(object):
+    """
+    Filter of flights compiled once and evaluated on whole FlightBatch snapshots as boolean masks.
+
+    The keywords are those of Flight.check_info(): a column name checks equality, the prefixes "min_"
+    and "max_" compare numeric (or text) columns. A list, tuple or set matches any of its values.
+    The keyword "bounds" keeps the flights within the coordinates "y1,y2,x1,x2" (or a tuple), also
+    when they cross the antimeridian. All conditions must match.
+
+    Keywords that are not columns of a FlightBatch, e.g. detail attributes, are ignored,
+    as check_info() ignores them before the details are set.
+
+    Example: FlightQuery(min_altitude = 6700, max_altitude = 13000, airline_icao = ["THY", "PGT"])(batch)
+    """
+    def __init__(self, **info: Any):
+        self.info = info
+
+        # Compiled conditions: (column, function of the column returning a mask).
+        self.__conditions: List[Tuple[str, Callable[[np.ndarray], np.ndarray]]] = list()
+        self.__bounds: Optional[Bounds] = None
+
+        for key, value in info.items():
+            if key == "bounds":
+                self.__bounds = parse_bounds(value) if isinstance(value, str) else tuple(value)
+                continue
+
+            # Separate the comparison prefix if it exists.
+            prefix, key = key.split("_", maxsplit=1) if key[:4] == "max_" or key[:4] == "min_" else (None, key)
+
+            self.__conditions.append((key, self.__compile(prefix, value)))
+
+    def __call__(self, batch: FlightBatch) -> FlightBatch:
+        """
+        Return the flights of the batch matching the query.
+        """
+        return batch[self.mask(batch)]
+
+    def __repr__(self) -> str:
+        return "FlightQuery({})".format(", ".join("{}={!r}".format(key, value) for key, value in self.info.items()))
+
+    @staticmethod
+    def __compile(prefix: Optional[str], value: Any) -> Callable[[np.ndarray], np.ndarray]:
+        if prefix:
+            comparison = COMPARISONS[prefix]
+            return lambda column: comparison(column, value)
+
+        if isinstance(value, _collections):
+            values = np.asarray(list(value))
+            return lambda column: np.isin(column, values)
+
+        return lambda column: column == value
+
+    def mask(self, batch: FlightBatch) -> np.ndarray:
+        """
+        Return a boolean array, True for every flight of the batch matching the query.
+        """
+        data = batch.data
+        mask = np.ones(len(data), dtype=bool)
+
+        for key, condition in self.__conditions:
+            if key not in data.dtype.names: continue
+            mask &= condition(data[key])
+
+        if self.__bounds is not None:
+            north, south, west, east = self.__bounds
+            latitude, longitude = data["latitude"], data["longitude"]
+
+            mask &= (latitude >= south) & (latitude <= north)
+
+            # Longitudes of the bounds may exceed [-180, 180] or wrap around, compare on the same turn as west.
+            if east - west < 360:
+                mask &= (longitude - west) % 360 <= (east - west) % 360
+
+        return mask
+
+    def count(self, batch: FlightBatch) -> int:
+        return int(np.count_nonzero(self.mask(batch)))
+
+
+if __name__ == "__main__":
+    # Benchmark of Flight.check_info() over a snapshot against the compiled query.
+    # Usage (from the python directory): python -m FlightRadar24_patch.query [flights]
+    import random
+    import sys
+    import time
+
+    random.seed(0)
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    airlines = ["DLH", "THY", "BAW", "AFR", "UAE", "RYR", "EZY", "KLM"]
+    aircraft = ["A320", "B738", "A20N", "B77W", "A359", "E190"]
+
+    batch = FlightBatch(["{:08x}".format(0x30000000 + index) for index in range(size)], [
+        [
+            "{:06X}".format(index), random.uniform(-60, 70), random.uniform(-180, 180), random.randint(0, 359),
+            random.randint(0, 42000), random.randint(0, 550), "1000", "", random.choice(aircraft), "D-ABCD",
+            1700000000, "TXL", "MUC", "LH1", 0, 0, "DLH1", 0, random.choice(airlines)
+        ]
+        for index in range(size)
+    ])
+    flights = batch.to_flights()
+
+    filters = {"min_altitude": 6700, "max_altitude": 13000, "airline_icao": "THY"}
+    query = FlightQuery(**filters, aircraft_code=["A320", "A20N"], bounds="60,30,-10,40")
+
+    def measure(name: str, function: Callable[[], int], repeat: int = 10) -> None:
+        start = time.perf_counter()
+        for _ in range(repeat): count = function()
+        elapsed = (time.perf_counter() - start) / repeat
+        print("{:<36} {:>8.2f} ms ({} matches)".format(name, elapsed * 1000, count))
+
+    print("{} flights".format(size))
+    measure("check_info (Flight instances)", lambda: sum(flight.check_info(**filters) for flight in flights))
+    measure("FlightQuery.mask", lambda: FlightQuery(**filters).count(batch))
+    measure("FlightQuery.mask (with type, bounds)", lambda: query.count(batch))
+    measure("FlightQuery() (new FlightBatch)", lambda: len(query(batch)))
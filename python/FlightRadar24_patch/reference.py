@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+
+from typing import Any, Callable, Dict, Optional
+
+import concurrent.futures
+import json
+import os
+import threading
+import time
+
+
+# Time to live in seconds of each reference data set, by name.
+DEFAULT_TTLS: Dict[str, float] = {
+    "airlines": 7 * 24 * 3600,
+    "zones": 7 * 24 * 3600,
+    "volcanic_eruptions": 3600,
+    "airport_disruptions": 300,
+    "most_tracked": 60
+}
+
+
+class ReferenceDataCache(object):
+    """
+    Cache of slowly changing reference data, e.g. airlines or zones, with a TTL per data set.
+
+    A stale data set is returned at once while it is downloaded again in the background. Only a data
+    set that was never loaded blocks the caller. With a path, every data set is also written to disk
+    and read back by the next instance, so a restart serves the previous data at memory speed.
+
+    The returned objects are shared by all callers and must not be modified.
+    """
+    def __init__(self, path: Optional[str] = None, ttls: Optional[Dict[str, float]] = None, default_ttl: float = 3600):
+        """
+        Constructor of the ReferenceDataCache class.
+
+        :param path: Directory of the disk snapshot. If None, the data is kept in memory only.
+        :param ttls: Time to live in seconds by data set name, overriding DEFAULT_TTLS
+        :param default_ttl: Time to live of data sets without a TTL
+        """
+        self.path = path
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or dict()))
+        self.default_ttl = default_ttl
+
+        # Content and update time (Unix time) of each data set.
+        self.__entries: Dict[str, Dict[str, Any]] = dict()
+        self.__refreshing: Dict[str, concurrent.futures.Future] = dict()
+        self.__executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self.__lock = threading.RLock()
+
+        self.__stats = {"hits": 0, "stale": 0, "misses": 0, "refreshes": 0, "errors": 0, "write_errors": 0}
+
+        if path is not None: self.load()
+
+    def get(self, name: str, loader: Callable[[], Any]) -> Any:
+        """
+        Return a data set. A stale one is refreshed in the background, a missing one is loaded at once.
+
+        :param name: Name of the data set, e.g. "airlines"
+        :param loader: Function downloading the data set
+        """
+        with self.__lock:
+            entry = self.__entries.get(name)
+
+            if entry is not None:
+                if self.is_fresh(name, entry):
+                    self.__stats["hits"] += 1
+                else:
+                    self.__stats["stale"] += 1
+                    self.__submit(name, loader)
+
+                return entry["content"]
+
+            self.__stats["misses"] += 1
+
+        return self.refresh(name, loader)
+
+    def get_stats(self) -> Dict[str, int]:
+        with self.__lock:
+            return dict(self.__stats, size=len(self.__entries))
+
+    def get_ttl(self, name: str) -> float:
+        return self.ttls.get(name, self.default_ttl)
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """
+        Mark a data set, or all of them if name is None, as stale.
+        """
+        with self.__lock:
+            for key, entry in self.__entries.items():
+                if name is None or key == name: entry["updated"] = 0.0
+
+    def is_fresh(self, name: str, entry: Dict[str, Any]) -> bool:
+        return time.time() - entry["updated"] < self.get_ttl(name)
+
+    def load(self) -> None:
+        """
+        Read the data sets of the disk snapshot. Unreadable or malformed files are skipped.
+        """
+        if self.path is None or not os.path.isdir(self.path):
+            return
+
+        for filename in os.listdir(self.path):
+            if not filename.endswith(".json"): continue
+
+            try:
+                with open(os.path.join(self.path, filename), "r", encoding="utf-8") as file:
+                    entry = json.load(file)
+
+                entry = {"content": entry["content"], "updated": float(entry["updated"])}
+            except (OSError, ValueError, KeyError, TypeError):
+                continue
+
+            with self.__lock:
+                self.__entries[filename[:-len(".json")]] = entry
+
+    def refresh(self, name: str, loader: Callable[[], Any]) -> Any:
+        """
+        Download a data set now, store it and return it.
+
+        The data set is also written to the disk snapshot. A failed write is counted in the
+        statistics (write_errors) and does not fail the call, the data set is kept in memory.
+        """
+        content = loader()
+        entry = {"content": content, "updated": time.time()}
+
+        with self.__lock:
+            self.__entries[name] = entry
+            self.__stats["refreshes"] += 1
+
+        if self.path is not None:
+            try:
+                self.__write(name, entry)
+            except (OSError, TypeError, ValueError):
+                with self.__lock:
+                    self.__stats["write_errors"] += 1
+
+        return content
+
+    def close(self) -> None:
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=False)
+
+    def __submit(self, name: str, loader: Callable[[], Any]) -> None:
+        """
+        Refresh a data set in the background, unless it is refreshed already. Called with the lock held.
+        """
+        if name in self.__refreshing:
+            return
+
+        future = self.__get_executor().submit(self.refresh, name, loader)
+        self.__refreshing[name] = future
+
+        future.add_done_callback(lambda future: self.__refreshed(name, future))
+
+    def __get_executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        if self.__executor is None:
+            self.__executor = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="reference")
+
+        return self.__executor
+
+    def __refreshed(self, name: str, future: concurrent.futures.Future) -> None:
+        with self.__lock:
+            self.__refreshing.pop(name, None)
+
+            # A failed refresh keeps the stale data set, it is tried again by the next get().
+            if future.exception() is not None: self.__stats["errors"] += 1
+
+    def __write(self, name: str, entry: Dict[str, Any]) -> None:
+        os.makedirs(self.path, exist_ok=True)
+
+        filename = os.path.join(self.path, name + ".json")
+
+        try:
+            with open(filename + ".tmp", "w", encoding="utf-8") as file:
+                json.dump(entry, file)
+
+            os.replace(filename + ".tmp", filename)
+        except BaseException:
+            # A partly written snapshot file is not left behind.
+            if os.path.exists(filename + ".tmp"): os.remove(filename + ".tmp")
+            raise
@@ -0,0 +1,283 @@
+# -*- coding: utf-8 -*-
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import concurrent.futures
+import math
+
+from .batch import FlightBatch
+
+
+# Bounds as a tuple (north, south, west, east), the order of the bounds string "y1,y2,x1,x2".
+Bounds = Tuple[float, float, float, float]
+
+
+def parse_bounds(bounds: str) -> Bounds:
+    """
+    Convert a bounds string "y1,y2,x1,x2" to a tuple of floats.
+    """
+    north, south, west, east = (float(value) for value in bounds.split(","))
+    return north, south, west, east
+
+
+def format_bounds(bounds: Bounds) -> str:
+    """
+    Convert a tuple of bounds to a string "y1,y2,x1,x2".
+    """
+    return "{:.6f},{:.6f},{:.6f},{:.6f}".format(*bounds)
+
+
+def crosses_antimeridian(bounds: Bounds) -> bool:
+    """
+    Return whether bounds cross the antimeridian, i.e. their west longitude is greater than their east longitude.
+    """
+    return bounds[2] > bounds[3]
+
+
+def split_antimeridian(bounds: Bounds) -> List[Bounds]:
+    """
+    Split bounds crossing the antimeridian into their western and eastern part. Other bounds are returned as they are.
+    """
+    if not crosses_antimeridian(bounds):
+        return [bounds]
+
+    north, south, west, east = bounds
+    return [(north, south, west, 180.0), (north, south, -180.0, east)]
+
+
+def split_bounds(bounds: Bounds, rows: int = 2, columns: int = 2) -> List[Bounds]:
+    """
+    Split bounds into a grid of rows x columns sub-rectangles.
+
+    Bounds crossing the antimeridian are split along the unwrapped longitudes, the sub-rectangles
+    have longitudes within [-180, 180] and one of them may cross the antimeridian again.
+    """
+    north, south, west, east = bounds
+
+    if crosses_antimeridian(bounds):
+        east += 360
+
+    height = (north - south) / rows
+    width = (east - west) / columns
+
+    def wrap_west(longitude: float) -> float:
+        return (longitude + 180) % 360 - 180 if longitude >= 180 else longitude
+
+    def wrap_east(longitude: float) -> float:
+        return 180 - (180 - longitude) % 360 if longitude > 180 else longitude
+
+    return [
+        (
+            north - row * height, north - (row + 1) * height,
+            wrap_west(west + column * width), wrap_east(west + (column + 1) * width)
+        )
+        for row in range(rows) for column in range(columns)
+    ]
+
+
+class RegionScanner(object):
+    """
+    Scan large bounds with concurrent feed requests on adaptive sub-rectangles.
+
+    A single feed response is truncated at the limit of the flight tracker config. The scanner
+    splits the bounds into tiles of at most max_span degrees, requests them concurrently, splits
+    every tile whose response reached the limit again into 2x2 tiles, and merges all responses
+    into one snapshot without duplicated flights. Failed tile requests are counted in errors
+    and their flights are missing from the snapshot.
+    """
+    def __init__(self, api: Any, max_workers: int = 8, max_span: float = 30.0, max_depth: int = 4):
+        """
+        Constructor of the RegionScanner class.
+
+        :param api: The FlightRadar24API instance doing the requests
+        :param max_workers: Maximum number of requests in flight at the same time
+        :param max_span: Maximum width and height in degrees of the initial tiles
+        :param max_depth: Maximum number of times a tile reaching the limit is split again
+        """
+        self.api = api
+        self.max_workers = max_workers
+        self.max_span = max_span
+        self.max_depth = max_depth
+
+        # Statistics of the last scan.
+        self.requests = 0
+        self.truncated = 0
+        self.errors = 0
+
+    def get_tiles(self, bounds: Bounds) -> List[Bounds]:
+        """
+        Return the initial tiles of the bounds, with at most max_span degrees of width and height.
+
+        Bounds crossing the antimeridian are split there first, so no tile (nor its quarters) crosses it.
+        """
+        tiles: List[Bounds] = list()
+
+        for part in split_antimeridian(bounds):
+            north, south, west, east = part
+            rows = max(1, math.ceil(abs(north - south) / self.max_span))
+            columns = max(1, math.ceil(abs(east - west) / self.max_span))
+
+            tiles.extend(split_bounds(part, rows, columns))
+
+        return tiles
+
+    def scan(self, bounds: str, **filters: Optional[str]) -> FlightBatch:
+        """
+        Return all flights within the bounds as a FlightBatch.
+
+        A tile whose request fails does not abort the scan, the flights of the other tiles are returned.
+
+        :param bounds: Coordinates (y1, y2 ,x1, x2). Ex: "75.78,-75.78,-427.56,427.56"
+        :param filters: Further filters of get_flights_batch(), e.g. airline or aircraft_type
+        """
+        limit = int(self.api.get_flight_tracker_config().limit)
+
+        self.requests = 0
+        self.truncated = 0
+        self.errors = 0
+
+        flights: Dict[str, List[Any]] = dict()
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+
+            def submit(tile: Bounds, depth: int) -> Tuple[concurrent.futures.Future, Bounds, int]:
+                self.requests += 1
+                return executor.submit(self.api.get_flights_batch, bounds=format_bounds(tile), **filters), tile, depth
+
+            pending = dict()
+
+            for tile in self.get_tiles(parse_bounds(bounds)):
+                future, tile, depth = submit(tile, 0)
+                pending[future] = (tile, depth)
+
+            while pending:
+                done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+
+                for future in done:
+                    tile, depth = pending.pop(future)
+
+                    try:
+                        batch: FlightBatch = future.result()
+                    except Exception:
+                        self.errors += 1
+                        continue
+
+                    # A response at the limit may be truncated, so request its quarters.
+                    if len(batch) >= limit and depth < self.max_depth:
+                        self.truncated += 1
+
+                        for sub_tile in split_bounds(tile):
+                            sub_future, sub_tile, sub_depth = submit(sub_tile, depth + 1)
+                            pending[sub_future] = (sub_tile, sub_depth)
+
+                        continue
+
+                    flights.update(zip(batch.ids, batch.rows))
+
+        return FlightBatch(list(flights.keys()), list(flights.values()))
+
+
+if __name__ == "__main__":
+    # Throughput benchmark of the scanner against a recorded feed.js response (or a synthetic one).
+    # Usage (from the python directory): python -m FlightRadar24_patch.regions [feed.json] [latency]
+    import json
+    import random
+    import sys
+    import time
+
+    from .api import FlightTrackerConfig
+
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], "r") as file:
+            recorded_feed = json.load(file)
+    else:
+        random.seed(0)
+        recorded_feed = {"full_count": 20000, "version": 4}
+
+        for index in range(20000):
+            recorded_feed["{:08x}".format(0x30000000 + index)] = [
+                "{:06X}".format(index), random.uniform(-60, 70), random.uniform(-180, 180), 90, 35000, 450,
+                "1000", "", "A320", "", 1700000000, "TXL", "MUC", "LH1", 0, 0, "DLH1", 0, "DLH"
+            ]
+
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+
+    class RecordedFeedAPI(object):
+        """
+        Serve the recorded feed truncated at the limit, like the real endpoint, after a simulated latency.
+        """
+        limit = FlightTrackerConfig.limit
+
+        def get_flight_tracker_config(self) -> FlightTrackerConfig:
+            config = FlightTrackerConfig()
+            config.limit = self.limit
+            return config
+
+        def get_flights_batch(self, bounds: str, **filters) -> FlightBatch:
+            north, south, west, east = parse_bounds(bounds)
+            limit = int(self.get_flight_tracker_config().limit)
+            time.sleep(latency)
+
+            content = dict()
+
+            for flight_id, row in recorded_feed.items():
+                if flight_id[0].isnumeric() and south <= row[1] < north and west <= row[2] < east:
+                    content[flight_id] = row
+                    if len(content) >= limit: break
+
+            return FlightBatch.from_feed(content)
+
+    api = RecordedFeedAPI()
+    world = "90,-90,-180,180"
+
+    start = time.perf_counter()
+    single = api.get_flights_batch(world)
+    single_time = time.perf_counter() - start
+
+    for max_workers in (1, 4, 8, 16):
+        scanner = RegionScanner(api, max_workers=max_workers)
+
+        start = time.perf_counter()
+        batch = scanner.scan(world)
+        elapsed = time.perf_counter() - start
+
+        print("workers={:>2}: {:>6} flights in {:.3f} s ({:>8.0f} flights/s, {} requests, {} truncated, {} errors)".format(
+            max_workers, len(batch), elapsed, len(batch) / elapsed, scanner.requests, scanner.truncated, scanner.errors
+        ))
+
+    print("single request: {:>6} flights in {:.3f} s".format(len(single), single_time))
+
+    # Bounds crossing the antimeridian are scanned as two parts, compared with the flights of the recorded feed.
+    # A lower limit makes the scanner split the tiles on both sides.
+    api.limit = "200"
+    pacific = "70,-60,150,-150"
+    north, south, west, east = parse_bounds(pacific)
+    expected = sum(
+        1 for flight_id, row in recorded_feed.items()
+        if flight_id[0].isnumeric() and south <= row[1] < north and (row[2] >= west or row[2] < east)
+    )
+
+    scanner = RegionScanner(api, max_workers=8)
+    batch = scanner.scan(pacific)
+
+    print("antimeridian {}: {:>6} flights of {} ({} requests, {} truncated)".format(
+        pacific, len(batch), expected, scanner.requests, scanner.truncated
+    ))
+    assert len(batch) == expected and scanner.truncated > 0
+    assert all(tile[2] <= tile[3] for tile in scanner.get_tiles(parse_bounds(pacific)))
+    assert len(split_bounds(parse_bounds(pacific))) == 4 and split_bounds((10, 0, 170, -170), 1, 2)[1][2:] == (-180, -170)
+
+    # A failing tile request is counted and the flights of the other tiles are still returned.
+    class FailingFeedAPI(RecordedFeedAPI):
+        def get_flights_batch(self, bounds: str, **filters) -> FlightBatch:
+            if parse_bounds(bounds)[2] < 0:
+                raise ConnectionError(bounds)
+            return super().get_flights_batch(bounds, **filters)
+
+    scanner = RegionScanner(FailingFeedAPI(), max_workers=8)
+    batch = scanner.scan(world)
+
+    print("failing western tiles: {:>6} flights ({} requests, {} errors)".format(
+        len(batch), scanner.requests, scanner.errors
+    ))
+    assert len(batch) > 0 and scanner.errors > 0 and all(row[2] >= 0 for row in batch.rows)
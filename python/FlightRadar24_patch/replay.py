@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import bisect
+import collections
+import dataclasses
+import json
+import math
+import threading
+import time
+import urllib.parse
+
+import requests
+import requests.structures
+
+
+# Response headers kept in a recording. The body is stored decoded, so Content-Encoding is dropped.
+RECORDED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Date", "Cache-Control")
+
+
+@dataclasses.dataclass
+class Record(object):
+    """
+    Data class with a recorded response.
+    """
+    timestamp: float
+    method: str
+    url: str
+    status_code: int
+    headers: Dict[str, str]
+    content: bytes
+
+
+def get_request_key(url: str) -> str:
+    """
+    Return the key of a request used to match recorded responses: the URL with sorted query parameters.
+    """
+    parts = urllib.parse.urlsplit(url)
+    query = sorted(urllib.parse.parse_qsl(parts.query, keep_blank_values=True))
+    return parts.path + "?" + urllib.parse.urlencode(query)
+
+
+# Query parameters naming the requested object, e.g. the flight of a clickhandler request. A recorded
+# response of another URL of the same path is only served when these parameters match as well.
+IDENTIFYING_PARAMETERS = ("flight", "airport", "code", "query", "file", "history")
+
+
+def get_fallback_key(url: str) -> str:
+    """
+    Return the key matching a request to the recorded responses of its path and identifying parameters,
+    ignoring incidental parameters such as the bounds of a feed request.
+    """
+    parts = urllib.parse.urlsplit(url)
+    query = sorted(
+        (name, value) for name, value in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+        if name in IDENTIFYING_PARAMETERS
+    )
+    return parts.path + "?" + urllib.parse.urlencode(query)
+
+
+def get_session_key(method: str, url: str, headers: Optional[Dict] = None, cookies: Optional[Dict] = None) -> str:
+    """
+    Return the key of a request including its headers and cookies, so the responses of conditional
+    or logged-in requests are never shared with other requests of the same URL.
+    """
+    def get_items_key(items: Optional[Dict]) -> str:
+        return repr(sorted((str(name).lower(), str(value)) for name, value in items.items())) if items else "[]"
+
+    return " ".join((method, get_request_key(url), get_items_key(headers), get_items_key(cookies)))
+
+
+def read_records(path: str) -> Iterator[Record]:
+    """
+    Read the records of a recording file.
+
+    Each record is a JSON header line followed by the raw body, with the size given in the header.
+    """
+    with open(path, "rb") as file:
+        while True:
+            line = file.readline()
+
+            if not line: break
+
+            header = json.loads(line)
+            content = file.read(header.pop("size"))
+
+            yield Record(content=content, **header)
+
+
+def build_response(record: Record) -> requests.models.Response:
+    """
+    Create a requests Response object from a record.
+    """
+    response = requests.models.Response()
+    response.status_code = record.status_code
+    response.reason = "OK" if record.status_code < 400 else "Replayed error"
+    response.headers = requests.structures.CaseInsensitiveDict(record.headers)
+    response.url = record.url
+    response._content = record.content
+    # The content is complete, iter_content() yields it in chunks.
+    response._content_consumed = True
+
+    return response
+
+
+class FeedRecorder(object):
+    """
+    Session wrapper that records responses to an append-only file.
+
+    It is used in place of the session of a FlightRadar24API instance:
+    FlightRadar24API(session=FeedRecorder(SessionPool(), "feed.rec"))
+    """
+    def __init__(self, session: Any, path: str, patterns: Optional[Tuple[str, ...]] = ("feed.js", "clickhandler")):
+        """
+        Constructor of the FeedRecorder class.
+
+        :param session: The session sending the requests, e.g. a SessionPool
+        :param path: Path of the recording file. New records are appended.
+        :param patterns: Only URLs containing one of the patterns are recorded. If None, all responses are recorded.
+        """
+        self.session = session
+        self.path = path
+        self.patterns = patterns
+        self.records = 0
+
+        self.__lock = threading.Lock()
+
+    def close(self) -> None:
+        self.session.close()
+
+    def get_stats(self) -> Dict[str, int]:
+        return dict(self.session.get_stats(), recorded=self.records)
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.models.Response:
+        """
+        Send a request through the wrapped session and record the response.
+        """
+        response = self.session.request(method, url, **kwargs)
+
+        if self.patterns is None or any(pattern in url for pattern in self.patterns):
+            self.write(Record(
+                timestamp=time.time(),
+                method=method,
+                url=url,
+                status_code=response.status_code,
+                headers={key: response.headers[key] for key in RECORDED_HEADERS if key in response.headers},
+                content=response.content
+            ))
+
+        return response
+
+    def write(self, record: Record) -> None:
+        """
+        Append a record to the recording file.
+        """
+        header = dataclasses.asdict(record)
+        header.pop("content")
+        header["size"] = len(record.content)
+
+        with self.__lock:
+            with open(self.path, "ab") as file:
+                file.write(json.dumps(header, separators=(",", ":")).encode("utf-8") + b"\n")
+                file.write(record.content)
+
+            self.records += 1
+
+
+class ReplaySession(object):
+    """
+    Session serving recorded responses instead of sending requests.
+
+    It is used in place of the session of a FlightRadar24API instance:
+    FlightRadar24API(session=ReplaySession("feed.rec", speed=10))
+
+    With a finite speed, the recording is replayed on a clock starting at the construction of the
+    session, running speed times faster than the recording. A request is answered with the latest
+    response recorded for the same URL up to the replay time. With an infinite speed, every request
+    is answered with the next response recorded for the same URL.
+
+    A URL that was not recorded is answered with the responses of the same path and identifying
+    parameters (see IDENTIFYING_PARAMETERS), e.g. a feed request with moved bounds. The details of
+    an unrecorded flight are answered with 404.
+    """
+    def __init__(self, path: str, speed: float = 1.0, loop: bool = False):
+        """
+        Constructor of the ReplaySession class.
+
+        :param path: Path of the recording file
+        :param speed: Replay speed, 1 for real time. math.inf serves the records one after another.
+        :param loop: If True, the replay restarts when the end of the recording is reached.
+        """
+        if speed <= 0:
+            raise ValueError(f"The replay speed must be positive. Got {speed}.")
+
+        self.speed = speed
+        self.loop = loop
+
+        records: Dict[str, List[Record]] = collections.defaultdict(list)
+        paths: Dict[str, List[Record]] = collections.defaultdict(list)
+
+        for record in sorted(read_records(path), key=lambda record: record.timestamp):
+            records[get_request_key(record.url)].append(record)
+            paths[get_fallback_key(record.url)].append(record)
+
+        # Records of each URL and of each path with its identifying parameters, with their timestamps for the lookup by replay time.
+        self.__records = {key: ([record.timestamp for record in items], items) for key, items in records.items()}
+        self.__paths = {key: ([record.timestamp for record in items], items) for key, items in paths.items()}
+
+        timestamps = [record.timestamp for items in paths.values() for record in items]
+        self.__first_timestamp = min(timestamps, default=0.0)
+        self.__duration = max(timestamps, default=0.0) - self.__first_timestamp
+
+        self.__start = time.monotonic()
+        self.__cursors: Dict[str, int] = collections.defaultdict(int)
+        self.__lock = threading.Lock()
+
+        self.requests = 0
+        self.misses = 0
+
+    def close(self) -> None:
+        pass
+
+    def get_replay_time(self) -> float:
+        """
+        Return the current position in the recording, in seconds since its first record.
+        """
+        position = (time.monotonic() - self.__start) * self.speed
+
+        if self.loop and self.__duration > 0:
+            position %= self.__duration
+
+        return position
+
+    def get_stats(self) -> Dict[str, int]:
+        return {"requests": self.requests, "misses": self.misses, "handshakes": 0, "reuses": 0}
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.models.Response:
+        """
+        Return the recorded response for the URL. Unknown URLs are matched by path and identifying parameters,
+        then answered with 404.
+        """
+        key = get_request_key(url)
+        timestamps, records = self.__records.get(key) or self.__paths.get(get_fallback_key(url)) or ([], [])
+
+        with self.__lock:
+            self.requests += 1
+
+            if not records:
+                self.misses += 1
+                return build_response(Record(time.time(), method, url, 404, {"Content-Type": "text/plain"}, b""))
+
+            if math.isinf(self.speed):
+                index = self.__cursors[key]
+                self.__cursors[key] = (index + 1) % len(records) if self.loop else min(index + 1, len(records) - 1)
+            else:
+                timestamp = self.__first_timestamp + self.get_replay_time()
+                index = max(bisect.bisect_right(timestamps, timestamp) - 1, 0)
+
+        return build_response(records[index])
@@ -1,26 +1,20 @@
 # -*- coding: utf-8 -*-
 
-from typing import Dict, List, Optional, Union
-
-import brotli
-import json
-import gzip
+from typing import Any, Dict, Iterator, List, Optional, Union
 
 import requests
 import requests.structures
 
+from .decode import decompress, loads
 from .errors import CloudflareError
+from .session import SessionPool
 
 
 class APIRequest(object):
     """
     Class to make requests to the FlightRadar24.
     """
-    __content_encodings = {
-        "": lambda x: x,
-        "br": brotli.decompress,
-        "gzip": gzip.decompress
-    }
+    __no_content = object()
 
     def __init__(
         self,
@@ -30,7 +24,9 @@ class APIRequest(object):
         timeout: int = 30,
         data: Optional[Dict] = None,
         cookies: Optional[Dict] = None,
-        exclude_status_codes: List[int] = list()
+        exclude_status_codes: List[int] = list(),
+        session: Optional[Union[SessionPool, Any]] = None,
+        stream: bool = False
     ):
         """
         Constructor of the APIRequest class.
@@ -41,8 +37,11 @@ class APIRequest(object):
         :param data: data for the request. If "data" is None, request will be a GET. Otherwise, it will be a POST
         :param cookies: cookies for the request
         :param exclude_status_codes: raise for status code except those on the excluded list
+        :param session: session sending the request (SessionPool, FeedRecorder, ReplaySession). If None, a new connection is opened
+        :param stream: if True, the body is not downloaded with the response but read with iter_body()
         """
         self.url = url
+        self.__content = self.__no_content
 
         self.request_params = {
             "params": params,
@@ -52,10 +51,17 @@ class APIRequest(object):
             "cookies": cookies
         }
 
-        request_method = requests.get if data is None else requests.post
-
         if params: url += "?" + "&".join(["{}={}".format(k, v) for k, v in params.items()])
-        self.__response = request_method(url, headers=headers, cookies=cookies, data=data, timeout=timeout)
+
+        # Only streamed requests pass the argument, so sessions without it keep working.
+        options = {"stream": True} if stream else dict()
+
+        if session is not None:
+            method = "GET" if data is None else "POST"
+            self.__response = session.request(method, url, headers=headers, cookies=cookies, data=data, timeout=timeout, **options)
+        else:
+            request_method = requests.get if data is None else requests.post
+            self.__response = request_method(url, headers=headers, cookies=cookies, data=data, timeout=timeout, **options)
 
         if self.get_status_code() == 520:
             raise CloudflareError(
@@ -68,22 +74,32 @@ class APIRequest(object):
 
     def get_content(self) -> Union[Dict, bytes]:
         """
-        Return the received content from the request.
+        Return the received content from the request. It is decoded once, later calls return the same object.
         """
-        content = self.__response.content
+        if self.__content is self.__no_content:
+            content = self.__get_body()
+
+            # Parse the content if the content type is JSON.
+            if "application/json" in self.__response.headers["Content-Type"]:
+                content = loads(content)
 
-        content_encoding = self.__response.headers.get("Content-Encoding", "")
-        content_type = self.__response.headers["Content-Type"]
+            self.__content = content
 
-        # Try to decode the content.
-        try: content = self.__content_encodings[content_encoding](content)
-        except Exception: pass
+        return self.__content
 
-        # Return a dictionary if the content type is JSON.
-        if "application/json" in content_type:
-            return json.loads(content)
+    def iter_body(self, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        """
+        Yield the body of the response in chunks as they are received, decompressed by requests.
+
+        :param chunk_size: Maximum size of the chunks in bytes
+        """
+        return self.__response.iter_content(chunk_size)
 
-        return content
+    def __get_body(self) -> bytes:
+        """
+        Return the body of the response, decompressed if it was not yet.
+        """
+        return decompress(self.__response.content, self.__response.headers.get("Content-Encoding", ""))
 
     def get_cookies(self) -> Dict:
         """
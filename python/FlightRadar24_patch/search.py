@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+import collections
+import re
+import threading
+
+from .entities.airport import Airport
+from .entities.flight import Flight
+
+
+# Key of a document: its result type ("live", "airport", "operator", ...) and its ID.
+DocumentKey = Tuple[str, str]
+
+_separators = re.compile(r"[\s/(),]+")
+
+
+def get_trigrams(term: str) -> Set[str]:
+    return {term[index:index + 3] for index in range(len(term) - 2)}
+
+
+class SearchIndex(object):
+    """
+    Local index of search results, answering queries by prefix and substring without network requests.
+
+    Documents are stored in the format of the results of FlightRadar24API.search(), with a type
+    (e.g. "live", "airport", "operator"), an ID, a label and details. They come from feed snapshots
+    (live flights), airports, airlines and remote search results.
+
+    Every term of a document is indexed by its trigrams and by its prefixes of one and two characters.
+    A match of the whole term ranks first, then a prefix match, then a match inside a term.
+    """
+    def __init__(self):
+        self.__documents: Dict[DocumentKey, Dict[str, Any]] = dict()
+        self.__terms: Dict[DocumentKey, Tuple[str, ...]] = dict()
+        self.__grams: Dict[str, Set[DocumentKey]] = collections.defaultdict(set)
+        self.__lock = threading.Lock()
+
+        self.__stats = {"queries": 0, "hits": 0, "misses": 0}
+
+    def __len__(self) -> int:
+        return len(self.__documents)
+
+    def add(self, result: Dict[str, Any], *terms: str) -> None:
+        """
+        Add or replace a document.
+
+        :param result: The document, a dictionary with at least "type" and "id", like a search result
+        :param terms: Terms of the document. If none is given, the ID and the words of the label are used.
+        """
+        if not terms:
+            terms = (str(result["id"]),) + tuple(_separators.split(str(result.get("label", ""))))
+
+        key = (result["type"], str(result["id"]))
+        terms = tuple(sorted({term.lower() for term in terms if term and term != Flight._default_text}))
+
+        with self.__lock:
+            self.__documents[key] = result
+
+            if self.__terms.get(key) != terms:
+                self.__unindex(key)
+                self.__index(key, terms)
+
+    def add_airlines(self, airlines: Iterable[Dict[str, Any]]) -> None:
+        """
+        Add the airlines of FlightRadar24API.get_airlines() as "operator" documents.
+        """
+        for airline in airlines:
+            icao = airline.get("ICAO") or airline.get("Code")
+            if not icao: continue
+
+            result = {
+                "id": icao,
+                "label": "{} ({} / {})".format(airline.get("Name"), airline.get("Code"), airline.get("ICAO")),
+                "detail": {"operator_id": airline.get("id"), "iata": airline.get("Code"), "logo": None},
+                "type": "operator"
+            }
+            self.add(result, icao, airline.get("Code") or "", airline.get("Name") or "", *_separators.split(airline.get("Name") or ""))
+
+    def add_airports(self, airports: Iterable[Airport]) -> None:
+        """
+        Add Airport instances, e.g. of FlightRadar24API.get_airports() or an AirportCatalog, as "airport" documents.
+        """
+        for airport in airports:
+            iata, icao, name = getattr(airport, "iata", ""), getattr(airport, "icao", ""), getattr(airport, "name", "")
+
+            result = {
+                "id": iata or icao,
+                "label": "{} ({} / {})".format(name, iata, icao),
+                "detail": {"lat": airport.latitude, "lon": airport.longitude, "size": None},
+                "type": "airport"
+            }
+            self.add(result, iata, icao, name, *_separators.split(name))
+
+    def add_results(self, results: Dict[str, List[Dict[str, Any]]]) -> None:
+        """
+        Add the results of FlightRadar24API.search(), grouped by type.
+        """
+        for items in results.values():
+            for result in items:
+                if "type" in result and "id" in result: self.add(result)
+
+    def get_stats(self) -> Dict[str, int]:
+        with self.__lock:
+            return dict(self.__stats, documents=len(self.__documents), grams=len(self.__grams))
+
+    def remove(self, key: DocumentKey) -> None:
+        with self.__lock:
+            self.__documents.pop(key, None)
+            self.__unindex(key)
+
+    def search(self, query: str, limit: int = 50) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Return the documents matching the query, grouped by type like FlightRadar24API.search(). Empty if none matches.
+
+        :param query: Prefix or part of a callsign, flight number, registration, airport or airline
+        :param limit: Maximum number of documents
+        """
+        query = query.strip().lower()
+
+        with self.__lock:
+            self.__stats["queries"] += 1
+
+            ranked: List[Tuple[int, str, DocumentKey]] = list()
+
+            for key in self.__get_candidates(query):
+                terms = self.__terms[key]
+
+                if query in terms: rank = 0
+                elif any(term.startswith(query) for term in terms): rank = 1
+                elif any(query in term for term in terms): rank = 2
+                else: continue
+
+                ranked.append((rank, min(terms, key=len), key))
+
+            ranked.sort()
+
+            results: Dict[str, List[Dict[str, Any]]] = dict()
+
+            for _, _, key in ranked[:limit]:
+                results.setdefault(key[0], list()).append(self.__documents[key])
+
+            self.__stats["hits" if results else "misses"] += 1
+
+        return results
+
+    def set_live_flights(self, flights: Iterable[Flight]) -> None:
+        """
+        Replace the "live" documents by the flights of a feed snapshot.
+
+        Callsign, flight number and registration are the terms. Flights whose terms did not change are not indexed again.
+        """
+        keys = set()
+
+        for flight in flights:
+            result = {
+                "id": flight.id,
+                "label": "{} / {} / {}".format(flight.number, flight.callsign, flight.registration),
+                "detail": {
+                    "lat": flight.latitude, "lon": flight.longitude, "reg": flight.registration,
+                    "callsign": flight.callsign, "flight": flight.number, "operator": flight.airline_icao,
+                    "ac_type": flight.aircraft_code, "schd_from": flight.origin_airport_iata,
+                    "schd_to": flight.destination_airport_iata
+                },
+                "type": "live"
+            }
+            self.add(result, flight.callsign, flight.number, flight.registration)
+            keys.add(("live", flight.id))
+
+        with self.__lock:
+            for key in [key for key in self.__documents if key[0] == "live" and key not in keys]:
+                self.__documents.pop(key)
+                self.__unindex(key)
+
+    def __get_candidates(self, query: str) -> Set[DocumentKey]:
+        """
+        Return the documents that may match the query: those with all its trigrams, or with its short prefix.
+        """
+        if not query:
+            return set()
+
+        if len(query) < 3:
+            return set(self.__grams.get("^" + query, ()))
+
+        postings = sorted((self.__grams.get(gram, set()) for gram in get_trigrams(query)), key=len)
+        return set.intersection(*postings) if postings else set()
+
+    def __index(self, key: DocumentKey, terms: Tuple[str, ...]) -> None:
+        self.__terms[key] = terms
+
+        for term in terms:
+            for gram in get_trigrams(term) | {"^" + term[:1], "^" + term[:2]}:
+                self.__grams[gram].add(key)
+
+    def __unindex(self, key: DocumentKey) -> None:
+        for term in self.__terms.pop(key, ()):
+            for gram in get_trigrams(term) | {"^" + term[:1], "^" + term[:2]}:
+                postings = self.__grams.get(gram)
+                if postings is None: continue
+
+                postings.discard(key)
+                if not postings: del self.__grams[gram]
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+
+from typing import Dict, Optional, Tuple
+
+import dataclasses
+import http.cookiejar
+import threading
+
+import requests
+import requests.adapters
+import urllib3.connectionpool
+import urllib3.util.retry
+
+
+@dataclasses.dataclass
+class SessionConfig(object):
+    """
+    Data class with settings of the pooled HTTP session layer.
+    """
+    pool_connections: int = 10
+    pool_maxsize: int = 10
+    pool_block: bool = False
+    keep_alive: bool = True
+    max_retries: int = 2
+    backoff_factor: float = 0.3
+    status_forcelist: Tuple[int, ...] = (500, 502, 503, 504)
+
+
+class _ConnectionCounter(object):
+    """
+    Thread-safe counter of opened (handshake) and reused connections.
+    """
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.handshakes = 0
+        self.reuses = 0
+
+    def count(self, connection) -> None:
+        with self.__lock:
+            # A connection without socket has to connect (TCP + TLS) before sending the request.
+            if getattr(connection, "sock", None) is None: self.handshakes += 1
+            else: self.reuses += 1
+
+    def reset(self) -> None:
+        with self.__lock:
+            self.handshakes = 0
+            self.reuses = 0
+
+
+def _counting_pool_class(pool_class: type, counter: _ConnectionCounter) -> type:
+    """
+    Return a subclass of the given urllib3 connection pool that reports every checkout to the counter.
+    """
+    class CountingConnectionPool(pool_class):
+        def _get_conn(self, timeout=None):
+            connection = super()._get_conn(timeout)
+            counter.count(connection)
+            return connection
+
+    return CountingConnectionPool
+
+
+class _CountingHTTPAdapter(requests.adapters.HTTPAdapter):
+    """
+    HTTPAdapter whose connection pools count handshakes and reused connections.
+    """
+    def __init__(self, counter: _ConnectionCounter, **kwargs):
+        self.__counter = counter
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _counting_pool_class(urllib3.connectionpool.HTTPConnectionPool, self.__counter),
+            "https": _counting_pool_class(urllib3.connectionpool.HTTPSConnectionPool, self.__counter),
+        }
+
+
+class SessionPool(object):
+    """
+    Pooled keep-alive HTTP session shared by all requests of a FlightRadar24API instance.
+    """
+    def __init__(self, config: Optional[SessionConfig] = None):
+        """
+        Constructor of the SessionPool class.
+
+        :param config: A SessionConfig instance. If None, the default settings are used.
+        """
+        self.config = config if config is not None else SessionConfig()
+        self.__counter = _ConnectionCounter()
+        self.__requests = 0
+        self.__lock = threading.Lock()
+
+        self.__session = requests.Session()
+        self.__mount(self.config.status_forcelist)
+
+        # Cookies are passed explicitly by each request, so the session must not keep them between calls.
+        self.__session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+
+    def __mount(self, status_forcelist: Tuple[int, ...]) -> None:
+        retries = urllib3.util.retry.Retry(
+            total=self.config.max_retries,
+            connect=self.config.max_retries,
+            read=self.config.max_retries,
+            status=self.config.max_retries if status_forcelist else 0,
+            backoff_factor=self.config.backoff_factor,
+            status_forcelist=status_forcelist,
+            respect_retry_after_header=bool(status_forcelist),
+            raise_on_status=False
+        )
+
+        adapter = _CountingHTTPAdapter(
+            self.__counter,
+            pool_connections=self.config.pool_connections,
+            pool_maxsize=self.config.pool_maxsize,
+            pool_block=self.config.pool_block,
+            max_retries=retries
+        )
+
+        self.__session.mount("http://", adapter)
+        self.__session.mount("https://", adapter)
+
+    def close(self) -> None:
+        """
+        Close all pooled connections.
+        """
+        self.__session.close()
+
+    def disable_status_retries(self) -> None:
+        """
+        Retry connection and read errors only, not responses with a status of status_forcelist.
+        Used when a ThrottledSession backs off on overload responses itself.
+        """
+        self.__session.close()
+        self.__mount(tuple())
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Return the number of requests, connection handshakes and reused connections.
+        """
+        return {
+            "requests": self.__requests,
+            "handshakes": self.__counter.handshakes,
+            "reuses": self.__counter.reuses,
+        }
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict] = None,
+        cookies: Optional[Dict] = None,
+        data: Optional[Dict] = None,
+        timeout: Optional[float] = None,
+        stream: bool = False
+    ) -> requests.models.Response:
+        """
+        Send a request through the pooled session and return the response object.
+
+        :param method: HTTP method, "GET" or "POST"
+        :param url: URL for the request
+        :param headers: headers for the request
+        :param cookies: cookies for the request
+        :param data: data for the request
+        :param timeout: timeout of the request in seconds
+        :param stream: if True, the body is read when the response content is iterated
+        """
+        if not self.config.keep_alive:
+            headers = dict(headers or dict(), connection="close")
+
+        with self.__lock:
+            self.__requests += 1
+
+        return self.__session.request(method, url, headers=headers, cookies=cookies, data=data, timeout=timeout, stream=stream)
+
+    def reset_stats(self) -> None:
+        """
+        Reset the request and connection counters.
+        """
+        with self.__lock:
+            self.__requests = 0
+
+        self.__counter.reset()
@@ -0,0 +1,312 @@
+# -*- coding: utf-8 -*-
+
+from typing import Any, Dict, Optional, Tuple
+
+import collections
+import threading
+import time
+
+import requests
+
+from .errors import CircuitOpenError
+from .replay import get_session_key
+from .session import SessionPool
+
+
+# Status codes treated as a sign of overload: rate limited, Cloudflare error and server errors.
+OVERLOAD_STATUS_CODES: Tuple[int, ...] = (429, 500, 502, 503, 504, 520)
+
+
+class RateLimiter(object):
+    """
+    Token bucket rate limiter with adaptive backoff.
+
+    The rate is halved on every backoff() down to min_rate, and grows back by a
+    fraction of max_rate on every recover().
+    """
+    def __init__(self, max_rate: float = 10.0, burst: int = 20, min_rate: float = 0.2, recovery: float = 0.05):
+        """
+        Constructor of the RateLimiter class.
+
+        :param max_rate: Maximum number of requests per second
+        :param burst: Maximum number of requests sent at once after an idle period
+        :param min_rate: Lowest rate reached by backing off
+        :param recovery: Fraction of max_rate added to the rate after each successful request
+        """
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.burst = burst
+        self.recovery = recovery
+
+        self.rate = max_rate
+        self.__tokens = float(burst)
+        self.__last = time.monotonic()
+        self.__lock = threading.Lock()
+
+        self.__stats = {"acquired": 0, "waited": 0, "backoffs": 0}
+
+    def __refill(self, now: float) -> None:
+        self.__tokens = min(self.burst, self.__tokens + (now - self.__last) * self.rate)
+        self.__last = now
+
+    def acquire(self) -> float:
+        """
+        Take a token, waiting until one is available. Return the waiting time in seconds.
+        """
+        waited = 0.0
+
+        while True:
+            with self.__lock:
+                self.__refill(time.monotonic())
+
+                if self.__tokens >= 1:
+                    self.__tokens -= 1
+                    self.__stats["acquired"] += 1
+                    if waited > 0: self.__stats["waited"] += 1
+                    return waited
+
+                delay = (1 - self.__tokens) / self.rate
+
+            time.sleep(delay)
+            waited += delay
+
+    def backoff(self) -> None:
+        """
+        Halve the rate, e.g. after an overload response.
+        """
+        with self.__lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.__tokens = min(self.__tokens, 0.0)
+            self.__stats["backoffs"] += 1
+
+    def recover(self) -> None:
+        """
+        Increase the rate after a successful request.
+        """
+        with self.__lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * self.recovery)
+
+    def get_stats(self) -> Dict[str, float]:
+        with self.__lock:
+            return dict(self.__stats, rate=self.rate)
+
+
+class CircuitBreaker(object):
+    """
+    Circuit breaker opening after consecutive failures.
+
+    While open, requests are refused. After the reset timeout one trial request is let
+    through (half-open): a success closes the circuit, a failure opens it again with
+    a doubled timeout, up to max_reset_timeout.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 10.0, max_reset_timeout: float = 300.0):
+        """
+        Constructor of the CircuitBreaker class.
+
+        :param failure_threshold: Number of consecutive failures opening the circuit
+        :param reset_timeout: Seconds the circuit stays open before a trial request
+        :param max_reset_timeout: Upper limit of the doubled reset timeout
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+
+        self.state = self.CLOSED
+        self.__failures = 0
+        self.__timeout = reset_timeout
+        self.__opened_at = 0.0
+        self.__trial = False
+        self.__lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """
+        Return whether a request may be sent now.
+        """
+        with self.__lock:
+            if self.state == self.CLOSED:
+                return True
+
+            if self.state == self.OPEN and time.monotonic() - self.__opened_at >= self.__timeout:
+                self.state = self.HALF_OPEN
+                self.__trial = False
+
+            # Only one trial request while half-open.
+            if self.state == self.HALF_OPEN and not self.__trial:
+                self.__trial = True
+                return True
+
+            return False
+
+    def record_failure(self) -> None:
+        with self.__lock:
+            self.__failures += 1
+
+            if self.state == self.HALF_OPEN:
+                self.__timeout = min(self.max_reset_timeout, self.__timeout * 2)
+                self.__open()
+            elif self.state == self.CLOSED and self.__failures >= self.failure_threshold:
+                self.__open()
+
+    def record_success(self) -> None:
+        with self.__lock:
+            self.state = self.CLOSED
+            self.__failures = 0
+            self.__timeout = self.reset_timeout
+
+    def __open(self) -> None:
+        self.state = self.OPEN
+        self.__opened_at = time.monotonic()
+        self.__trial = False
+
+
+_shared_limiter: Optional[RateLimiter] = None
+_shared_breaker: Optional[CircuitBreaker] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_limiter() -> RateLimiter:
+    """
+    Return the rate limiter shared by all clients of the process.
+    """
+    global _shared_limiter
+
+    with _shared_lock:
+        if _shared_limiter is None:
+            _shared_limiter = RateLimiter()
+
+        return _shared_limiter
+
+
+def get_shared_breaker() -> CircuitBreaker:
+    """
+    Return the circuit breaker shared by all clients of the process.
+    """
+    global _shared_breaker
+
+    with _shared_lock:
+        if _shared_breaker is None:
+            _shared_breaker = CircuitBreaker()
+
+        return _shared_breaker
+
+
+class ThrottledSession(object):
+    """
+    Session wrapper applying a rate limiter and a circuit breaker.
+
+    Overload responses (see OVERLOAD_STATUS_CODES) and connection errors make the limiter back off
+    and count as failures of the breaker. While the circuit is open, and when a request fails, the
+    last good response of the same request (URL, headers and cookies) is served. Without one,
+    CircuitOpenError is raised.
+
+    A wrapped SessionPool retries connection errors only, overload responses are left to this layer
+    so every upstream request is charged to the limiter and counted by the breaker.
+
+    By default, the limiter and breaker are shared by all clients of the process, so all windows
+    use one request budget.
+    """
+    def __init__(
+        self,
+        session: Any,
+        limiter: Optional[RateLimiter] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        maxsize: int = 256
+    ):
+        """
+        Constructor of the ThrottledSession class.
+
+        :param session: The session sending the requests, e.g. a SessionPool
+        :param limiter: A RateLimiter instance. If None, the shared limiter of the process is used.
+        :param breaker: A CircuitBreaker instance. If None, the shared breaker of the process is used.
+        :param maxsize: Maximum number of URLs whose last good response is kept
+        """
+        self.session = session
+        self.limiter = limiter if limiter is not None else get_shared_limiter()
+        self.breaker = breaker if breaker is not None else get_shared_breaker()
+
+        self.maxsize = maxsize
+
+        # Status retries below the limiter would multiply the load on an overloaded server.
+        inner = session
+        while inner is not None:
+            if isinstance(inner, SessionPool):
+                inner.disable_status_retries()
+                break
+            inner = getattr(inner, "session", None)
+
+        self.__last_good: "collections.OrderedDict[str, requests.models.Response]" = collections.OrderedDict()
+        self.__lock = threading.Lock()
+        self.served_stale = 0
+
+    def close(self) -> None:
+        self.session.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(
+            self.session.get_stats(),
+            circuit=self.breaker.state,
+            served_stale=self.served_stale,
+            **self.limiter.get_stats()
+        )
+
+    def __serve_last_good(self, key: str, error: Optional[Exception] = None, response: Optional[requests.models.Response] = None) -> requests.models.Response:
+        """
+        Return the last good response of the key. Without one, raise the error or return the given response.
+        """
+        with self.__lock:
+            last_good = self.__last_good.get(key)
+
+            if last_good is not None:
+                self.served_stale += 1
+                return last_good
+
+        if error is not None:
+            raise error
+
+        return response
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.models.Response:
+        """
+        Send a request through the wrapped session, unless the circuit is open.
+        """
+        key = get_session_key(method, url, kwargs.get("headers"), kwargs.get("cookies"))
+
+        if not self.breaker.allow_request():
+            return self.__serve_last_good(key, CircuitOpenError("Too many failed requests, the circuit is open.", url))
+
+        self.limiter.acquire()
+
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as error:
+            self.limiter.backoff()
+            self.breaker.record_failure()
+            return self.__serve_last_good(key, error)
+        except BaseException:
+            # Any other error also ends a trial request, so the breaker cannot stay half-open.
+            self.breaker.record_failure()
+            raise
+
+        if response.status_code in OVERLOAD_STATUS_CODES:
+            self.limiter.backoff()
+            self.breaker.record_failure()
+
+            return self.__serve_last_good(key, response=response)
+
+        self.limiter.recover()
+        self.breaker.record_success()
+
+        # A streamed response is read by its caller only, it cannot be served again.
+        if response.status_code == 200 and method == "GET" and not kwargs.get("stream"):
+            with self.__lock:
+                self.__last_good[key] = response
+                self.__last_good.move_to_end(key)
+
+                if len(self.__last_good) > self.maxsize:
+                    self.__last_good.popitem(last=False)
+
+        return response
@@ -3,6 +3,15 @@
 '''
 
 import math
+import numpy as np
+
+# Google Maps world coordinates at zoom level 0 (a single tile of 256 pixels)
+CIRCUMFERENCE = 256 * math.pow(2, 0)
+RADIUS = CIRCUMFERENCE / (2 * math.pi)
+FALSE_EASTING = -1.0 * CIRCUMFERENCE / 2.0
+FALSE_NORTHING = CIRCUMFERENCE / 2.0
+
+EARTH_RADIUS = 6372.8  # Earth radius in kilometers
 
 def lngToXWorld(lng):
     """
@@ -11,11 +20,7 @@ def lngToXWorld(lng):
     * @param lng the longitude value
     * @return the x value of the corresponding Google Maps world coordinate
     """
-    tiles = math.pow(2, 0)
-    circumference = 256 * tiles
-    radius = circumference / (2 * math.pi)
-    falseEasting = -1.0 * circumference / 2.0
-    return (radius * math.radians(lng)) - falseEasting
+    return (RADIUS * math.radians(lng)) - FALSE_EASTING
 
 def latToYWorld(lat):
     """
@@ -24,16 +29,12 @@ def latToYWorld(lat):
     * @param lat the latitude value
     * @return the y value of the corresponding Google Maps world coordinate
     """
-    tiles = math.pow(2, 0)
-    circumference = 256 * tiles
-    radius = circumference / (2 * math.pi)
-    falseNorthing = circumference / 2.0
     #return ((radius / 2.0 * math.log((1.0 + math.sin(math.radians(lat)))\
     #        / (1.0 - math.sin(math.radians(lat))))) - falseNorthing)\
     #        * -1
     sinradLat = math.sin(math.radians(lat))
-    return ((radius / 2.0 * math.log((1.0 + sinradLat) / (1.0 - sinradLat))) \
-            - falseNorthing) * -1
+    return ((RADIUS / 2.0 * math.log((1.0 + sinradLat) / (1.0 - sinradLat))) \
+            - FALSE_NORTHING) * -1
 
 def worldToPixel(xWorld, yWorld, zoomLevel):
     """
@@ -68,12 +69,8 @@ def xWorldToLng(xWorld):
     * @param xWorld the x value of the world coordinate
     * @return the longitude value
     """
-    tiles = math.pow(2, 0)
-    circumference = 256 * tiles
-    radius = circumference / (2 * math.pi)
-    falseEasting = -1.0 * circumference / 2.0
-    #return (radius * math.radians(lng)) - falseEasting
-    return math.degrees((xWorld + falseEasting) / radius)
+    #return (RADIUS * math.radians(lng)) - FALSE_EASTING
+    return math.degrees((xWorld + FALSE_EASTING) / RADIUS)
 
 def yWorldToLat(yWorld):
     """
@@ -82,14 +79,10 @@ def yWorldToLat(yWorld):
     * @param yWorld the y value of the corresponding Google Maps world coordinate
     * @return the latitude value
     """
-    tiles = math.pow(2, 0)
-    circumference = 256 * tiles
-    radius = circumference / (2 * math.pi)
-    falseNorthing = circumference / 2.0
     #sinradLat = math.sin(math.radians(lat))
     #return ((radius / 2.0 * math.log((1.0 + sinradLat) / (1.0 - sinradLat))) \
     #        - falseNorthing) * -1
-    t_ = math.exp(((yWorld * -1) + falseNorthing) * 2 / radius)
+    t_ = math.exp(((yWorld * -1) + FALSE_NORTHING) * 2 / RADIUS)
     return math.degrees(math.asin(-1 * (1 - t_) / (1 + t_)))
 
 def pixelToWorld(x, y, zoomLevel):
@@ -128,7 +121,7 @@ def haversine(latlng1, latlng2):
     * @param latlng2 the first latlong coordinate (tuple of (lat,lng)
     * @return the distance in km
     """
-    R = 6372.8  # Earth radius in kilometers
+    R = EARTH_RADIUS
     
     dLat = math.radians(latlng2[0] - latlng1[0])
     dLon = math.radians(latlng2[1] - latlng1[1])
@@ -139,3 +132,116 @@ def haversine(latlng1, latlng2):
     c = 2 * math.asin(math.sqrt(a))
     
     return R * c
+
+#---- array functions ----#
+# counterparts of the functions above for NumPy arrays (or sequences) of coordinates,
+# projecting whole trails or snapshots in one call, results are the same as the scalar path
+
+def lngToXWorldArray(lng):
+    """
+    * Converts longitude values to x values of the Google Maps world coordinate.
+    *
+    * @param lng array of longitude values
+    * @return array of x values
+    """
+    return RADIUS * np.radians(lng) - FALSE_EASTING
+
+def latToYWorldArray(lat):
+    """
+    * Converts latitude values to y values of the Google Maps world coordinate.
+    *
+    * @param lat array of latitude values
+    * @return array of y values
+    """
+    sinradLat = np.sin(np.radians(lat))
+    return (RADIUS / 2.0 * np.log((1.0 + sinradLat) / (1.0 - sinradLat)) - FALSE_NORTHING) * -1
+
+def worldToPixelArray(xWorld, yWorld, zoomLevel):
+    """
+    * Converts world coordinates to the pixel coordinates corresponding to the given zoom level.
+    *
+    * @param xWorld array of x values of the world coordinate
+    * @param yWorld array of y values of the world coordinate
+    * @param zoomLevel the zoom level
+    * @return the pixel coordinates as integer arrays (x, y)
+    """
+    zoom = math.pow(2, zoomLevel)
+    # np.rint rounds half to even like round()
+    return np.rint(xWorld * zoom).astype(np.int64), np.rint(yWorld * zoom).astype(np.int64)
+
+def latlngToPixelArray(lat, lng, zoom):
+    """
+    * Converts latlong coordinates to the pixel coordinates corresponding to the given zoom level.
+    *
+    * @param lat array of latitude values
+    * @param lng array of longitude values
+    * @param zoom the zoom level
+    * @return the pixel coordinates as integer arrays (x, y)
+    """
+    return worldToPixelArray(lngToXWorldArray(lng), latToYWorldArray(lat), zoom)
+
+def pixelToLatlngArray(x, y, zoom):
+    """
+    * Converts pixel coordinates corresponding a given zoom level to latlong coordinates.
+    *
+    * @param x array of x values of the pixel coordinate
+    * @param y array of y values of the pixel coordinate
+    * @param zoom the zoom level
+    * @return the latlong coordinates as arrays (lat, lng)
+    """
+    zoomFactor = math.pow(2, zoom)
+    xWorld = np.asarray(x, dtype=np.float64) / zoomFactor
+    yWorld = np.asarray(y, dtype=np.float64) / zoomFactor
+    t_ = np.exp(((yWorld * -1) + FALSE_NORTHING) * 2 / RADIUS)
+    return np.degrees(np.arcsin(-1 * (1 - t_) / (1 + t_))), np.degrees((xWorld + FALSE_EASTING) / RADIUS)
+
+def haversineArray(lat1, lng1, lat2, lng2):
+    """
+    * Haversine algorithm to compute the distances between locations, arguments are broadcast
+    * (e.g. a single location against arrays of locations)
+    *
+    * @param lat1, lng1 the first latlong coordinates
+    * @param lat2, lng2 the second latlong coordinates
+    * @return array of distances in km
+    """
+    lat1, lng1, lat2, lng2 = (np.radians(v) for v in (lat1, lng1, lat2, lng2))
+    a = np.sin((lat2 - lat1) / 2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2)**2
+    return EARTH_RADIUS * 2 * np.arcsin(np.sqrt(a))
+
+
+if __name__ == '__main__':
+    # benchmark of the scalar functions against the array functions
+    # usage: python coords.py [points]
+    import sys
+    import time
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    rng = np.random.default_rng(0)
+    lat, lng = rng.uniform(-80, 80, n), rng.uniform(-180, 180, n)
+    latList, lngList = lat.tolist(), lng.tolist()
+    zoom = 10
+
+    def measure(name, function, repeat=5):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            result = function()
+        elapsed = (time.perf_counter() - start) / repeat
+        print(f'{name:<24} {elapsed*1000:>9.2f} ms')
+        return elapsed, result
+
+    print(f'{n} points')
+    for name, scalar, array in [
+        ('latlngToPixel',
+            lambda: [latlngToPixel((a, b), zoom) for a, b in zip(latList, lngList)],
+            lambda: latlngToPixelArray(lat, lng, zoom)),
+        ('pixelToLatlng',
+            lambda: [pixelToLatlng((a, b), zoom) for a, b in zip(latList, lngList)],
+            lambda: pixelToLatlngArray(lat, lng, zoom)),
+        ('haversine',
+            lambda: [haversine((52.5, 13.4), (a, b)) for a, b in zip(latList, lngList)],
+            lambda: haversineArray(52.5, 13.4, lat, lng)),
+    ]:
+        t1, r1 = measure(name, scalar)
+        t2, r2 = measure(name + 'Array', array)
+        same = np.allclose(np.array(r1, dtype=np.float64).reshape(n, -1), np.column_stack(r2) if isinstance(r2, tuple) else r2.reshape(n, -1))
+        print(f'{"":<24} {t1/t2:>9.1f}x faster, same results: {same}')
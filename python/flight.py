@@ -8,6 +8,7 @@ from coords import *
 from helper import ft2km, kts2kmh, hsv2rgb
 import tkinter as tk
 from threading import Thread
+import time
 from followFlight import FollowFlight
 import numpy as np
 
@@ -17,9 +18,11 @@ def _rotate(matrix, degrees):
     return np.matmul(matrix, m_rot)
 
 class Flight(object):
-  def __init__(self, tk_root, fr_api:FlightRadar24API, canvas:tk.Canvas, maxFlightAge=900, centerview=True):
+  def __init__(self, tk_root, fr_api:FlightRadar24API, canvas:tk.Canvas, maxFlightAge=900, centerview=True, airports=None, aio_api=None):
     self.tk = tk_root
     self.fr_api = fr_api
+    self.aio_api = aio_api     # optional AsyncFlightRadar24API, details are then requested without blocking
+    self.airports = airports   # optional AirportCatalog, names without details
     self.C = canvas
     self.past_loc = dict()
     self.past_alt = dict()
@@ -39,6 +42,43 @@ class Flight(object):
     self.last_ts = -1
     self.last_ping = -1
     self.history_loaded = False
+    self.details = None        # flight details received, not yet applied
+    self.detailsPending = False
+    self.lastFlight = None
+    self.removed = False
+
+  def remove(self):
+    ''' cleanup for good, details still arriving are ignored '''
+    self.removed = True
+    self.cleanup()
+
+  def requestDetails(self, fl):
+    ''' request flight details and trail history, the flight is drawn again once they arrive '''
+    if self.detailsPending:
+      return
+    if self.aio_api is None:
+      try:
+        self.details = self.fr_api.get_flight_details(fl)
+      except Exception as e:
+        # request refused or failed (e.g. circuit open), retried on the next update
+        pass
+      return
+    self.detailsPending = True
+    self.aio_api.submit(self.aio_api.get_flight_details(fl), self._detailsReceived, self._detailsFailed)
+
+  def _detailsReceived(self, details):
+    self.detailsPending = False
+    if self.removed:
+      return
+    self.details = details
+    # draw again with the trail history and about content
+    if self.lastFlight is not None:
+      self.last_ts = -1
+      self.update(self.lastFlight, int(time.time()))
+
+  def _detailsFailed(self, error):
+    # request refused or failed (e.g. circuit open), retried on the next update
+    self.detailsPending = False
 
   def cleanup(self):
     for o in self.objects:
@@ -91,10 +131,21 @@ class Flight(object):
       destination_airport_name = fl.destination_airport_name
     except:
       destination_airport_name = "N/A"
+    if origin_airport_name == "N/A":
+      origin_airport_name = self.getAirportName(fl.origin_airport_iata)
+    if destination_airport_name == "N/A":
+      destination_airport_name = self.getAirportName(fl.destination_airport_iata)
     self.about = f"{airline_name} ({aircraft_info})\n"\
       f"\u2190 {origin_airport_name}\n"\
       f"\u2192 {destination_airport_name}"
 
+  def getAirportName(self, code):
+    ''' airport name from the local catalog, no network request '''
+    if self.airports is None or not code or code == "N/A":
+      return "N/A"
+    airport = self.airports.get_airport(code)
+    return airport.name if airport is not None else "N/A"
+
   def update(self, fl, now) -> None:
     # get flight attributes
     id  = fl.id
@@ -110,6 +161,7 @@ class Flight(object):
     if ts == self.last_ts:
       # no new data, leave update
       return
+    self.lastFlight = fl
 
     # location conversions
     sx, sy = latlngToPixel((lat,lng), self.zoom)
@@ -136,8 +188,12 @@ class Flight(object):
     ts_ = -1
     if sx >= -self.xSize/8 and sx < 9*self.xSize/8 and \
        sy >= -self.ySize/8 and sy < 9*self.ySize/8:
-      if not self.history_loaded:
-        details = self.fr_api.get_flight_details(fl)
+      if not self.history_loaded and self.details is None:
+        # requested without blocking, the details are applied when they arrive
+        self.requestDetails(fl)
+      if not self.history_loaded and self.details is not None:
+        details = self.details
+        self.details = None
         # FIXME: weird API loop, still required here??
         fl.set_flight_details(details)
         self.update_about_content(fl, details)
@@ -152,19 +208,22 @@ class Flight(object):
           self.past_loc = dict()
           self.past_alt = dict()
           trail_details = sorted(trail_details, key=lambda x: x['ts'])
+          # project the whole trail at once
+          trail_x, trail_y = latlngToPixelArray(
+            np.array([trail['lat'] for trail in trail_details], dtype=np.float64),
+            np.array([trail['lng'] for trail in trail_details], dtype=np.float64), self.zoom)
+          # move flight pixel positions into centered output window
+          trail_x = (trail_x + self.off_x).tolist()
+          trail_y = (trail_y + self.off_y).tolist()
           
-          for trail in trail_details:
+          for trail, sx_, sy_ in zip(trail_details, trail_x, trail_y):
             ts_ = trail['ts']
             if ts_ not in self.past_loc and ts_ > now - self.maxFlightAge:
-              sx_, sy_ = latlngToPixel((trail['lat'],trail['lng']), self.zoom)
-              # move flight pixel position into centered output window
-              sx_ += self.off_x
-              sy_ += self.off_y
               if sx_ >= -self.xSize/8 and sx_ < 9*self.xSize/8 and \
                  sy_ >= -self.ySize/8 and sy_ < 9*self.ySize/8:
                 self.past_loc[ts_] = (sx_, sy_)
                 self.past_alt[ts_] = ft2km(trail['alt'])
-        self.history_loaded = True
+        self.history_loaded = bool(details)
           
       # TODO: remove actual position when trail details are updated, this position may 
       # likely not be part of the trail history, for now, no updates are executed
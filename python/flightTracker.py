@@ -2,13 +2,27 @@
 
 from configparser import ConfigParser
 from FlightRadar24_patch.api import FlightRadar24API
+from FlightRadar24_patch.core import Core
+from FlightRadar24_patch.aio import AsyncFlightRadar24API
+from FlightRadar24_patch.catalog import AirportCatalog
+from FlightRadar24_patch.coalesce import CoalescingSession
+from FlightRadar24_patch.differ import SnapshotDiffer
+from FlightRadar24_patch.geodesy import HomeGeodesy
+from FlightRadar24_patch.reference import ReferenceDataCache
+from FlightRadar24_patch.replay import FeedRecorder, ReplaySession
+from FlightRadar24_patch.session import SessionPool
+from FlightRadar24_patch.throttle import ThrottledSession
 from sprites import Sprites
 from flight import Flight
 from tiles import Tiles
+from googlemaps import GoogleMapsAPI
+from wettercom import WetterComAPI
 from coords import *
 from helper import Dict2Class
+from threading import Thread
+from tkinter import simpledialog
 import tkinter as tk
-import time
+import time, os
 
 class FlightTracker(tk.Tk):
   def __init__(self) -> None:
@@ -32,16 +46,48 @@ class FlightTracker(tk.Tk):
     self.localeCountry = 'GB'
     self.enableRadar = False
     self.enableClouds = False
+    # optional recording or offline replay of FlightRadar24 responses
+    self.recordFile = None
+    self.replayFile = None
+    self.replaySpeed = 1.0
+    # optional base URL replacing all online services, e.g. the local mock server
+    self.baseUrl = None
+    # draw airports of the local catalog
+    self.showAirports = False
+    # list flights passing closer than approachDistance (km) within approachTime (s)
+    self.showApproaching = True
+    self.approachDistance = 3.0
+    self.approachTime = 600
     self.loadConfig()
 
+    if self.baseUrl:
+      Core.set_base_urls(**{name: self.baseUrl for name in Core.get_base_urls()})
+      GoogleMapsAPI.setBaseUrl(self.baseUrl, cacheRoot=os.path.join('cache', 'mock'))
+      WetterComAPI.setBaseUrl(self.baseUrl, cacheRoot=os.path.join('cache', 'mock'))
+
     # FlightRadar24 API
-    self.fr_api = FlightRadar24API()
+    session = None
+    if self.replayFile:
+      session = ReplaySession(self.replayFile, speed=self.replaySpeed, loop=True)
+    elif self.recordFile:
+      session = CoalescingSession(ThrottledSession(FeedRecorder(SessionPool(), self.recordFile)))
+    cacheRoot = os.path.join('cache', 'mock') if self.baseUrl else 'cache'
+    self.fr_api = FlightRadar24API(session=session, reference_cache=ReferenceDataCache(os.path.join(cacheRoot, 'reference')))
     self.fr_api.set_flight_tracker_config(vehicles=0)
+    # non-blocking access to the same API, results are dispatched into the Tk thread
+    self.aio_api = AsyncFlightRadar24API(self.fr_api)
+    # local airport catalog, loaded from disk and refreshed in the background when outdated
+    self.airports = AirportCatalog(os.path.join(cacheRoot, 'airports'))
+    self.airportsDrawn = False
+    thread = Thread(target=self.updateAirports, daemon=True)
+    thread.start()
 
     # compute pixel position of home location
     self.homeX, self.homeY = latlngToPixel(self.home, self.zoom)
     # get configuration depending boundaries
     self.bounds = self.getBounds()
+    # distances and closest approaches of all flights relative to home
+    self.geodesy = HomeGeodesy(*self.home)
     
     # load sprites
     self.sprites = Sprites()
@@ -66,6 +112,7 @@ class FlightTracker(tk.Tk):
     # trails
     self.trails = dict()
     self.flights = dict()
+    self.differ = SnapshotDiffer()   # only added/updated flights are processed per tick
 
     # draw radar
     radarColor = '#222222'
@@ -89,15 +136,53 @@ class FlightTracker(tk.Tk):
     self.bind('<KeyPress>', self.onKey)
     self.update()
     self.C.after(0,self._update)
+    self.C.after(0,self._dispatch)
     self.fullscreen = False
     self.bind('<F12>', self.toggleFullscreen)
     #self.geometrySave = None
 
   def getBounds(self):
     distX, distY = (self.mapGrid[0]+1.5)/2 * self.tileSize, (self.mapGrid[1]+1.5)/2 * self.tileSize
-    boundTL = pixelToLatlng((self.homeX-distX, self.homeY-distY), self.zoom)
-    boundBR = pixelToLatlng((self.homeX+distX, self.homeY+distY), self.zoom)
-    return f'{boundTL[0]:.6f},{boundBR[0]:.6f},{boundTL[1]:.6f},{boundBR[1]:.6f}'
+    # top left and bottom right corners in one call
+    lat, lng = pixelToLatlngArray((self.homeX-distX, self.homeX+distX), (self.homeY-distY, self.homeY+distY), self.zoom)
+    return f'{lat[0]:.6f},{lat[1]:.6f},{lng[0]:.6f},{lng[1]:.6f}'
+
+  def updateAirports(self):
+    ''' refresh the airport catalog when outdated, runs in a background thread '''
+    try:
+      self.airports.update(self.fr_api)
+    except Exception as e:
+      print(f"updateAirports(): airport catalog not available: {e}")
+
+  def drawAirports(self):
+    ''' draw the airports of the catalog within the bounds, below the flights '''
+    color = '#888888'
+    airports = self.airports.in_bounds(self.bounds)
+    if not airports:
+      self.airportsDrawn = True
+      return
+    xs, ys = latlngToPixelArray([airport.latitude for airport in airports], [airport.longitude for airport in airports], self.zoom)
+    xs = (xs + self.xSize//2 - self.homeX).tolist()
+    ys = (ys + self.ySize//2 - self.homeY).tolist()
+    for airport, x, y in zip(airports, xs, ys):
+      self.C.create_rectangle([x-3,y-3,x+3,y+3], outline=color, tags='airport')
+      self.C.create_text(x, y+5, text=airport.iata or airport.icao, fill=color, anchor=tk.N, font=('Arial', 8), tags='airport')
+    self.airportsDrawn = True
+
+  def drawApproaching(self, flights):
+    ''' list the flights approaching overhead, ordered by time to closest approach '''
+    self.C.delete('approaching')
+    if not flights:
+      return
+    approaching = self.geodesy.get_approaching(flights, self.approachDistance, self.approachTime)
+    lines = list()
+    for row in approaching[:5]:
+      fl = flights[row['index']]
+      t = int(row['cpa_time'])
+      lines.append(f"{fl.callsign:<8} {row['distance']:5.1f} km  CPA {row['cpa_distance']:4.1f} km in {t//60}:{t%60:02d}")
+    if lines:
+      self.C.create_text(8, 8, text='\n'.join(['Approaching overhead'] + lines), anchor=tk.NW,
+                         font=('Courier', 9), fill='gray10', tags='approaching')
 
   def toggleFullscreen(self, event):
     ''' Fullscreen toggle magic, too fuzzy for now to be active '''
@@ -160,6 +245,28 @@ class FlightTracker(tk.Tk):
         self.enableRadar = config.getboolean(app,'enableRainRadar')
       if 'enableCloudRadar' in config[app]:
         self.enableClouds = config.getboolean(app,'enableCloudRadar')
+      if 'showAirports' in config[app]:
+        self.showAirports = config.getboolean(app,'showAirports')
+      if 'showApproaching' in config[app]:
+        self.showApproaching = config.getboolean(app,'showApproaching')
+      if 'approachDistance' in config[app]:
+        self.approachDistance = config.getfloat(app,'approachDistance')
+      if 'approachTime' in config[app]:
+        self.approachTime = config.getint(app,'approachTime')
+
+    # record or replay FlightRadar24 responses
+    if 'FlightRadar24' in config:
+      if 'record' in config['FlightRadar24']:
+        self.recordFile = config['FlightRadar24']['record']
+      if 'replay' in config['FlightRadar24']:
+        self.replayFile = config['FlightRadar24']['replay']
+      if 'replaySpeed' in config['FlightRadar24']:
+        self.replaySpeed = config.getfloat('FlightRadar24','replaySpeed')
+
+    # redirect online services
+    if 'Endpoints' in config:
+      if 'baseUrl' in config['Endpoints']:
+        self.baseUrl = config['Endpoints']['baseUrl']
 
   def onKey(self, event):
     if event.char == 'c':
@@ -169,12 +276,39 @@ class FlightTracker(tk.Tk):
       self.tiles.toggleRadar()
       self.tiles.update(self.homeX, self.homeY, self.zoom, force=True)
       self.homeRadarIndex = self.tiles.homeRadarIndex
+    elif event.char == 'f':
+      self.findFlight()
+
+  def findFlight(self):
+    ''' find a flight by callsign, flight number or registration and follow it '''
+    query = simpledialog.askstring("Find flight", "Callsign, flight number or registration:", parent=self)
+    if query:
+      # answered by the local search index, the remote search is only requested for misses
+      self.aio_api.submit(self.aio_api.search(query, 10), self._followFound, lambda error: None)
+
+  def _followFound(self, results):
+    for result in results.get('live', list()):
+      if result['id'] in self.flights:
+        self.flights[result['id']].onButton(result['id'])
+        return
+    print(f"findFlight(): no tracked flight found: {[r.get('label') for rs in results.values() for r in rs]}")
 
   def getFlightsData(self):
-      try:
-          return self.fr_api.get_flights(bounds=self.bounds)
-      except:
-          return list()
+      ''' request local flights in sight without blocking, processed by _processFlights() '''
+      self.aio_api.submit(self.aio_api.get_flights(bounds=self.bounds),
+                          self._processFlights, self._flightsFailed)
+
+  def _flightsFailed(self, error):
+    ''' keep the flights of the last tick on a failed request, as if nothing changed, and try again next tick '''
+    print(f"getFlightsData(): flights not available: {error}")
+    self.schedule()
+
+  def _dispatch(self):
+    ''' hand over finished FlightRadar24 requests to the Tk thread '''
+    try:
+      self.aio_api.dispatch()
+    finally:
+      self.C.after(20, self._dispatch)
 
   def _update(self):
 
@@ -187,16 +321,25 @@ class FlightTracker(tk.Tk):
       self.homeRadarIndex = self.tiles.homeRadarIndex
       self.tileTs = tilets_
 
-    # get local flights in sight
-    flights = self.getFlightsData()
+    # draw nearby airports once the catalog is available
+    if self.showAirports and not self.airportsDrawn and len(self.airports):
+      self.drawAirports()
+
+    # get local flights in sight, the tick continues in _processFlights()
+    self.getFlightsData()
+
+  def _processFlights(self, flights):
+    now = int(time.time())
 
-    # cycle through all flights
-    flight_ids = list()
-    for fl in flights:
+    # cycle through all added or updated flights, unchanged ones keep their drawing
+    delta = self.differ.diff(flights)
+    flight_ids = set(delta.unchanged)
+    changed = delta.added + delta.updated
+    for i, fl in enumerate(changed):
       id = fl.id
       if id not in self.flights:
         # create flight object
-        self.flights[id] = Flight(self.tk, self.fr_api, self.C, maxFlightAge=self.maxFlightAge, centerview=True)
+        self.flights[id] = Flight(self.tk, self.fr_api, self.C, maxFlightAge=self.maxFlightAge, centerview=True, airports=self.airports, aio_api=self.aio_api)
         # define drawing offset
         self.flights[id].init_offsets(self.xSize//2 - self.homeX, self.ySize//2 - self.homeY)
         self.flights[id].init_sprites(self.sprites)
@@ -206,22 +349,27 @@ class FlightTracker(tk.Tk):
       self.flights[id].update(fl, now)
 
       # check maximum processing period
-      delta = int((self.timestep-(time.time()-self.now))*1000)
-      if delta < 50:
-        # loop takes too long, breaking up here for now
+      delta_ms = int((self.timestep-(time.time()-self.now))*1000)
+      if delta_ms < 50:
+        # loop takes too long, breaking up here for now, left flights are reported again next tick
+        self.differ.forget(fl.id for fl in changed[i+1:])
         break
 
-      flight_ids.append(id)
+      flight_ids.add(id)
       #self.trails[id].update()
     # END cycle through all flights
 
+    if self.showApproaching:
+      self.drawApproaching(flights)
+
     # lift all plane icons, update old flights
     for id in list(self.flights.keys()):
       if now - self.flights[id].last_seen() > self.maxFlightAge:
         # delete flight if no new data arrived for more than 5 minutes
         # reason: either out of range or landed
-        self.flights[id].cleanup()
+        self.flights[id].remove()
         del self.flights[id]
+        self.differ.forget([id])
       else:
         if id not in flight_ids:
           # update all trails that were not recently updated
@@ -230,14 +378,21 @@ class FlightTracker(tk.Tk):
           # lift all plane and detail objects
           self.flights[id].lift_plane()
 
-    # update window title
+    # update window title, the radar index is available once the home tile is loaded
+    self.homeRadarIndex = self.tiles.homeRadarIndex
     title = f"Flight Tracker - Tracked flights:{len(self.flights)}"
     if self.tiles.enableRadar:
        title += f" - Rain Index:{self.homeRadarIndex}"
     if self.tiles.enableClouds:
        title += " - C"
+    circuit = self.fr_api.get_session_stats().get("circuit")
+    if circuit and circuit != "closed":
+       title += f" - Feed {circuit}"
     self.title(title)
 
+    self.schedule()
+
+  def schedule(self):
     # periodic updates, find remaining delta to configured timestep
     delta_ms = int((self.timestep-(time.time()-self.now))*1000)
     if delta_ms < 10:
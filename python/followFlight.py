@@ -3,6 +3,7 @@
 '''
 
 from FlightRadar24_patch.api import FlightRadar24API
+from FlightRadar24_patch.aio import AsyncFlightRadar24API
 from configparser import ConfigParser
 from hover import CanvasToolTip
 from sprites import Sprites
@@ -34,6 +35,7 @@ class FollowFlight:
     self.tileSize = 256   # must remain fixed by now
     self.centerview = True
     self.maxtrail = 100
+    self.mosaic = False   # render the tile grid as one canvas image
 
     # config loader, overriding defaults where available
     self.localeLang = 'en'
@@ -51,6 +53,7 @@ class FollowFlight:
     self.flight = None
     self.flight_icao = None
     self.fr_api = None
+    self.aio_api = None
     self.sa_api = None
     self.iss_api = None
     self.iss_mode = False
@@ -70,6 +73,8 @@ class FollowFlight:
     else:
       self.flight = flight
       self.fr_api = fr_api if fr_api else FlightRadar24API()
+      # non-blocking access to the API, results are dispatched into the Tk thread
+      self.aio_api = AsyncFlightRadar24API(self.fr_api, max_workers=2)
       self.saveHistory = saveHistory
 #      self.timestep = 3.2         ;# in seconds
       self.timestep = 2.0         ;# in seconds
@@ -91,7 +96,7 @@ class FollowFlight:
                        height=self.tileSize*self.mapGrid[1])
     self.C.pack()
 
-    self.tiles = Tiles(self.C, self.tileSize, self.mapGrid, self.mapTiles, self.zoom, self.home, self.centerview)   # tileSize is 256!
+    self.tiles = Tiles(self.C, self.tileSize, self.mapGrid, self.mapTiles, self.zoom, self.home, self.centerview, mosaic=self.mosaic)   # tileSize is 256!
     self.tiles.enableRadar = self.enableRadar
     self.tiles.enableClouds = self.enableClouds
     self.tiles.setLocale(self.localeLang, self.localeCountry)
@@ -112,11 +117,17 @@ class FollowFlight:
     # start periodic update cycles
     self.top.bind('<KeyPress>', self.onKey)
     self.C.after(0,self._update)
+    if self.aio_api:
+      self.C.after(0,self._dispatch)
     self.is_alive = True
 
   def _destroy(self):
     # try to close both: toplevel window and Followflight class to prevent more updates in undefined states
     self.is_alive = False
+    if self.aio_api:
+      self.aio_api.close()
+    # release tile workers and caches of this window
+    self.tiles.close()
     try:
       self.top.destroy()
     except:
@@ -161,6 +172,8 @@ class FollowFlight:
         self.centerview = config.getboolean(app,'centerview')
       if 'maxtrail' in config[app]:
         self.maxtrail = config.getint(app,'maxtrail')
+      if 'mosaic' in config[app]:
+        self.mosaic = config.getboolean(app,'mosaic')
       if 'enableRainRadar' in config[app]:
         self.enableRadar = config.getboolean(app,'enableRainRadar')
       if 'enableCloudRadar' in config[app]:
@@ -176,11 +189,19 @@ class FollowFlight:
       self.tiles.toggleRadar()
       self.tiles.update(self.latitude, self.longitude, self.zoom, force=True)
 
-  def getFlightsData(self, bounds):
+  def getFlightsData(self, bounds, callback):
+    ''' request the followed flight within bounds without blocking, the flights are passed to callback() '''
+    self.aio_api.submit(self.aio_api.get_flights(bounds=bounds, flight_id=self.flight),
+                        callback, lambda error: callback(list()))
+
+  def _dispatch(self):
+    ''' hand over finished FlightRadar24 requests to the Tk thread '''
+    if not self.is_alive:
+      return
     try:
-      return self.fr_api.get_flights(bounds=bounds, flight_id=self.flight)
-    except:
-      return list()
+      self.aio_api.dispatch()
+    finally:
+      self.C.after(20, self._dispatch)
 
   def visualize(self, f, details={}):
     alt = f.altitude
@@ -305,53 +326,71 @@ class FollowFlight:
         print(f"Flight details saved to file '{filename}'")
 
   def getLatestLoc(self, tau=0.01):
+    '''
+    Request the latest location without blocking, the bounds are widened until the flight is found.
+    The tick continues in _processLoc().
+    '''
     lat,lng = self.past_loc
     bounds=f"{lat+tau:.3f},{lat-tau:.3f},{lng-tau:.3f},{lng+tau:.3f}"
     if tau < 0:
+      # one request suffices: the flight is passed as "selected" and thus never truncated from the response,
+      # a RegionScanner would fetch every flight of the world to find it
       bounds="77.879,-77.88,-180,180"
 
-    found = False
-    for f in self.getFlightsData(bounds):
+    self.getFlightsData(bounds, lambda flights: self._processLoc(flights, tau))
+
+  def _processLoc(self, flights, tau):
+    for f in flights:
       if f.id == self.flight:
-        found = True
-        lat = f.latitude
-        lng = f.longitude
-        ts  = f.time
-        self.flight_icao = f.icao_24bit
-
-        # update skyaware if available
-        if self.sa_api and self.flight_icao and self.past_details is not None:
-          sa_data = self.update_sa(self.flight_icao)
-          if sa_data is not None and sa_data[0] > ts + 0.11:
-            ts, lat, lng = sa_data
-            #print("SA",self.flight_icao,lat,lng,sa_data[0])
-
-        details = self.fr_api.get_flight_details(f)
-        f.set_flight_details(details)
-
-        # skip identical flight data
-        if self.past_loc != (lat,lng):
-          self.trails.new((ts,lat,lng))
-          self.visualize(f, details)
-        
-        # store details
-        self.past_details = details
-
-        # update window icon (aircraft icon and heading)
-        self.top.wm_iconphoto(False, self.iconImage)
+        # details and skyaware position are requested on the worker threads as well
+        self.aio_api.submit(self.aio_api.run_blocking(self.getDetails, f),
+                            self._showLoc, lambda error: self._finishUpdate(False))
+        return
 
-    if not found:
-      if tau < 0:
-        #print("Object not found within bounds", bounds)
-        ok = False
-      elif tau < 10:
-        ok = self.getLatestLoc(tau=tau*8)
-      else:
-        ok = self.getLatestLoc(tau=-1)
+    if tau < 0:
+      #print("Object not found within bounds", bounds)
+      self._finishUpdate(False)
+    elif tau < 10:
+      self.getLatestLoc(tau=tau*8)
     else:
-      ok = found
+      self.getLatestLoc(tau=-1)
+
+  def getDetails(self, f):
+    ''' worker job: flight details and latest location of a found flight '''
+    lat = f.latitude
+    lng = f.longitude
+    ts  = f.time
+    self.flight_icao = f.icao_24bit
+
+    # update skyaware if available
+    if self.sa_api and self.flight_icao and self.past_details is not None:
+      sa_data = self.update_sa(self.flight_icao)
+      if sa_data is not None and sa_data[0] > ts + 0.11:
+        ts, lat, lng = sa_data
+        #print("SA",self.flight_icao,lat,lng,sa_data[0])
+
+    details = self.fr_api.get_flight_details(f)
+    f.set_flight_details(details)
+    return f, (ts, lat, lng), details
+
+  def _showLoc(self, result):
+    f, (ts, lat, lng), details = result
+    ok = False
+    try:
+      # skip identical flight data
+      if self.past_loc != (lat,lng):
+        self.trails.new((ts,lat,lng))
+        self.visualize(f, details)
+
+      # store details
+      self.past_details = details
 
-    return ok
+      # update window icon (aircraft icon and heading)
+      self.top.wm_iconphoto(False, self.iconImage)
+      ok = True
+    except:
+      pass
+    self._finishUpdate(ok)
   
   def visualize_iss(self, ts, lat, lng):
     self.zoom = 6 # default ISS zoom
@@ -399,46 +438,53 @@ class FollowFlight:
 
       self.trails.new((ts,lat,lng))
       self.visualize_iss(ts, lat, lng)
+      self.schedule()
 
     else:
+      # the tick continues in _finishUpdate() once the location is received
+      self.getLatestLoc()
+
+  def _finishUpdate(self, ok):
+    details = self.past_details
+    if self.online and not ok and self.saveHistory:
+      self.saveFlightDetails(details)
+    elif not self.online and self.past_details is None:
+      print(f'Flight {self.flight} is offline!')
+      f = Dict2Class(dict(id=self.flight))
+      self.aio_api.submit(self.aio_api.get_flight_details(f), self._offlineDetails, lambda error: None)
+      #sys.exit()
+
+    self.online = ok
+
+    if not ok:
+      callsign = self.setOfflineTitle(details)
+      self.lost_count += 1
+      if self.lost_count >= 10:
+        print(f"Flight '{callsign}' ({self.flight}) turned offline. Bye bye!")
+        return
 
-      ok = False
-      try:
-        ok = self.getLatestLoc()
-#      except Exception as e: # work on python 3.x
-#        print('Error:', str(e))
-      except:
-        pass
+    self.schedule()
+
+  def _offlineDetails(self, details):
+    #self.visualize(f, details)
+    if self.saveHistory:
+      self.saveFlightDetails(details)
+    if not self.online:
+      self.setOfflineTitle(details)
 
-      details = self.past_details
-      if self.online and not ok and self.saveHistory:
-        self.saveFlightDetails(details)
-      elif not self.online and self.past_details is None:
-        print(f'Flight {self.flight} is offline!')
-        f = Dict2Class(dict(id=self.flight))
-        details = self.fr_api.get_flight_details(f)
-        #self.visualize(f, details)
-        if self.saveHistory:
-          self.saveFlightDetails(details)
-        #sys.exit()
-
-      self.online = ok
-
-      if not ok:
-        try:
-          callsign = details['identification']['callsign']
-        except:
-          callsign = "N/A"
-        title = f"Follow Flight - {callsign} - OFFLINE"
-        try:
-          self.top.title(title)
-        except:
-          pass
-        self.lost_count += 1
-        if self.lost_count >= 10:
-          print(f"Flight '{callsign}' ({self.flight}) turned offline. Bye bye!")
-          return
+  def setOfflineTitle(self, details):
+    try:
+      callsign = details['identification']['callsign']
+    except:
+      callsign = "N/A"
+    title = f"Follow Flight - {callsign} - OFFLINE"
+    try:
+      self.top.title(title)
+    except:
+      pass
+    return callsign
 
+  def schedule(self):
     # update every 2 second
     timestep = self.timestep if self.online else self.timestep_lost
 
@@ -2,12 +2,25 @@
   Some helper stuff and conversion functions
 '''
 
+import os, tempfile
+
 class Dict2Class(object):
   ''' Mock a class from a dictionary '''
   def __init__(self, my_dict:dict) -> None:
     for key in my_dict:
       setattr(self, key, my_dict[key])
 
+def writeFileAtomic(filename:str, data:bytes) -> None:
+  ''' write a file under a temporary name and move it into place, concurrent readers never see it half-written '''
+  fd, tmpname = tempfile.mkstemp(dir=os.path.dirname(filename) or '.', suffix='.tmp')
+  try:
+    with os.fdopen(fd, 'wb') as f:
+      f.write(data)
+    os.replace(tmpname, filename)
+  except BaseException:
+    os.remove(tmpname)
+    raise
+
 def ft2km(ft:float) -> float:
   return ft/3280.84
 
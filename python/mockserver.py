@@ -0,0 +1,282 @@
+'''
+    local stand-in server for FlightRadar24, Google Maps tiles and wetter.com radar/cloud images
+
+    Serves synthetic flights, map tiles and radar frames with tunable latency and error rates,
+    so FlightTracker and FollowFlight can be load-tested without network access.
+
+    Usage:
+        python python/mockserver.py --flights 2000 --latency 0.05 --error-rate 0.01
+
+    and point the application to it in config.ini:
+        [Endpoints]
+        baseUrl = http://127.0.0.1:8024
+'''
+
+import argparse, io, json, math, random, re, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from PIL import Image, ImageDraw
+
+AIRCRAFT = ["A320", "A321", "A20N", "B738", "B77W", "A359", "E190", "CRJ9", "A388", "B789"]
+AIRLINES = [("LH", "DLH", "Lufthansa"), ("BA", "BAW", "British Airways"), ("AF", "AFR", "Air France"),
+            ("EW", "EWG", "Eurowings"), ("FR", "RYR", "Ryanair"), ("TK", "THY", "Turkish Airlines")]
+AIRPORTS = [("BER", "EDDB", "Berlin Brandenburg Airport", 52.3667, 13.5033),
+            ("FRA", "EDDF", "Frankfurt Airport", 50.0333, 8.5706),
+            ("MUC", "EDDM", "Munich Airport", 48.3538, 11.7861),
+            ("LHR", "EGLL", "London Heathrow Airport", 51.4700, -0.4543),
+            ("CDG", "LFPG", "Paris Charles de Gaulle Airport", 49.0097, 2.5479),
+            ("IST", "LTFM", "Istanbul Airport", 41.2753, 28.7519)]
+
+
+class SyntheticFleet(object):
+    '''
+    Deterministic synthetic aircraft moving on straight lines inside a square region around a center,
+    wrapping around at its borders.
+    '''
+    def __init__(self, count, center=(52.5162767, 13.3777761), radius=3.0, seed=0):
+        self.center = center
+        self.radius = radius
+        self.start = time.time()
+        rnd = random.Random(seed)
+        self.aircraft = list()
+        for i in range(count):
+            iata, icao, name = rnd.choice(AIRLINES)
+            orig, dest = rnd.sample(AIRPORTS, 2)
+            number = rnd.randint(1, 9999)
+            onGround = rnd.random() < 0.05
+            self.aircraft.append(dict(
+                id=f"{0x30000000+i:08x}",
+                icao24=f"{0x3C0000+i:06X}",
+                lat0=rnd.uniform(-radius, radius),
+                lng0=rnd.uniform(-radius, radius),
+                heading=rnd.randint(0, 359),
+                speed=0 if onGround else rnd.randint(180, 520),
+                altitude=0 if onGround else rnd.randrange(1000, 41000, 100),
+                vspeed=rnd.choice([-1024, 0, 0, 0, 1024]),
+                aircraft=rnd.choice(AIRCRAFT),
+                registration=f"D-A{rnd.randint(0, 17575):04X}",
+                airline=(iata, icao, name),
+                number=f"{iata}{number}",
+                callsign=f"{icao}{number}",
+                origin=orig,
+                destination=dest,
+                onGround=int(onGround),
+            ))
+
+    def position(self, ac, ts):
+        ''' position of an aircraft at a timestamp, speed in knots = nautical miles (1/60 degree) per hour '''
+        dist = ac['speed'] * (ts - self.start) / 3600 / 60
+        hdg = math.radians(ac['heading'])
+        size = 2*self.radius
+        lat = (ac['lat0'] + self.radius + dist*math.cos(hdg)) % size - self.radius + self.center[0]
+        lng = (ac['lng0'] + self.radius + dist*math.sin(hdg)) % size - self.radius + self.center[1]
+        return round(lat, 4), round(lng, 4)
+
+    def row(self, ac, ts):
+        lat, lng = self.position(ac, ts)
+        return [ac['icao24'], lat, lng, ac['heading'], ac['altitude'], ac['speed'], "1000", "F-MOCK",
+                ac['aircraft'], ac['registration'], ts, ac['origin'][0], ac['destination'][0], ac['number'],
+                ac['onGround'], ac['vspeed'], ac['callsign'], 0, ac['airline'][1]]
+
+    def feed(self, bounds=None, limit=5000, selected=None):
+        ts = int(time.time())
+        content = {"full_count": len(self.aircraft), "version": 4}
+        count = 0
+        for ac in self.aircraft:
+            row = self.row(ac, ts)
+            if bounds is not None and ac['id'] != selected:
+                north, south, west, east = bounds
+                if not (south <= row[1] <= north and west <= row[2] <= east):
+                    continue
+            if count >= limit and ac['id'] != selected:
+                continue
+            content[ac['id']] = row
+            count += 1
+        content["stats"] = {"total": {"ads-b": count}}
+        return content
+
+    def details(self, flightId):
+        ac = next((ac for ac in self.aircraft if ac['id'] == flightId), None)
+        if ac is None:
+            return None
+        ts = int(time.time())
+        trail = list()
+        for dt in range(0, 1800, 30):
+            lat, lng = self.position(ac, ts-dt)
+            trail.append(dict(lat=lat, lng=lng, alt=ac['altitude'], spd=ac['speed'], ts=ts-dt, hd=ac['heading']))
+
+        def airport(ap):
+            return dict(name=ap[2], code=dict(iata=ap[0], icao=ap[1]),
+                        position=dict(latitude=ap[3], longitude=ap[4], altitude=0,
+                                      country=dict(name="Mock", code="MK")),
+                        timezone=dict(name="Europe/Berlin", offset=3600, offsetHours="1:00", abbr="CET", abbrName="Central European Time"),
+                        info=dict(terminal=None, baggage=None, gate=None), visible=True, website=None)
+
+        iata, icao, name = ac['airline']
+        return {
+            "identification": {"id": ac['id'], "number": {"default": ac['number']}, "callsign": ac['callsign']},
+            "status": {"live": True, "text": "Estimated", "icon": "green"},
+            "aircraft": {"model": {"code": ac['aircraft'], "text": ac['aircraft']}, "registration": ac['registration'],
+                         "countryId": 1, "age": None, "images": None},
+            "airline": {"name": name, "short": name, "code": {"iata": iata, "icao": icao}},
+            "airport": {"origin": airport(ac['origin']), "destination": airport(ac['destination'])},
+            "time": {"scheduled": {"departure": ts-3600, "arrival": ts+3600},
+                     "real": {"departure": ts-3500, "arrival": None},
+                     "estimated": {"departure": None, "arrival": ts+3500}},
+            "flightHistory": {"aircraft": []},
+            "trail": trail,
+            "firstTimestamp": ts-1800,
+        }
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "FlightTrackerMock/1.0"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def send(self, status, body=b"", contentType="application/json", headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", contentType)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or dict()).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def sendJson(self, content, headers=None):
+        self.send(200, json.dumps(content).encode("utf-8"), headers=headers)
+
+    def sendImage(self, img):
+        buffer = io.BytesIO()
+        img.save(buffer, format="png")
+        self.send(200, buffer.getvalue(), contentType="image/png")
+
+    def do_GET(self):
+        server = self.server
+        if server.latency > 0:
+            time.sleep(server.latency * random.uniform(0.5, 1.5))
+        if random.random() < server.errorRate:
+            self.send(server.errorStatus, b"", contentType="text/plain")
+            return
+
+        parts = urlsplit(self.path)
+        query = {k: v[0] for k, v in parse_qs(parts.query, keep_blank_values=True).items()}
+        path = parts.path
+
+        # count requests per first path segment
+        with server.lock:
+            key = path.split('/')[1]
+            server.requests[key] = server.requests.get(key, 0) + 1
+
+        if path.endswith("/feed.js"):
+            bounds = None
+            if 'bounds' in query:
+                bounds = tuple(float(v) for v in query['bounds'].split(','))
+            limit = int(query.get('limit', 5000))
+            self.sendJson(server.fleet.feed(bounds, limit, query.get('selected')))
+        elif path == "/_json/airports.php":
+            self.sendJson({"version": 0, "rows": [dict(name=name, iata=iata, icao=icao, lat=lat, lon=lng, country="Mock", alt=0)
+                                                  for iata, icao, name, lat, lng in AIRPORTS]})
+        elif path.startswith("/clickhandler"):
+            details = server.fleet.details(query.get('flight'))
+            if details is None:
+                self.send(404, b"{}")
+            else:
+                self.sendJson(details)
+        elif path == "/kh":
+            self.sendImage(server.tile('satellite', int(query['x']), int(query['y']), int(query['z'])))
+        elif path == "/maps/vt":
+            m = re.search(r"!1i(\d+)!2i(\d+)!3i(\d+)", query.get('pb', ''))
+            style = 'roadmap' if '!2sm!' in query.get('pb', '') else 'terrain'
+            z, x, y = (int(v) for v in m.groups())
+            self.sendImage(server.tile(style, x, y, z))
+        elif path.startswith("/status/radar/"):
+            stamp = time.strftime("%Y%m%d%H%M", time.gmtime(int(time.time())//300*300))
+            self.sendJson({"timesteps": [{"tiles": f"radar/composite/{stamp}"}]})
+        elif path.startswith("/radar/") or path.startswith("/nearcast/"):
+            z, x, y = (int(v) for v in path.split('/')[-3:])
+            self.sendImage(server.radar(x, y, z))
+        elif path.startswith("/agt/wetterkarten/tiles/icon_clouds"):
+            ts = int(time.time())//3600*3600
+            date = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(ts))+"+00:00"
+            self.sendJson({"runs": [{"timesteps": [{"date": date, "tile_url": "clouds/{z}/{x}/{y}.png"}]}]})
+        elif path.startswith("/clouds/"):
+            z, x, y = (int(v.split('.')[0]) for v in path.split('/')[-3:])
+            self.sendImage(server.clouds(x, y, z))
+        else:
+            self.send(404, b"{}")
+
+    def do_POST(self):
+        # login is not supported by the mock
+        self.send(403, json.dumps({"success": False, "message": "Not supported by the mock server"}).encode("utf-8"))
+
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, fleet, latency=0.0, errorRate=0.0, errorStatus=503, verbose=False):
+        super().__init__(address, MockHandler)
+        self.fleet = fleet
+        self.latency = latency
+        self.errorRate = errorRate
+        self.errorStatus = errorStatus
+        self.verbose = verbose
+        self.lock = threading.Lock()
+        self.requests = dict()
+
+    def tile(self, style, x, y, z):
+        ''' flat coloured tile with a grid, roadmap tiles are transparent overlays '''
+        colors = dict(satellite=(40, 60, 40, 255), terrain=(200, 210, 190, 255), roadmap=(0, 0, 0, 0))
+        img = Image.new("RGBA", (256, 256), colors.get(style, (128, 128, 128, 255)))
+        draw = ImageDraw.Draw(img)
+        draw.rectangle([0, 0, 255, 255], outline=(90, 90, 90, 255))
+        draw.text((8, 8), f"{z}/{x}/{y}", fill=(60, 60, 60, 255))
+        return img
+
+    def radar(self, x, y, z):
+        ''' 512x512 radar frame with a moving rain blob in the blue channel '''
+        img = Image.new("RGBA", (512, 512), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(img)
+        cx = int(time.time()/10 + 97*x) % 512
+        cy = int(61*y) % 512
+        draw.ellipse([cx-80, cy-60, cx+80, cy+60], fill=(0, 0, 40, 160))
+        return img
+
+    def clouds(self, x, y, z):
+        img = Image.new("RGBA", (256, 256), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(img)
+        draw.ellipse([40, 60, 200, 180], fill=(255, 255, 255, 140))
+        return img
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in server for FlightRadar24, Google Maps and wetter.com")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8024)
+    parser.add_argument("--flights", type=int, default=500, help="number of synthetic aircraft")
+    parser.add_argument("--center", default="52.5162767,13.3777761", help="center of the synthetic fleet (lat,lng)")
+    parser.add_argument("--radius", type=float, default=3.0, help="half size of the fleet region in degrees")
+    parser.add_argument("--latency", type=float, default=0.0, help="mean response latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="probability of an error response")
+    parser.add_argument("--error-status", type=int, default=503, help="status code of error responses, e.g. 520")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    center = tuple(float(v) for v in args.center.split(','))
+    fleet = SyntheticFleet(args.flights, center, args.radius, args.seed)
+    server = MockServer((args.host, args.port), fleet, args.latency, args.error_rate, args.error_status, args.verbose)
+    print(f"Mock server with {args.flights} aircraft on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print("Requests:", server.requests)
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,11 @@
     handle map tiles
 '''
 
-import os, time
+import os, time, math
+import concurrent.futures
+import queue
+import threading
+from collections import OrderedDict
 from PIL import Image, ImageTk
 from coords import *
 from wettercom import WetterComAPI
@@ -11,9 +15,80 @@ import numpy as np
 
 CLOUDS_ALPHA = 0.6
 DEBUG = False
+PLACEHOLDER_COLOR = '#404040'   # shown until a tile without cached parent is loaded
+TILE_POLL_MS = 20               # period of handing over completed tiles to the canvas
+
+def spiralOrder(columns, rows, cx, cy):
+    '''
+        grid positions (i, j) ordered by rings around the centre (cx, cy), clockwise within a ring
+    '''
+    cells = [(i, j) for j in range(rows) for i in range(columns)]
+    return sorted(cells, key=lambda c: (max(abs(c[0]-cx), abs(c[1]-cy)),
+                                        math.atan2(c[0]-cx, cy-c[1]) % (2*math.pi)))
+
+class TileCache(object):
+    '''
+        byte-budgeted LRU cache of decoded and composited tiles (PIL images or PhotoImages),
+        the least recently used tiles are dropped when the budget is exceeded.
+        PhotoImages must only be cached from the Tk thread: an eviction releases the image in Tcl.
+    '''
+    def __init__(self, maxBytes=64*1024*1024):
+        self.maxBytes = maxBytes
+        self.bytes = 0
+        self.items = OrderedDict()   # key -> (value, size in bytes)
+        self.hits = 0
+        self.misses = 0
+        self.closed = False
+        # tiles are composited on worker threads
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.items)
+
+    @staticmethod
+    def getSize(value):
+        ''' memory of a PIL image or PhotoImage in bytes '''
+        if isinstance(value, Image.Image):
+            return value.width*value.height*len(value.getbands())
+        return value.width()*value.height()*4
+
+    def get(self, key):
+        with self.lock:
+            item = self.items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            self.items.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key, value):
+        size = self.getSize(value)
+        with self.lock:
+            if self.closed:
+                return
+            if key in self.items:
+                self.bytes -= self.items.pop(key)[1]
+            self.items[key] = (value, size)
+            self.bytes += size
+            # forget the least recently used tiles
+            while self.bytes > self.maxBytes and len(self.items) > 1:
+                _, (_, size) = self.items.popitem(last=False)
+                self.bytes -= size
+
+    def clear(self):
+        with self.lock:
+            self.items.clear()
+            self.bytes = 0
+
+    def close(self):
+        ''' clear the cache for good, tiles still completing are no longer stored '''
+        with self.lock:
+            self.closed = True
+        self.clear()
 
 class Tiles(object):
-    def __init__(self, canvas, tileSize:int, tileNum, style:dict, zoom, home, centerview=True):
+    def __init__(self, canvas, tileSize:int, tileNum, style:dict, zoom, home, centerview=True, cacheBytes=64*1024*1024, workers=8, mosaic=False):
         self.C = canvas
         self.tileSize_ = tileSize
         self.tileNum_ = tileNum
@@ -37,6 +112,36 @@ class Tiles(object):
         self.wc = WetterComAPI()
         self.gm = GoogleMapsAPI()
 
+        # decoded and composited tiles, each overlay layer is cached on top of the layers below
+        self.cache = TileCache(cacheBytes)
+        # PhotoImages of the composited tiles, only used in the Tk thread (evictions delete the Tk image)
+        self.photos = TileCache(cacheBytes)
+        # tile downloads, decoding and compositing run in parallel
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix='tiles')
+        # completed tiles, handed over to the Tk thread by swapTiles()
+        self.loaded_ = queue.Queue()
+        self.generation_ = 0
+        self.pending_ = 0
+        self.shownKeys_ = dict()
+        self.polling_ = False
+        self.pollId_ = None
+        # tile coordinates of the grid cells and back, zoom level and timestamp of the loaded grid
+        self.cellTiles_ = dict()
+        self.tileCells_ = dict()
+        self.loadedZoom_ = None
+        self.ts_ = None
+        self.prepared_ = None
+
+        # optional mosaic mode: the whole grid is composited into one buffer shown by a single canvas item
+        self.mosaic = mosaic
+        if mosaic:
+            inc = 0 if not centerview else 1
+            self.mosaicBuf_ = np.zeros((tileSize*(tileNum[1]+inc), tileSize*(tileNum[0]+inc), 4), dtype=np.uint8)
+            self.mosaicPhoto_ = ImageTk.PhotoImage(Image.fromarray(self.mosaicBuf_))
+            self.mosaicItem_ = self.C.create_image(0, 0, image=self.mosaicPhoto_, anchor='nw')
+            self.C.lower(self.mosaicItem_)
+            self.mosaicDirty_ = False
+
         self.focus_ = None
         if centerview:
             # set HOME focus
@@ -96,68 +201,240 @@ class Tiles(object):
 
         @return the binary image data
         '''
+        return self.getCachedTile(x, y, z, ts)[1]
+
+    def getCachedTile(self, x, y, z, ts=None, clouds=True, radar=True):
+        '''
+        Composite a map tile from its layers, reusing the cached layers that did not change.
+        The key of a tile is (basemap, roadmap, x, y, z, brightness) followed by the timestamp
+        of each enabled overlay. An overlay can be left out with clouds=False or radar=False,
+        e.g. when its status is not available.
+
+        @return the tile key (None if a layer is missing) and image
+        '''
         x = x%(2**z)
         if y < 0 or y >= 2**z:
-            return Image.fromarray(np.full((self.tileSize_,self.tileSize_), 128, dtype=np.uint8))
-        
+            key = ('void', self.tileSize_)
+            img = self.cache.get(key)
+            if img is None:
+                img = Image.fromarray(np.full((self.tileSize_,self.tileSize_), 128, dtype=np.uint8))
+                self.cache.put(key, img)
+            return key, img
+
+        key = (self.style['basemap'], self.style['roadmap'], x, y, z, self.style['brightness'])
+        img = self.cache.get(key)
+        if img is None:
+            img, complete = self.getBaseTile(x, y, z)
+            # failed downloads are not cached, they are retried on the next refresh
+            if complete:
+                self.cache.put(key, img)
+            else:
+                key = None
+
+        # render cloud radar overlay with zoom levels smaller or equal 13 only
+        if self.enableClouds and clouds and z <= 13:
+            layerKey = key + ('clouds', self.wc.cloudTs) if key else None
+            img_ = self.cache.get(layerKey) if layerKey else None
+            if img_ is None:
+                if DEBUG: print(f"Tiles::getTile(): Trying to get cloud image for x={x}, y={y}, z={z}")
+                img_overlay = self.getOverlay(self.wc.getCloudImage, x, y, z)
+                if img_overlay:
+                    img_overlay_ = np.array(img_overlay).astype(np.float32)
+                    img_overlay_[:,:,3] -= img_overlay_[:,:,3]*(1-CLOUDS_ALPHA)
+                    img_overlay = Image.fromarray(img_overlay_.astype(np.uint8))
+
+                    img = img.copy()
+                    img.paste(img_overlay, (0, 0), img_overlay)
+                    if layerKey:
+                        self.cache.put(layerKey, img)
+                else:
+                    layerKey = None
+            else:
+                img = img_
+            key = layerKey
+
+        # render rain radar overlay with zoom levels smaller or equal 13 only
+        if self.enableRadar and radar and z <= 13:
+            if ts == None:
+                ts_ = int(time.time())
+            else:
+                ts_ = ts
+            ts_ = ts_-(ts_%300)  # 5 min granularity
+
+            # the radar status is usually looked up already, without it the radar overlay is left out
+            status = self.getOverlay(self.wc.setRadarTimestamp, ts_) is not None
+
+            layerKey = key + ('radar', ts_) if key else None
+            img_ = self.cache.get(layerKey) if layerKey else None
+            if img_ is None:
+                if DEBUG: print(f"Tiles::getTile(): Trying to get radar image for x={x}, y={y}, z={z}, ts={ts_}")
+                img_overlay = self.getOverlay(self.wc.getRadarImage, x, y, z, ts_) if status else None
+                if img_overlay:
+                    # returned image is 512x512, needs further subtiling!
+                    tilex, tiley = 256*(x%2), 256*(y%2)
+
+                    # TODO: make it nicer with ALPHA blending
+                    img_overlay = img_overlay.crop((tilex, tiley, tilex+256, tiley+256))
+                    img_overlay_ = np.array(img_overlay).astype(np.uint16)
+
+                    # get radar index of home location
+                    if x == self.homeX_//256 and y == self.homeY_//256:
+                        self.homeRadarIndex_ = img_overlay_[self.homeY_%256, self.homeX_%256, 2]  # blue channel of HOME pixel
+
+                    img_ = np.array(img)
+                    img_[:,:,0] = np.clip(img_[:,:,0].astype(np.int16) -
+                                        img_overlay_[:,:,2],0,255).astype(np.uint8)
+                    img_[:,:,1] = np.clip(img_[:,:,1].astype(np.int16) - 
+                                        img_overlay_[:,:,2],0,255).astype(np.uint8)
+                    img_[:,:,2] = np.clip(img_[:,:,2].astype(np.int16) + 
+                                        img_overlay_[:,:,2]*4,0,255).astype(np.uint8)
+                    img = Image.fromarray(img_)
+                    if layerKey:
+                        self.cache.put(layerKey, img)
+                else:
+                    layerKey = None
+            else:
+                img = img_
+            key = layerKey
+
+        return key, img
+
+    def getBaseTile(self, x, y, z):
+        '''
+        Load the basemap tile with optional roadmap overlay and adjusted brightness.
+
+        @return the image and whether all layers were available
+        '''
         img = self.gm.getTileImage(x, y, z, self.tileSize_, self.style['basemap'], debug=DEBUG)
+        complete = 'error' not in img.info
         if self.style['roadmap']:
             img_overlay = self.gm.getTileImage(x, y, z, self.tileSize_, 'roadmap', debug=DEBUG)
+            complete = complete and 'error' not in img_overlay.info
             img.paste(img_overlay, (0, 0), img_overlay)
 
         # brightness adjust
         img_ = np.array(img)
         img_[:,:,:3] = (img_[:,:,:3]*self.style['brightness']).astype(np.uint8)
-        img = Image.fromarray(img_)
-        
-        # render cloud radar overlay with zoom levels smaller or equal 13 only
+        return Image.fromarray(img_), complete
+
+    def getTileKey(self, x, y, z, ts):
+        '''
+        Cache key of a fully composited tile with the current overlay settings.
+        '''
+        x = x%(2**z)
+        if y < 0 or y >= 2**z:
+            return ('void', self.tileSize_)
+        key = (self.style['basemap'], self.style['roadmap'], x, y, z, self.style['brightness'])
         if self.enableClouds and z <= 13:
-            if DEBUG: print(f"Tiles::getTile(): Trying to get cloud image for x={x}, y={y}, z={z}")
-            img_overlay = self.wc.getCloudImage(x, y, z)
-            if img_overlay:
-                img_overlay_ = np.array(img_overlay).astype(np.float32)
-                img_overlay_[:,:,3] -= img_overlay_[:,:,3]*(1-CLOUDS_ALPHA)
-                img_overlay = Image.fromarray(img_overlay_.astype(np.uint8))
+            key += ('clouds', self.wc.cloudTs)
+        if self.enableRadar and z <= 13:
+            key += ('radar', ts-(ts%300))
+        return key
 
-                img = Image.fromarray(img_)
-                img.paste(img_overlay, (0, 0), img_overlay)
-                img_ = np.array(img)
+    def getPlaceholder(self, x, y, z, levels=3):
+        '''
+        Cheap stand-in for a tile that is still loading: the cached base layer of the tile,
+        else the upsampled part of a cached parent tile, else a flat colour.
 
-        # render rain radar overlay with zoom levels smaller or equal 13 only
+        @return PIL image
+        '''
+        tileSize = self.tileSize_
+        if 0 <= y < 2**z:
+            for level in range(levels+1):
+                zp = z-level
+                if zp < 0:
+                    break
+                xp, yp = (x%(2**z)) >> level, y >> level
+                img = self.cache.get((self.style['basemap'], self.style['roadmap'], xp, yp, zp, self.style['brightness']))
+                if img is not None:
+                    if level == 0:
+                        return img
+                    # part of the parent covering this tile
+                    size = tileSize >> level
+                    left, top = (x%(2**z) - (xp << level))*size, (y - (yp << level))*size
+                    return img.crop((left, top, left+size, top+size)).resize((tileSize, tileSize), Image.BILINEAR)
+        return Image.new(mode="RGBA", size=(tileSize, tileSize), color=PLACEHOLDER_COLOR)
+
+    def getOverlay(self, request, *args):
+        ''' result of an overlay request (image or status), None if wetter.com cannot be reached '''
+        try:
+            return request(*args)
+        except Exception as e:
+            print(f"Tiles::getOverlay(): overlay not available: {e}")
+            return None
+
+    def prepareOverlays(self, z, ts):
+        '''
+        Look up the cloud and radar status once per refresh, before the tiles are requested.
+        An overlay whose status cannot be requested is left out, the base map is shown anyway.
+
+        @return whether the cloud and the radar overlays are available
+        '''
+        clouds = radar = True
+        if self.enableClouds:
+            try:
+                self.wc.updateCloudUrl()
+            except Exception as e:
+                print(f"Tiles::prepareOverlays(): cloud status not available: {e}")
+                clouds = False
         if self.enableRadar and z <= 13:
-            if ts == None:
-                ts_ = int(time.time())
-            else:
-                ts_ = ts
-            ts_ = ts_-(ts_%300)  # 5 min granularity
+            try:
+                self.wc.setRadarTimestamp(ts)
+            except Exception as e:
+                print(f"Tiles::prepareOverlays(): radar status not available: {e}")
+                radar = False
+        return clouds, radar
+
+    def loadTile(self, prepared, x, y, z, ts):
+        ''' worker job: wait for the overlay status, then composite the tile '''
+        clouds, radar = prepared.result()
+        return self.getCachedTile(x, y, z, ts, clouds, radar)
+
+    def getPhotoImage(self, key, img):
+        ''' PhotoImage of a tile, reused as it is for unchanged tiles (Tk thread only) '''
+        image = self.photos.get(key) if key else None
+        if image is None:
+            image = ImageTk.PhotoImage(img)
+            if key:
+                self.photos.put(key, image)
+        return image
+
+    def placeTile(self, k, i, j, tx, ty):
+        '''
+        Create the canvas item of grid cell k at column i and row j for tile (tx, ty), showing the cached
+        tile or a placeholder, and load the tile on the worker pool.
+        '''
+        tileSize = self.tileSize_
+        z, ts = self.loadedZoom_, self.ts_
+        key = self.getTileKey(tx, ty, z, ts)
+        if self.mosaic:
+            img = self.cache.get(key)
+            if img is None:
+                img = self.getPlaceholder(tx, ty, z)
+                key = None
+            self.pasteTile(i, j, img)
+        else:
+            image = self.photos.get(key)
+            if image is None:
+                image = ImageTk.PhotoImage(self.getPlaceholder(tx, ty, z))
+                key = None
+            self.bgImg[k] = image
+            self.tiles[k] = self.C.create_image(tileSize*(i+0.5), tileSize*(j+0.5), image=image)
+            self.C.lower(self.tiles[k])
+        self.shownKeys_[k] = key
+        self.cellTiles_[k] = (tx, ty)
+        self.tileCells_[(tx, ty)] = k
 
-            self.wc.setRadarTimestamp(ts_)
-
-            if DEBUG: print(f"Tiles::getTile(): Trying to get radar image for x={x}, y={y}, z={z}, ts={ts_}")
-            img_overlay = self.wc.getRadarImage(x, y, z, ts_)
-            if img_overlay:
-                # returned image is 512x512, needs further subtiling!
-                tilex, tiley = 256*(x%2), 256*(y%2)
-                
-                # TODO: make it nicer with ALPHA blending
-                img_overlay = img_overlay.crop((tilex, tiley, tilex+256, tiley+256))
-                img_overlay_ = np.array(img_overlay).astype(np.uint16)
-
-                # get radar index of home location
-                if x == self.homeX_//256 and y == self.homeY_//256:
-                    self.homeRadarIndex_ = img_overlay_[self.homeY_%256, self.homeX_%256, 2]  # blue channel of HOME pixel
-                
-                img_[:,:,0] = np.clip(img_[:,:,0].astype(np.int16) -
-                                    img_overlay_[:,:,2],0,255).astype(np.uint8)
-                img_[:,:,1] = np.clip(img_[:,:,1].astype(np.int16) - 
-                                    img_overlay_[:,:,2],0,255).astype(np.uint8)
-                img_[:,:,2] = np.clip(img_[:,:,2].astype(np.int16) + 
-                                    img_overlay_[:,:,2]*4,0,255).astype(np.uint8)
-                img = Image.fromarray(img_)
-
-        return img
+        # even cached tiles are loaded again, overlays may have been updated meanwhile
+        future = self.executor.submit(self.loadTile, self.prepared_, tx, ty, z, ts)
+        future.add_done_callback(lambda future, t=(tx, ty), g=self.generation_: self.loaded_.put((g, t, future)))
+        self.pending_ += 1
 
     def refreshTiles(self, x, y, z):
+        '''
+        Replace the tile grid without waiting for tile I/O: cached tiles are shown at once,
+        the others as placeholders until their worker completes.
+        '''
         # clean-up
         for k in self.bgImg.keys():
             self.C.delete(self.bgImg[k])
@@ -167,24 +444,154 @@ class Tiles(object):
         ts = int(time.time())
         ts = ts-(ts%300)  # 5 min granularity
 
-        # reload canvas tiles
-        if self.enableClouds:
-            self.wc.updateCloudUrl()
+        # results of previous refreshes still loading are dropped
+        self.generation_ += 1
+        self.pending_ = 0
+        self.shownKeys_ = dict()
+        self.cellTiles_ = dict()
+        self.tileCells_ = dict()
+        self.loadedZoom_ = z
+        self.ts_ = ts
 
+        # the overlay status is requested on the worker pool as well
+        self.prepared_ = self.executor.submit(self.prepareOverlays, z, ts)
+
+        tileNum = self.tileNum_
+        shiftX = tileNum[0]//2
+        shiftY = tileNum[1]//2
+        inc = 0 if not self.centerview else 1
+
+        # fetch, decode and composite on the worker pool, centre tile first
+        for i, j in spiralOrder(tileNum[0]+inc, tileNum[1]+inc, shiftX, shiftY):
+            self.placeTile(f'{j}{i}', i, j, x+i-shiftX, y+j-shiftY)
+
+        self.flushMosaic()
+        self.pollTiles()
+
+    def scrollTiles(self, x, y):
+        '''
+        Move the grid from the current centre tile to the new centre tile (x, y) at the same zoom level:
+        canvas items and PhotoImages (or mosaic pixels) of the tiles still in view are reused,
+        only the exposed edge is loaded.
+        '''
         tileSize = self.tileSize_
         tileNum = self.tileNum_
         shiftX = tileNum[0]//2
         shiftY = tileNum[1]//2
         inc = 0 if not self.centerview else 1
-        for j in range(tileNum[1]+inc):
-            for i in range(tileNum[0]+inc):
-                image = ImageTk.PhotoImage(self.getTile(x+i-shiftX, y+j-shiftY, z, ts))
-                self.bgImg[f'{j}{i}'] = image
-                self.tiles[f'{j}{i}'] = self.C.create_image(tileSize*(i+0.5), tileSize*(j+0.5), image=image)
 
-        for k in self.bgImg.keys():
-            self.C.lower(self.bgImg[k])
-            self.C.lower(self.tiles[k])
+        if self.mosaic:
+            self.shiftMosaic(x-self.center_[0], y-self.center_[1])
+
+        old = {self.cellTiles_[k]: (k, self.tiles.get(k), self.bgImg.get(k), self.shownKeys_[k]) for k in self.cellTiles_}
+        self.tiles, self.bgImg, self.shownKeys_ = dict(), dict(), dict()
+        self.cellTiles_, self.tileCells_ = dict(), dict()
+
+        exposed = list()
+        for i, j in spiralOrder(tileNum[0]+inc, tileNum[1]+inc, shiftX, shiftY):
+            k, tile = f'{j}{i}', (x+i-shiftX, y+j-shiftY)
+            if tile in old:
+                _, item, image, key = old.pop(tile)
+                self.shownKeys_[k] = key
+                self.cellTiles_[k] = tile
+                self.tileCells_[tile] = k
+                if not self.mosaic:
+                    self.tiles[k], self.bgImg[k] = item, image
+                    self.C.coords(item, tileSize*(i+0.5), tileSize*(j+0.5))
+            else:
+                exposed.append((k, i, j, tile))
+
+        # tiles out of view
+        if not self.mosaic:
+            for _, item, _, _ in old.values():
+                self.C.delete(item)
+
+        for k, i, j, (tx, ty) in exposed:
+            self.placeTile(k, i, j, tx, ty)
+
+        self.flushMosaic()
+        self.pollTiles()
+
+    def pasteTile(self, i, j, img):
+        ''' copy a tile image into the mosaic buffer at column i and row j '''
+        tileSize = self.tileSize_
+        self.mosaicBuf_[j*tileSize:(j+1)*tileSize, i*tileSize:(i+1)*tileSize] = np.asarray(img.convert('RGBA'))
+        self.mosaicDirty_ = True
+
+    def shiftMosaic(self, dx, dy):
+        ''' move the mosaic buffer content by dx columns and dy rows of tiles, in place '''
+        tileSize = self.tileSize_
+        h, w = self.mosaicBuf_.shape[:2]
+        dx, dy = dx*tileSize, dy*tileSize
+        if abs(dx) < w and abs(dy) < h:
+            # overlapping copies are buffered by NumPy
+            self.mosaicBuf_[max(0,-dy):h-max(0,dy), max(0,-dx):w-max(0,dx)] = \
+                self.mosaicBuf_[max(0,dy):h-max(0,-dy), max(0,dx):w-max(0,-dx)]
+        self.mosaicDirty_ = True
+
+    def flushMosaic(self):
+        ''' hand the mosaic buffer over to its PhotoImage, one Tk call for all changed tiles '''
+        if self.mosaic and self.mosaicDirty_:
+            self.mosaicPhoto_.paste(Image.fromarray(self.mosaicBuf_))
+            self.mosaicDirty_ = False
+
+    def pollTiles(self):
+        if not self.polling_:
+            self.polling_ = True
+            self.pollId_ = self.C.after(TILE_POLL_MS, self.swapTiles)
+
+    def swapTiles(self):
+        '''
+        Swap completed tiles into the canvas, runs in the Tk thread until all loading tiles are in.
+        '''
+        while True:
+            try:
+                generation, tile, future = self.loaded_.get_nowait()
+            except queue.Empty:
+                break
+            if generation != self.generation_:
+                continue
+            self.pending_ -= 1
+            # tiles scrolled out of view meanwhile are dropped
+            k = self.tileCells_.get(tile)
+            if k is None:
+                continue
+            try:
+                key, img = future.result()
+            except Exception as e:
+                print(f"Tiles::swapTiles(): tile {tile} not available: {e}")
+                continue
+            if key is not None and key == self.shownKeys_.get(k):
+                continue
+            self.shownKeys_[k] = key
+            if self.mosaic:
+                tileNum = self.tileNum_
+                self.pasteTile(tile[0]-self.center_[0]+tileNum[0]//2, tile[1]-self.center_[1]+tileNum[1]//2, img)
+            else:
+                image = self.getPhotoImage(key, img)
+                self.bgImg[k] = image
+                self.C.itemconfigure(self.tiles[k], image=image)
+
+        self.flushMosaic()
+        self.polling_ = self.pending_ > 0
+        self.pollId_ = self.C.after(TILE_POLL_MS, self.swapTiles) if self.polling_ else None
+
+    def close(self):
+        '''
+        Release the tile workers and caches, e.g. when the window is closed. Tiles still loading are dropped.
+        '''
+        self.generation_ += 1
+        if self.pollId_ is not None:
+            try:
+                self.C.after_cancel(self.pollId_)
+            except Exception:
+                pass
+            self.pollId_ = None
+        self.polling_ = False
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.cache.close()
+        self.photos.close()
+        self.bgImg = dict()
 
     def update(self, x, y, z, force=False):
         self.zoom_ = z
@@ -214,10 +621,21 @@ class Tiles(object):
         self.offset_ = (offx, offy)
 
         if self.center_ != (x_,y_) or force:
-            self.center_ = (x_,y_)
-            self.refreshTiles(x_,y_,z)
+            ts = int(time.time())
+            if not force and self.center_ is not None and z == self.loadedZoom_ and \
+               abs(x_-self.center_[0]) <= tileNum[0] and abs(y_-self.center_[1]) <= tileNum[1] and \
+               not (self.enableRadar and ts-(ts%300) != self.ts_):
+                # shifted grid, only the exposed rows and columns are loaded
+                self.scrollTiles(x_,y_)
+                self.center_ = (x_,y_)
+            else:
+                self.center_ = (x_,y_)
+                self.refreshTiles(x_,y_,z)
 
-        if self.centerview:
+        if self.centerview and self.mosaic:
+            # a single canvas item to move
+            self.C.moveto(self.mosaicItem_, -offx, -offy)
+        elif self.centerview:
             for y in range(tileNum[1]+1):
                 for x in range(tileNum[0]+1):
                     x_ = tileSize*x-offx
@@ -239,3 +657,40 @@ class Tiles(object):
             sx -= self.tileSize_//2
             sy -= self.tileSize_//2
         return sx,sy
+
+if __name__ == '__main__':
+    # benchmark of the canvas work per frame in centerview mode, one item per tile against the mosaic
+    # (flat tiles, no network), usage: python tiles.py [grid size]
+    import sys
+    import tkinter as tk
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    frames = 500
+    root = tk.Tk()
+    for mosaic in (False, True):
+        canvas = tk.Canvas(root, width=256*n, height=256*n)
+        canvas.pack()
+        t = Tiles(canvas, 256, (n,n), dict(basemap='terrain', roadmap=False, brightness=0.4), 10, (52.5,13.4), mosaic=mosaic)
+        t.loadTile = lambda prepared, x, y, z, ts: (None, Image.new(mode="RGBA", size=(256, 256), color=PLACEHOLDER_COLOR))
+        x0, y0 = t.homeX_ - t.homeX_%256, t.homeY_ - t.homeY_%256
+        t.update(x0, y0, 10)
+        root.update()
+
+        # moves within the centre tile
+        start = time.perf_counter()
+        for k in range(frames):
+            t.update(x0 + k%256, y0, 10)
+            root.update_idletasks()
+        moved = (time.perf_counter()-start)/frames
+
+        # moves to the next tile, scrolling the grid
+        start = time.perf_counter()
+        for k in range(frames//10):
+            t.update(x0 + 256*(k+1), y0, 10)
+            root.update()
+        scrolled = (time.perf_counter()-start)/(frames//10)
+
+        print(f"{'mosaic' if mosaic else 'items'}: {moved*1000:.3f} ms/frame within a tile, {scrolled*1000:.2f} ms/frame on a tile shift")
+        t.executor.shutdown()
+        canvas.destroy()
+    root.destroy()
@@ -4,6 +4,7 @@
 
 import json
 import time
+import numpy as np
 from FlightRadar24_patch.api import FlightRadar24API
 from coords import *
 from tiles import Tiles
@@ -137,26 +138,26 @@ class Trails(object):
                 self.trail.sort()
                 self.trailHQ += len(newlist)
 
-        # draw flight trail
+        # draw flight trail, newest location first, up to the first location outside the tiles
         trail_ = list()
         tileSize = self.tiles.tileSize
         tileNum  = self.tiles.tileNum
         z = self.tiles.zoom
-        for step in reversed(self.trail):
-            tx, ty = latlngToPixel(step[1:3], z)
+        if self.trail:
+            steps = np.array([step[1:3] for step in reversed(self.trail)], dtype=np.float64)
+            tx, ty = latlngToPixelArray(steps[:, 0], steps[:, 1], z)
             tilex, tiley = tx//tileSize, ty//tileSize
-            if abs(self.tiles.center[0]-tilex) > tileNum[0] or \
-               abs(self.tiles.center[1]-tiley) > tileNum[1]:
-                #print(self.tiles.center[0], tilex, "|", self.tiles.center[1], tiley)
-                break
+            outside = (np.abs(self.tiles.center[0]-tilex) > tileNum[0]) | \
+                      (np.abs(self.tiles.center[1]-tiley) > tileNum[1])
+            n = int(np.argmax(outside)) if outside.any() else len(outside)
+            tx, ty, tilex, tiley = tx[:n], ty[:n], tilex[:n], tiley[:n]
+            tx_ = tileSize * (tilex-self.tiles.center[0]+tileNum[0]//2) + (tx % tileSize)
+            ty_ = tileSize * (tiley-self.tiles.center[1]+tileNum[1]//2) + (ty % tileSize)
             if self.centerview:
-                tx_ = tileSize * (tilex-self.tiles.center[0]+tileNum[0]//2) + (tx % tileSize) - self.tiles.offset[0]
-                ty_ = tileSize * (tiley-self.tiles.center[1]+tileNum[1]//2) + (ty % tileSize) - self.tiles.offset[1]
-            else:
-                tx_ = tileSize * (tilex-self.tiles.center[0]+tileNum[0]//2) + (tx % tileSize)
-                ty_ = tileSize * (tiley-self.tiles.center[1]+tileNum[1]//2) + (ty % tileSize)
+                tx_ = tx_ - self.tiles.offset[0]
+                ty_ = ty_ - self.tiles.offset[1]
             # TODO: fix dateline transition
-            trail_ += [tx_, ty_]
+            trail_ = np.column_stack((tx_, ty_)).ravel().tolist()
         
         self.updateTS = int(time.time())
         
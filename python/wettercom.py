@@ -5,8 +5,15 @@
 import requests
 import time, os, json
 from PIL import Image
+from helper import writeFileAtomic
 
 class WetterComAPI:
+    # base URLs of the radar, status and cloud servers, can be redirected with setBaseUrl()
+    radarBaseUrl = "https://d3q1in6xcpf6ou.cloudfront.net"
+    wetterBaseUrl = "https://www.wetter.com"
+    cloudBaseUrl = "https://ct3.wettercomassets.com"
+    cacheRoot = "cache"
+
     def __init__(self):
         self.ts = -1
         self.datetime = time.strftime("%Y%m%d%H", time.gmtime(time.time())) + '00'
@@ -15,12 +22,22 @@ class WetterComAPI:
         self.localeCountry = 'GB'
         self.cloudUrl = None
         self.cloudTs = 0
-        self.cachePath = os.path.join("cache", "wetter.com")
+        self.cachePath = os.path.join(self.cacheRoot, "wetter.com")
 
     def setLocale(self, lang, country):
         self.localeLang = lang
         self.localeCountry = country
 
+    @classmethod
+    def setBaseUrl(cls, url, cacheRoot=None):
+        ''' redirect all requests to another server, e.g. the local mock server
+            (use another cacheRoot to keep its images out of the regular cache) '''
+        cls.radarBaseUrl = url.rstrip('/')
+        cls.wetterBaseUrl = url.rstrip('/')
+        cls.cloudBaseUrl = url.rstrip('/')
+        if cacheRoot:
+            cls.cacheRoot = cacheRoot
+
     def getRadarImage(self, x, y, z, ts=None):
         if not ts:
             # snap timestamp into 5min granularity
@@ -29,15 +46,15 @@ class WetterComAPI:
         now = time.strftime("%Y%m%d%H%M", time.gmtime(ts))
         x_,y_,z_ = x//2, y//2, z-1
         if self.tile:
-            url = f"https://d3q1in6xcpf6ou.cloudfront.net/{self.tile}/{z_}/{x_}/{y_}"
+            url = f"{self.radarBaseUrl}/{self.tile}/{z_}/{x_}/{y_}"
         else:
-            url = f"https://d3q1in6xcpf6ou.cloudfront.net/nearcast/composite_ng_snow/{self.datetime}/{now}/{z_}/{x_}/{y_}"
+            url = f"{self.radarBaseUrl}/nearcast/composite_ng_snow/{self.datetime}/{now}/{z_}/{x_}/{y_}"
         
         filename = f"radar_{ts},{z_},{x_},{y_}.dat"
 
         # check for subfolders and create them if needed
         if not os.path.exists(self.cachePath):
-            os.makedirs(self.cachePath)
+            os.makedirs(self.cachePath, exist_ok=True)
 
         filename = os.path.join(self.cachePath, filename)
         if os.path.exists(filename):
@@ -64,8 +81,7 @@ class WetterComAPI:
         if req.status_code == 200:
             # on success: save image to file system and load as RGBA image
             data = req.content
-            with open(filename, "wb") as f:
-                f.write(data)
+            writeFileAtomic(filename, data)
             img = Image.open(filename, formats=['jpeg', 'png']).convert("RGBA")
         else:
             img = None
@@ -85,7 +101,7 @@ class WetterComAPI:
             "pragma": "no-cache",
             "cache-control": "no-cache"
         }
-        url = "https://d3q1in6xcpf6ou.cloudfront.net/status/radar/composite_snow/status.json"
+        url = f"{self.radarBaseUrl}/status/radar/composite_snow/status.json"
         req = requests.get(url, allow_redirects=True, headers=headers)
         if req.status_code != 200:
             # no success!
@@ -123,7 +139,7 @@ class WetterComAPI:
         return found
 
     def updateCloudUrl(self):
-        url = "https://www.wetter.com/agt/wetterkarten/tiles/icon_clouds/minimal"
+        url = f"{self.wetterBaseUrl}/agt/wetterkarten/tiles/icon_clouds/minimal"
         headers = {
             "host": "www.wetter.com",
             "accept": "application/json, text/plain, */*",
@@ -157,7 +173,7 @@ class WetterComAPI:
         try:
             for step in response['runs'][0]['timesteps']:
                 if step['date'] == now:
-                    self.cloudUrl = "https://ct3.wettercomassets.com/" + step['tile_url']
+                    self.cloudUrl = f"{self.cloudBaseUrl}/" + step['tile_url']
                     self.cloudTs = ts
                     break
         except:
@@ -173,7 +189,7 @@ class WetterComAPI:
 
         # check for subfolders and create them if needed
         if not os.path.exists(self.cachePath):
-            os.makedirs(self.cachePath)
+            os.makedirs(self.cachePath, exist_ok=True)
 
         filename = os.path.join(self.cachePath, filename)
         if os.path.exists(filename):
@@ -192,8 +208,7 @@ class WetterComAPI:
         if req.status_code == 200:
             # on success: save image to file system and load as RGBA image
             data = req.content
-            with open(filename, "wb") as f:
-                f.write(data)
+            writeFileAtomic(filename, data)
             img = Image.open(filename, formats=['jpeg', 'png']).convert("RGBA")
         else:
             print("Error (WetterComAPI::getCloudImage): req.status_code:", req.status_code)